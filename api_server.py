@@ -1,18 +1,72 @@
-"""Flask API server for the HTML dashboard."""
-from flask import Flask, jsonify, send_from_directory, request
+"""Flask API server for the HTML dashboard.
+
+The backtesting engine (and with it pandas and NumPy) is imported by the
+first request that needs it, so workers boot on Flask alone.
+"""
+from flask import Flask, Response, g, jsonify, send_from_directory, request
 from flask_cors import CORS
+import json
+import math
 import os
-from backtester import Backtester
-from news_analyzer import NewsAnalyzer
-from market_data import MarketData
+import threading
+import time
+from config import Config
+from backtest_jobs import JobManager, JobQueueFull
+from result_cache import ResultCache
+from options import SUPPORTED_INTERVALS
+from instrumentation import (
+    REQUEST_SECONDS, collect_timings, count_cache, render_prometheus, server_timing, stage
+)
+from log_pipeline import configure_logging
 
 app = Flask(__name__, static_folder='dashboard')
 CORS(app)
 
-# Initialize components
-backtester = Backtester()
-market_data = MarketData()
+# Components, created on first use
+backtester = None
+market_data = None
 news_analyzer = None
+jobs = None
+_components_lock = threading.Lock()
+
+def get_backtester():
+    """Get the shared Backtester, creating it on first use."""
+    global backtester
+    with _components_lock:
+        if backtester is None:
+            from backtester import Backtester
+            backtester = Backtester()
+        return backtester
+
+def get_market_data():
+    """Get the shared MarketData, creating it on first use."""
+    global market_data
+    with _components_lock:
+        if market_data is None:
+            from market_data import MarketData
+            market_data = MarketData()
+        return market_data
+
+@app.before_request
+def start_request_timer():
+    """Remember when the request started."""
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def observe_request_latency(response):
+    """Record the request's latency by route, method and status."""
+    started = g.get('request_started')
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - started, endpoint, request.method, str(response.status_code)
+        )
+    return response
+
+@app.route('/metrics')
+def metrics():
+    """Expose latency histograms, cache hit ratios and external calls to Prometheus."""
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def index():
@@ -29,47 +83,218 @@ def serve_js():
     """Serve the JavaScript file."""
     return send_from_directory('dashboard', 'app.js')
 
+# Per-bar columns sent to clients (trades are sent separately)
+RESULT_COLUMNS = [
+    'date', 'price', 'sentiment', 'signal', 'portfolio_value',
+    'buy_hold_value', 'cash', 'holdings'
+]
+
+def serialize_backtest(symbol, results, layout='columnar', date_format='iso', points=0):
+    """
+    Convert backtest results to a JSON-serializable response body.
+    
+    The columnar layout sends one array per field, converted in bulk; the
+    records layout (one object per bar) is kept for older clients. With
+    points > 0 the bars are downsampled (LTTB) for charting; metrics and
+    trades always cover the full run. 'timings' holds the backtest's
+    seconds per stage.
+    """
+    from downsampling import CHART_SERIES, downsample_frame
+    from response_encoding import clean_metrics, to_columns
+    from trading_strategy import trades_frame
+    
+    with stage('serialize'):
+        bars = downsample_frame(results['results'], CHART_SERIES, points)
+        if layout == 'records':
+            return serialize_backtest_records(symbol, results, bars)
+        
+        trades = trades_frame(results['trades'])
+        return {
+            'success': True,
+            'symbol': symbol,
+            'format': 'columnar',
+            'total_bars': len(results['results']),
+            'metrics': clean_metrics(results['metrics']),
+            'timings': results.get('timings', {}),
+            'data': to_columns(bars, RESULT_COLUMNS, date_format),
+            'trades': to_columns(trades, date_format=date_format)
+        }
+
+def serialize_backtest_records(symbol, results, bars=None):
+    """Convert backtest results to the original one-object-per-bar layout."""
+    from response_encoding import clean_metrics
+    from trading_strategy import trades_to_dicts
+    
+    if bars is None:
+        bars = results['results']
+    
+    # Convert DataFrame to JSON-serializable format
+    results_data = bars.to_dict('records')
+    
+    # Format dates and handle NaN/Inf values
+    for item in results_data:
+        item['date'] = item['date'].isoformat()
+        # Replace NaN and Inf with None for JSON compatibility
+        for key, value in item.items():
+            if isinstance(value, float):
+                if math.isnan(value) or math.isinf(value):
+                    item[key] = None
+    
+    return {
+        'success': True,
+        'symbol': symbol,
+        'format': 'records',
+        'total_bars': len(results['results']),
+        'metrics': clean_metrics(results['metrics']),
+        'timings': results.get('timings', {}),
+        'data': results_data,
+        'trades': trades_to_dicts(results['trades'])
+    }
+
+def parse_chart_points(body=None):
+    """
+    Read how many points per series to send to charts.
+    
+    An explicit `points` wins (0 sends every bar); otherwise the budget is
+    derived from the chart `width` in pixels, capped by CHART_MAX_POINTS.
+    """
+    from downsampling import target_points
+    
+    body = body or {}
+    points = body.get('points', request.args.get('points'))
+    if points is not None:
+        return max(int(points), 0)
+    width = body.get('width', request.args.get('width'))
+    return target_points(float(width) if width else None, Config.CHART_MAX_POINTS)
+
+def parse_interval(body=None):
+    """Read the bar interval, rejecting unsupported ones with ValueError."""
+    interval = (body or {}).get('interval', request.args.get('interval', '1d'))
+    if interval not in SUPPORTED_INTERVALS:
+        raise ValueError(f"interval must be one of {', '.join(SUPPORTED_INTERVALS)}")
+    return interval
+
+def parse_backtest_params(symbol):
+    """Read backtest parameters from the query string (or a JSON body)."""
+    body = request.get_json(silent=True) or {}
+    return {
+        'symbol': symbol,
+        'days': int(body.get('days', request.args.get('days', 90))),
+        'capital': float(body.get('capital', request.args.get('capital', 10000))),
+        'interval': parse_interval(body),
+        'points': parse_chart_points(body)
+    }
+
+def run_backtest_job(params, progress):
+    """Run one queued backtest job and serialize its results."""
+    from response_encoding import dumps
+    
+    results = get_backtester().run_backtest(
+        params['symbol'],
+        days=params['days'],
+        initial_capital=params['capital'],
+        progress=progress,
+        interval=params['interval']
+    )
+    # Round-trip through the encoder so the stored result is plain JSON
+    return json.loads(dumps(
+        serialize_backtest(params['symbol'], results, points=params['points'])
+    ))
+
+backtest_cache = ResultCache(
+    max_entries=Config.API_RESULT_CACHE_SIZE,
+    ttl=Config.API_RESULT_CACHE_TTL
+)
+
+def backtest_cache_key(symbol, days, capital, interval, layout, date_format, points):
+    """
+    Key identifying every input a backtest response depends on.
+    
+    Only request inputs and Config: newer prices are picked up when the
+    entry expires (API_RESULT_CACHE_TTL), not by keying on the price data,
+    which a cold start only fetches while computing the first response.
+    """
+    return (
+        symbol,
+        days,
+        capital,
+        interval,
+        layout,
+        date_format,
+        points,
+        Config.SENTIMENT_BUY_THRESHOLD,
+        Config.SENTIMENT_SELL_THRESHOLD,
+        Config.POSITION_SIZE
+    )
+
+def get_jobs():
+    """Get the shared JobManager, creating it (and its job store) on first use."""
+    global jobs
+    with _components_lock:
+        if jobs is None:
+            jobs = JobManager(
+                run_backtest_job,
+                max_workers=Config.API_JOB_WORKERS,
+                max_pending=Config.API_JOB_MAX_PENDING,
+                # Shared by every worker process, whichever one runs the job
+                store_path=Config.API_JOB_STORE_PATH or None
+            )
+        return jobs
+
 @app.route('/api/backtest/<symbol>')
 def run_backtest_api(symbol):
     """Run backtest for a symbol and return results."""
     try:
         days = int(request.args.get('days', 90))
         capital = float(request.args.get('capital', 10000))
+        layout = request.args.get('format', 'columnar')
+        date_format = request.args.get('dates', 'iso')
+        points = parse_chart_points()
+        try:
+            interval = parse_interval()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        if layout not in ('columnar', 'records') or date_format not in ('iso', 'epoch'):
+            return jsonify({
+                'success': False,
+                'error': "format must be 'columnar' or 'records', dates 'iso' or 'epoch'"
+            }), 400
         
-        results = backtester.run_backtest(symbol, days=days, initial_capital=capital)
+        # Empty results usually mean the price source failed: retry next time
+        has_bars = []
         
-        # Convert DataFrame to JSON-serializable format
-        results_data = results['results'].to_dict('records')
+        def compute():
+            from response_encoding import EncodedBody, dumps
+            
+            results = get_backtester().run_backtest(
+                symbol, days=days, initial_capital=capital, interval=interval
+            )
+            has_bars.append(not results['results'].empty)
+            payload = serialize_backtest(symbol, results, layout, date_format, points)
+            with stage('encode'):
+                return EncodedBody(dumps(payload))
         
-        # Format dates and handle NaN/Inf values
-        for item in results_data:
-            item['date'] = item['date'].isoformat()
-            # Replace NaN and Inf with None for JSON compatibility
-            for key, value in item.items():
-                if isinstance(value, float):
-                    import math
-                    if math.isnan(value) or math.isinf(value):
-                        item[key] = None
+        with collect_timings() as timings:
+            # Identical requests share one computation and its encoded body
+            encoded, cached = backtest_cache.get_or_compute(
+                backtest_cache_key(symbol, days, capital, interval, layout, date_format, points),
+                compute,
+                cache_if=lambda _: has_bars[0]
+            )
+            body, content_encoding = encoded.negotiate(request.accept_encodings)
+        count_cache('backtest', cached)
         
-        # Clean metrics too
-        clean_metrics = {}
-        for key, value in results['metrics'].items():
-            if isinstance(value, float):
-                import math
-                if math.isnan(value) or math.isinf(value):
-                    clean_metrics[key] = 0.0
-                else:
-                    clean_metrics[key] = value
-            else:
-                clean_metrics[key] = value
-        
-        return jsonify({
-            'success': True,
-            'symbol': symbol,
-            'metrics': clean_metrics,
-            'data': results_data,
-            'trades': results['trades']
-        })
+        response = Response(body, mimetype='application/json')
+        response.headers['Server-Timing'] = server_timing(timings)
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+            response.set_etag(f'{encoded.etag}-{content_encoding}')
+        else:
+            response.set_etag(encoded.etag)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.headers['X-Cache'] = 'HIT' if cached else 'MISS'
+        return response.make_conditional(request)
     except Exception as e:
         import traceback
         return jsonify({
@@ -78,11 +303,76 @@ def run_backtest_api(symbol):
             'traceback': traceback.format_exc()
         }), 500
 
+@app.route('/api/backtest/<symbol>/jobs', methods=['POST'])
+def submit_backtest_job(symbol):
+    """Queue a backtest on the worker pool and return its job ID."""
+    try:
+        job = get_jobs().submit(parse_backtest_params(symbol))
+    except JobQueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'job_id': job.job_id,
+        'status': job.status,
+        'status_url': f'/api/jobs/{job.job_id}',
+        'events_url': f'/api/jobs/{job.job_id}/events'
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_backtest_job(job_id):
+    """Poll a backtest job's status (and result once done)."""
+    job = get_jobs().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_backtest_job(job_id):
+    """Cancel a queued or running backtest job."""
+    job = get_jobs().cancel(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    
+    return jsonify({'success': True, 'job': job.to_dict(include_result=False)})
+
+@app.route('/api/jobs/<job_id>/events')
+def stream_backtest_job(job_id):
+    """Stream a backtest job's progress as Server-Sent Events."""
+    job = get_jobs().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    
+    def events():
+        version = -1
+        while True:
+            current = job.wait_for_change(version, timeout=15)
+            if current == version:
+                # Keep idle connections open through proxies
+                yield ': keep-alive\n\n'
+                continue
+            version = current
+            
+            event = 'done' if job.finished else 'progress'
+            payload = app.json.dumps(job.to_dict(include_result=False))
+            yield f'event: {event}\ndata: {payload}\n\n'
+            if job.finished:
+                return
+    
+    return Response(
+        events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/price/<symbol>')
 def get_price(symbol):
     """Get current price for a symbol."""
     try:
-        price = market_data.get_current_price(symbol)
+        price = get_market_data().get_current_price(symbol)
         return jsonify({
             'success': True,
             'symbol': symbol,
@@ -101,6 +391,7 @@ def get_news(symbol):
     
     try:
         if news_analyzer is None:
+            from news_analyzer import NewsAnalyzer
             news_analyzer = NewsAnalyzer()
         
         news_data = news_analyzer.get_aggregated_sentiment(symbol, days=1)
@@ -119,6 +410,10 @@ def get_news(symbol):
         }), 500
 
 if __name__ == '__main__':
+    # Request threads hand log records to a background writer (under
+    # gunicorn, wsgi.py does this instead)
+    configure_logging()
+    
     # Create dashboard directory if it doesn't exist
     os.makedirs('dashboard', exist_ok=True)
     
@@ -128,9 +423,12 @@ if __name__ == '__main__':
     print()
     print("  Dashboard: http://localhost:5000")
     print("  API Endpoints:")
-    print("    - GET /api/backtest/<symbol>?days=90&capital=10000")
+    print("    - GET /api/backtest/<symbol>?days=90&capital=10000[&format=records][&dates=epoch]")
+    print("    - POST /api/backtest/<symbol>/jobs?days=90&capital=10000")
+    print("    - GET|DELETE /api/jobs/<job_id>, GET /api/jobs/<job_id>/events")
     print("    - GET /api/price/<symbol>")
     print("    - GET /api/news/<symbol>")
+    print("    - GET /metrics (Prometheus)")
     print()
     print("  Press Ctrl+C to stop")
     print("=" * 70)
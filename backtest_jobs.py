@@ -0,0 +1,460 @@
+"""Background backtest jobs for the API server.
+
+Jobs run on a thread pool of the process that accepted them. Their state is
+also written to a SQLite job store, so that under a multi-process server
+(e.g. gunicorn with several workers) any process can report on a job or
+cancel it, whichever worker the request lands on.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+# Seconds between job store reads while following another process's job
+POLL_INTERVAL = 0.25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    owner INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL,
+    metrics TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    version INTEGER NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+"""
+
+# Job fields kept in the store (JSON-encoded where marked)
+_STORED_FIELDS = ('status', 'progress', 'metrics', 'result', 'error', 'finished_at')
+_JSON_FIELDS = ('params', 'metrics', 'result')
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting to run."""
+
+
+class BacktestJob:
+    """State of one background backtest, safe to read from other threads."""
+
+    def __init__(self, params: Dict, store: Optional['JobStore'] = None):
+        """
+        Initialize a queued job.
+
+        Args:
+            params: Backtest parameters (symbol, days, capital)
+            store: Job store every update is written to (None keeps the
+                job in this process only)
+        """
+        self.job_id = uuid.uuid4().hex
+        self.params = params
+        self.store = store
+        self.remote = False  # Whether another process runs the job
+        self.status = QUEUED
+        self.progress = 0.0
+        self.metrics = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.version = 0
+        self.cancel_requested = threading.Event()
+        self._changed = threading.Condition()
+
+    @classmethod
+    def from_row(cls, row: Dict, store: 'JobStore') -> 'BacktestJob':
+        """View of a job run by another process, as read from the store."""
+        job = cls(row['params'], store)
+        job.job_id = row['job_id']
+        job.created_at = row['created_at']
+        job.remote = True
+        job._apply(row)
+        return job
+
+    def _apply(self, row: Dict):
+        """Copy stored fields onto the job."""
+        for key in _STORED_FIELDS + ('version',):
+            setattr(self, key, row[key])
+        if row['cancel_requested']:
+            self.cancel_requested.set()
+
+    def update(self, **fields):
+        """Update job fields and wake up anyone waiting for a change."""
+        with self._changed:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self.version += 1
+            if self.store is not None:
+                self.store.save(self, fields)
+            self._changed.notify_all()
+
+    def refresh(self):
+        """Reload a remote job's state from the store."""
+        row = self.store.load(self.job_id) if self.remote else None
+        if row is not None:
+            with self._changed:
+                self._apply(row)
+
+    def cancel_pending(self) -> bool:
+        """Whether cancellation was requested, from this process or another."""
+        if not self.cancel_requested.is_set() and self.store is not None:
+            if self.store.cancel_requested(self.job_id):
+                self.cancel_requested.set()
+        return self.cancel_requested.is_set()
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """
+        Block until the job changes past a version or the timeout expires.
+
+        Args:
+            version: Last version the caller has seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Current version
+        """
+        if not self.remote:
+            with self._changed:
+                self._changed.wait_for(lambda: self.version != version, timeout=timeout)
+                return self.version
+
+        # Run elsewhere: follow the job store
+        deadline = time.monotonic() + timeout
+        while True:
+            self.refresh()
+            remaining = deadline - time.monotonic()
+            if self.version != version or remaining <= 0:
+                return self.version
+            time.sleep(min(POLL_INTERVAL, remaining))
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a final state."""
+        return self.status in FINISHED_STATES
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """Get a JSON-serializable view of the job."""
+        data = {
+            'job_id': self.job_id,
+            'status': self.status,
+            'progress': self.progress,
+            'params': self.params,
+            'metrics': self.metrics,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at
+        }
+        if self.error:
+            data['error'] = self.error
+        if include_result and self.result is not None:
+            data['result'] = self.result
+        return data
+
+
+class JobStore:
+    """Job states in SQLite, shared by the processes of a server."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open a transaction on a fresh connection (one per operation keeps the store thread-safe)."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, job: BacktestJob):
+        """Insert a new job, owned by this process."""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO jobs (job_id, owner, params, status, progress, metrics,
+                                  created_at, version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job.job_id, os.getpid(), json.dumps(job.params), job.status,
+                    job.progress, json.dumps(job.metrics), job.created_at, job.version
+                )
+            )
+
+    def save(self, job: BacktestJob, fields: Dict):
+        """Write changed job fields; the stored version counts every change."""
+        columns = [key for key in fields if key in _STORED_FIELDS]
+        values = [
+            json.dumps(getattr(job, key)) if key in _JSON_FIELDS else getattr(job, key)
+            for key in columns
+        ]
+        assignments = ''.join(f"{key} = ?, " for key in columns)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments}version = version + 1 WHERE job_id = ?",
+                (*values, job.job_id)
+            )
+
+    def load(self, job_id: str) -> Optional[Dict]:
+        """Get a job's stored state (None if unknown or pruned)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        row = dict(row)
+        for key in _JSON_FIELDS:
+            if row[key] is not None:
+                row[key] = json.loads(row[key])
+        return row
+
+    def request_cancel(self, job_id: str) -> bool:
+        """
+        Flag a job for cancellation; a queued job is cancelled at once.
+
+        Returns:
+            Whether the job exists
+        """
+        with self._connect() as conn:
+            found = conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE job_id = ?", (job_id,)
+            ).rowcount
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, finished_at = ?, version = version + 1
+                WHERE job_id = ? AND status = ?
+                """,
+                (CANCELLED, time.time(), job_id, QUEUED)
+            )
+        return bool(found)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        """Whether a job was flagged for cancellation."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def count_active(self) -> int:
+        """Number of queued or running jobs in every process."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()[0]
+
+    def prune(self, cutoff: float):
+        """
+        Delete jobs finished before cutoff, and fail jobs whose process is gone.
+
+        Args:
+            cutoff: Epoch seconds
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE finished_at < ?", (cutoff,))
+            owners = [
+                row[0] for row in conn.execute(
+                    "SELECT DISTINCT owner FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+                )
+            ]
+            now = time.time()
+            conn.executemany(
+                """
+                UPDATE jobs SET status = ?, error = 'Server process exited',
+                                finished_at = ?, version = version + 1
+                WHERE owner = ? AND status IN (?, ?)
+                """,
+                [
+                    (FAILED, now, owner, QUEUED, RUNNING)
+                    for owner in owners if not _process_alive(owner)
+                ]
+            )
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process (on this host) is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobManager:
+    """Runs backtest jobs on a bounded worker pool."""
+
+    def __init__(
+        self,
+        runner: Callable[[Dict, Callable[[float, Dict], None]], Dict],
+        max_workers: int = 2,
+        max_pending: int = 32,
+        retention: float = 3600,
+        store_path: Optional[str] = None
+    ):
+        """
+        Initialize the job manager.
+
+        Args:
+            runner: Function running one job: runner(params, progress) ->
+                JSON-serializable result; progress(fraction, metrics) may
+                raise BacktestCancelled
+            max_workers: Number of jobs running at the same time (per process)
+            max_pending: Maximum number of queued plus running jobs (in
+                every process sharing the store)
+            retention: Seconds finished jobs stay available for polling
+            store_path: SQLite job store shared with the server's other
+                processes (None keeps jobs visible to this process only)
+        """
+        self.runner = runner
+        self.max_pending = max_pending
+        self.retention = retention
+        self.store = JobStore(store_path) if store_path else None
+        self.jobs = {}  # Jobs run by this process
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='backtest-job'
+        )
+
+    def submit(self, params: Dict) -> BacktestJob:
+        """
+        Queue a backtest job.
+
+        Args:
+            params: Backtest parameters passed to the runner
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running
+        """
+        job = BacktestJob(params, self.store)
+
+        with self._lock:
+            self._prune()
+            if self.store is not None:
+                active = self.store.count_active()
+            else:
+                active = sum(1 for existing in self.jobs.values() if not existing.finished)
+            if active >= self.max_pending:
+                raise JobQueueFull(f"{active} backtest jobs already pending")
+            if self.store is not None:
+                self.store.add(job)
+            self.jobs[job.job_id] = job
+
+        self._executor.submit(self._run, job)
+        logger.info(f"Queued backtest job {job.job_id}: {params}")
+        return job
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        """Get a job by ID, run here or by another process (None if unknown or expired)."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is None and self.store is not None:
+            row = self.store.load(job_id)
+            if row is not None:
+                job = BacktestJob.from_row(row, self.store)
+        return job
+
+    def cancel(self, job_id: str) -> Optional[BacktestJob]:
+        """
+        Request cancellation of a job.
+
+        Queued jobs are cancelled before they start; running jobs stop at
+        their next progress report, in whichever process runs them.
+
+        Returns:
+            The job, or None if unknown
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+
+        job.cancel_requested.set()
+        if job.remote:
+            self.store.request_cancel(job_id)
+            job.refresh()
+            return job
+
+        if self.store is not None:
+            self.store.request_cancel(job_id)
+        if job.status == QUEUED:
+            job.update(status=CANCELLED, finished_at=time.time())
+        return job
+
+    def _run(self, job: BacktestJob):
+        """Run a job on a worker thread."""
+        # Imported here so that the API server boots without the engine
+        from backtester import BacktestCancelled
+
+        if job.cancel_pending():
+            if not job.finished:
+                job.update(status=CANCELLED, finished_at=time.time())
+            return
+
+        job.update(status=RUNNING)
+
+        def progress(fraction: float, metrics: Dict):
+            if job.cancel_pending():
+                raise BacktestCancelled(job.job_id)
+            job.update(progress=fraction, metrics=metrics)
+
+        try:
+            result = self.runner(job.params, progress)
+            job.update(status=DONE, progress=1.0, result=result, finished_at=time.time())
+        except BacktestCancelled:
+            logger.info(f"Backtest job {job.job_id} cancelled")
+            job.update(status=CANCELLED, finished_at=time.time())
+        except Exception as e:
+            logger.error(f"Backtest job {job.job_id} failed: {e}", exc_info=True)
+            job.update(status=FAILED, error=str(e), finished_at=time.time())
+
+    def _prune(self):
+        """Forget finished jobs older than the retention period (lock held)."""
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+        if self.store is not None:
+            self.store.prune(cutoff)
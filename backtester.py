@@ -1,30 +1,66 @@
 """Backtesting engine for trading strategy."""
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Optional
 import logging
-from news_analyzer import NewsAnalyzer
+import os
+import tempfile
 from market_data import MarketData
-from trading_strategy import TradingStrategy
+from data_sources import NewsSource
+from trading_strategy import SIGNAL_CODES, TradingStrategy, signal_column
+from news_store import NewsStore
+from synthetic_sentiment import generate_sentiment
+from performance_metrics import MetricsAccumulator
+from bar_alignment import (
+    SUPPORTED_INTERVALS, asof_bar_positions, is_intraday, mean_per_bar,
+    periods_per_year, session_close_times, to_utc_ns
+)
+from sentiment_kernel import decayed_sentiment
+from options import SENTIMENT_SOURCES
+from instrumentation import collect_timings, stage
+from config import Config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class BacktestCancelled(Exception):
+    """Raised by a progress callback to abort a running backtest."""
+
+
 class Backtester:
     """Backtests trading strategy against historical data."""
     
-    def __init__(self):
-        """Initialize backtester with required components."""
-        self.news_analyzer = None  # Lazy initialization
-        self.market_data = MarketData()
+    def __init__(
+        self,
+        market_data: Optional[MarketData] = None,
+        news_source: Optional[NewsSource] = None
+    ):
+        """
+        Initialize backtester with required components.
+        
+        Args:
+            market_data: Price data provider (default: yfinance-backed)
+            news_source: Articles for stored and decayed sentiment, e.g. a
+                replay recording; they are scored into a temporary news
+                store (default: the news store at Config.NEWS_STORE_PATH)
+        """
+        self.news_source = news_source
+        self.news_store = None  # Lazy initialization
+        self.market_data = market_data or MarketData()
+        self._news_dir = None  # Temporary store of the news source's articles
+        self._loaded_news = set()  # (symbol, start, end) already scored into it
+        self._news_analyzer = None  # Scores articles without recorded sentiment
     
     def run_backtest(
         self,
         symbol: str,
         days: int = 90,
-        initial_capital: float = 10000
+        initial_capital: float = 10000,
+        engine: str = 'array',
+        sentiment_source: str = 'simulated',
+        progress: Optional[Callable[[float, Dict], None]] = None,
+        interval: str = '1d'
     ) -> Dict:
         """
         Run backtest for a symbol over a time period.
@@ -33,26 +69,465 @@ class Backtester:
             symbol: Stock ticker symbol
             days: Number of days to backtest
             initial_capital: Starting capital
+            engine: 'array' (columnar simulation over NumPy arrays) or
+                'loop' (original per-date DataFrame filtering)
+            sentiment_source: 'simulated' (synthetic sentiment cycles),
+                'stored' (articles in the news store: daily aggregates for
+                daily bars, each article on the first bar at or after its
+                publication for intraday bars) or 'decayed' (stored articles
+                as an exponentially time-decayed signal, see
+                sentiment_kernel.py)
+            progress: Optional callback receiving (fraction done, metrics so
+                far) during the simulation (array engine); it may raise
+                BacktestCancelled to abort the run
+            interval: Bar interval ('1m', '5m', '15m', '30m', '1h' or '1d')
             
         Returns:
-            Dictionary with backtest results
+            Dictionary with backtest results, including 'timings' (seconds
+            per stage: price_history, price_download, align, simulation,
+            metrics and total)
         """
-        logger.info(f"Starting backtest for {symbol} over {days} days")
+        logger.info(f"Starting backtest for {symbol} over {days} days ({interval} bars)")
+        
+        if engine not in ('array', 'loop'):
+            raise ValueError(f"Unknown backtest engine: {engine}")
+        if sentiment_source not in SENTIMENT_SOURCES:
+            raise ValueError(f"Unknown sentiment source: {sentiment_source}")
+        if interval not in SUPPORTED_INTERVALS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        if engine == 'loop' and (sentiment_source != 'simulated' or interval != '1d'):
+            raise ValueError("The loop engine only supports simulated sentiment on daily bars")
         
+        with collect_timings() as timings:
+            result = self._run(
+                symbol, days, initial_capital, engine, sentiment_source, progress, interval
+            )
+        result['timings'] = timings
+        return result
+    
+    def _run(
+        self,
+        symbol: str,
+        days: int,
+        initial_capital: float,
+        engine: str,
+        sentiment_source: str,
+        progress: Optional[Callable[[float, Dict], None]],
+        interval: str
+    ) -> Dict:
+        """Run a validated backtest (see run_backtest)."""
         # Initialize strategy
         strategy = TradingStrategy(initial_capital=initial_capital)
         
         # Get historical price data
-        price_data = self.market_data.get_price_history(symbol, days=days)
+        price_data = self.market_data.get_price_history(symbol, days=days, interval=interval)
         
         if price_data.empty:
             logger.error("No price data available")
             return self._empty_result(symbol)
         
-        # Initialize news analyzer (only when needed)
-        if self.news_analyzer is None:
-            self.news_analyzer = NewsAnalyzer()
+        accumulator = None
+        if engine == 'loop':
+            with stage('simulation'):
+                results_df = self._run_loop(symbol, price_data, strategy, initial_capital)
+        else:
+            # Bar alignment and sentiment (simulated, or read from the news store)
+            with stage('align'):
+                timestamps, prices, sentiments = self._build_arrays(
+                    symbol, price_data, sentiment_source, interval
+                )
+            accumulator = MetricsAccumulator(initial_capital, periods_per_year(interval))
+            with stage('simulation'):
+                results_df = self._simulate(
+                    strategy, timestamps, prices, sentiments, initial_capital, accumulator, progress
+                )
+        
+        # Calculate performance metrics
+        with stage('metrics'):
+            metrics = self._calculate_metrics(results_df, strategy, initial_capital, accumulator)
+        
+        logger.info(f"Backtest complete. Strategy return: {metrics['strategy_return']:.2%}, "
+                   f"Buy & Hold return: {metrics['buy_hold_return']:.2%}")
+        
+        return {
+            'symbol': symbol,
+            'results': results_df,
+            'metrics': metrics,
+            'trades': strategy.trades,
+            'initial_capital': initial_capital
+        }
+    
+    def load_arrays(
+        self,
+        symbol: str,
+        days: int = 90,
+        sentiment_source: str = 'simulated',
+        interval: str = '1d'
+    ):
+        """
+        Load the price and sentiment arrays a backtest runs on.
+        
+        Args:
+            symbol: Stock ticker symbol
+            days: Number of days to load
+            sentiment_source: 'simulated', 'stored' or 'decayed' (see run_backtest)
+            interval: Bar interval (see run_backtest)
+            
+        Returns:
+            Tuple of (timestamps, prices, sentiments), or None if no data
+        """
+        price_data = self.market_data.get_price_history(symbol, days=days, interval=interval)
+        
+        if price_data.empty:
+            logger.error("No price data available")
+            return None
+        
+        return self._build_arrays(symbol, price_data, sentiment_source, interval)
+    
+    def _build_arrays(
+        self,
+        symbol: str,
+        price_data: pd.DataFrame,
+        sentiment_source: str = 'simulated',
+        interval: str = '1d'
+    ):
+        """Build aligned (timestamps, prices, sentiments) arrays from price data."""
+        if is_intraday(interval):
+            timestamps, prices = self._prepare_intraday_arrays(price_data)
+            logger.info(f"Backtesting over {len(timestamps)} {interval} bars")
+            
+            if sentiment_source == 'stored':
+                sentiments = self._get_stored_bar_sentiments(symbol, timestamps)
+            elif sentiment_source == 'decayed':
+                sentiments = self._get_decayed_sentiments(symbol, timestamps, timestamps)
+            else:
+                sentiments = generate_sentiment(symbol, timestamps)
+            return timestamps, prices, sentiments
+        
+        dates, timestamps, prices = self._prepare_arrays(price_data)
+        logger.info(f"Backtesting over {len(dates)} trading days")
+        
+        if sentiment_source == 'stored':
+            sentiments = self._get_stored_sentiments(symbol, dates)
+        elif sentiment_source == 'decayed':
+            # A daily bar trades at its close, so it sees the news published
+            # until then, not what comes out later that (UTC) day
+            evaluation_times = session_close_times(
+                timestamps, Config.MARKET_CLOSE_TIME, Config.MARKET_TIMEZONE
+            )
+            sentiments = self._get_decayed_sentiments(symbol, timestamps, evaluation_times)
+        else:
+            # Simulated sentiment (in production, use stored historical news)
+            sentiments = generate_sentiment(symbol, dates)
+        return timestamps, prices, sentiments
+    
+    def _get_news_store(self, symbol: str, start, end) -> NewsStore:
+        """
+        Get a news store holding the symbol's articles published in [start, end].
+        
+        Without a news source, this is the persistent store. Otherwise the
+        source's articles are fetched once per symbol and range into a
+        temporary store, keeping their recorded 'sentiment' and scoring the
+        others with VADER.
+        
+        Args:
+            symbol: Stock ticker
+            start: Range start (date or timestamp)
+            end: Range end (date or timestamp); a date covers the whole day
+            
+        Returns:
+            NewsStore to query
+        """
+        if self.news_source is None:
+            if self.news_store is None:
+                self.news_store = NewsStore(Config.NEWS_STORE_PATH)
+            return self.news_store
+        
+        if self.news_store is None:
+            self._news_dir = tempfile.TemporaryDirectory(prefix='backtest-news-')
+            self.news_store = NewsStore(os.path.join(self._news_dir.name, 'news.db'))
+        
+        if (symbol, start, end) not in self._loaded_news:
+            # Source windows end before `end`: extend them to cover it
+            if isinstance(end, date) and not isinstance(end, datetime):
+                window_end = pd.Timestamp(end) + pd.Timedelta(days=1)
+            else:
+                window_end = pd.Timestamp(end) + pd.Timedelta(microseconds=1)
+            articles = self.news_source.get_articles(
+                symbol, symbol, pd.Timestamp(start).to_pydatetime(), window_end.to_pydatetime()
+            )
+            saved = self.news_store.save_articles(symbol, self._score_source_articles(articles))
+            logger.info(f"Loaded {saved} articles for {symbol} from {type(self.news_source).__name__}")
+            self._loaded_news.add((symbol, start, end))
+        return self.news_store
+    
+    def _score_source_articles(self, articles) -> list:
+        """Convert source articles to news store rows, scoring those without 'sentiment'."""
+        texts = [
+            f"{article.get('title', '')}. {article.get('description', '')}"
+            for article in articles
+        ]
+        unscored = [i for i, article in enumerate(articles) if article.get('sentiment') is None]
+        scores = {}
+        if unscored:
+            if self._news_analyzer is None:
+                from news_analyzer import NewsAnalyzer
+                self._news_analyzer = NewsAnalyzer(news_source=self.news_source)
+            scores = dict(zip(
+                unscored, self._news_analyzer.analyze_sentiment_batch([texts[i] for i in unscored])
+            ))
+        
+        return [
+            {
+                # The store keys articles by URL; recordings may omit it
+                'url': article.get('url') or f"{article['publishedAt']} {article.get('title', '')}",
+                'published_at': article['publishedAt'],
+                'title': article.get('title', ''),
+                'description': article.get('description', ''),
+                'sentiment': scores.get(i, article.get('sentiment'))
+            }
+            for i, article in enumerate(articles)
+            if article.get('publishedAt')
+        ]
+    
+    def _get_stored_sentiments(self, symbol: str, dates) -> np.ndarray:
+        """
+        Get real daily sentiment for each date from the news store.
+        
+        All days are loaded with a single range query. A day trades at its
+        close on the articles published since the previous close
+        (MARKET_CLOSE_TIME in MARKET_TIMEZONE); days without stored
+        articles are neutral (0.0), as when live news returns no articles.
+        
+        Args:
+            symbol: Stock ticker
+            dates: Trading dates (ascending)
+            
+        Returns:
+            Sentiment score per date
+        """
+        if len(dates) == 0:
+            return np.array([])
+        
+        # From the business day before the first date (its after-close news)
+        first = (pd.Timestamp(dates[0]) - pd.offsets.BDay(1)).date()
+        news_store = self._get_news_store(symbol, first, dates[-1])
+        daily = news_store.get_daily_sentiment(
+            symbol, dates, Config.MARKET_CLOSE_TIME, Config.MARKET_TIMEZONE
+        )
+        logger.info(f"Loaded stored sentiment for {len(daily)} of {len(dates)} days")
         
+        return daily['sentiment'].reindex(dates, fill_value=0.0).to_numpy(dtype=float)
+    
+    def _get_stored_bar_sentiments(self, symbol: str, timestamps: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Get real sentiment per intraday bar from the news store.
+        
+        Each article counts toward the first bar at or after its
+        publication time (a sorted as-of join, so no bar sees news from its
+        future); bars with several articles take their mean and bars
+        without articles are neutral (0.0).
+        
+        Args:
+            symbol: Stock ticker
+            timestamps: Bar times (ascending)
+            
+        Returns:
+            Sentiment score per bar
+        """
+        if len(timestamps) == 0:
+            return np.array([])
+        
+        bar_times = to_utc_ns(timestamps)
+        # The first bar also collects the articles of the bar before it
+        lookback = timestamps[1] - timestamps[0] if len(timestamps) > 1 else pd.Timedelta(0)
+        start, end = timestamps[0] - lookback, timestamps[-1]
+        published, sentiment = self._get_news_store(symbol, start, end).get_sentiment_events(
+            symbol, start, end
+        )
+        logger.info(f"Aligning {len(published)} stored articles to {len(bar_times)} bars")
+        
+        positions = asof_bar_positions(bar_times, published)
+        return mean_per_bar(len(bar_times), positions, sentiment)
+    
+    def _get_decayed_sentiments(
+        self,
+        symbol: str,
+        timestamps: pd.DatetimeIndex,
+        evaluation_times: pd.DatetimeIndex
+    ) -> np.ndarray:
+        """
+        Get the time-decayed sentiment of stored articles at every bar.
+        
+        Articles up to SENTIMENT_HALF_LIFE_HOURS * SENTIMENT_DECAY_LOOKBACK
+        before the first bar are loaded so the signal is warm from the start.
+        
+        Args:
+            symbol: Stock ticker
+            timestamps: Bar times (ascending)
+            evaluation_times: Time each bar's signal is read at (ascending)
+            
+        Returns:
+            Sentiment score per bar
+        """
+        if len(timestamps) == 0:
+            return np.array([])
+        
+        half_life = Config.SENTIMENT_HALF_LIFE_HOURS * 3600
+        lookback = pd.Timedelta(seconds=half_life * Config.SENTIMENT_DECAY_LOOKBACK)
+        start, end = timestamps[0] - lookback, evaluation_times[-1]
+        published, sentiment = self._get_news_store(symbol, start, end).get_sentiment_events(
+            symbol, start, end
+        )
+        logger.info(
+            f"Decaying {len(published)} stored articles over {len(timestamps)} bars "
+            f"(half-life {Config.SENTIMENT_HALF_LIFE_HOURS}h)"
+        )
+        
+        signal, _ = decayed_sentiment(
+            published, sentiment, to_utc_ns(evaluation_times),
+            half_life, Config.SENTIMENT_PRIOR_WEIGHT
+        )
+        return signal
+    
+    def _prepare_arrays(self, price_data: pd.DataFrame):
+        """
+        Extract one bar per trading date as NumPy arrays.
+        
+        Keeps the first row of each calendar date, in order of appearance,
+        exactly like the per-date loop does. Only the time and close columns
+        are read and the input frame is not modified.
+        
+        Args:
+            price_data: DataFrame with a time column first (or 'date') and 'close'
+            
+        Returns:
+            Tuple of (dates, timestamps, prices) arrays
+        """
+        times = pd.to_datetime(price_data[self._time_column(price_data)])
+        if times.dt.tz is not None:
+            # Calendar dates in the exchange's own timezone
+            times = times.dt.tz_localize(None)
+        days = times.dt.normalize()
+        first_rows = ~days.duplicated().to_numpy()
+        
+        timestamps = pd.DatetimeIndex(days[first_rows])
+        dates = timestamps.date
+        prices = price_data['close'].to_numpy(dtype=float)[first_rows]
+        return dates, timestamps, prices
+    
+    def _prepare_intraday_arrays(self, price_data: pd.DataFrame):
+        """
+        Extract every intraday bar as NumPy arrays, sorted by time.
+        
+        Args:
+            price_data: DataFrame with a time column first (or 'datetime') and 'close'
+            
+        Returns:
+            Tuple of (timestamps, prices)
+        """
+        timestamps = pd.DatetimeIndex(pd.to_datetime(price_data[self._time_column(price_data)]))
+        prices = price_data['close'].to_numpy(dtype=float)
+        
+        if not timestamps.is_monotonic_increasing:
+            order = np.argsort(timestamps.asi8, kind='stable')
+            timestamps, prices = timestamps[order], prices[order]
+        return timestamps, prices
+    
+    def _time_column(self, price_data: pd.DataFrame) -> str:
+        """Name of the bar time column ('date' for daily, 'datetime' for intraday yfinance bars)."""
+        for name in ('date', 'datetime'):
+            if name in price_data.columns:
+                return name
+        return price_data.columns[0]
+    
+    def _simulate(
+        self,
+        strategy: TradingStrategy,
+        timestamps,
+        prices: np.ndarray,
+        sentiments: np.ndarray,
+        initial_capital: float,
+        accumulator: Optional[MetricsAccumulator] = None,
+        progress: Optional[Callable[[float, Dict], None]] = None
+    ) -> pd.DataFrame:
+        """
+        Run the strategy state machine over aligned price/sentiment arrays.
+        
+        Args:
+            strategy: Strategy instance holding cash/holdings state
+            timestamps: Bar timestamps
+            prices: Close price per bar
+            sentiments: Sentiment score per bar
+            initial_capital: Starting capital (for Buy & Hold)
+            accumulator: Optional metrics accumulator updated at every bar
+            progress: Optional callback receiving (fraction done, metrics
+                so far), called about every 1% of the bars
+            
+        Returns:
+            DataFrame with one row per bar (the trades themselves stay in
+            strategy.trades)
+        """
+        n = len(prices)
+        if n == 0:
+            return pd.DataFrame()
+        
+        # Simulate Buy & Hold (buy on first day)
+        buy_hold_shares = initial_capital / prices[0]
+        
+        price_list = prices.tolist()
+        sentiment_list = np.asarray(sentiments, dtype=float).tolist()
+        buy_hold_list = (buy_hold_shares * prices).tolist()
+        signal_codes = [0] * n
+        portfolio_values = [0.0] * n
+        cash_values = [0.0] * n
+        holdings_values = [0] * n
+        
+        generate_signal = strategy.generate_signal
+        execute_trade = strategy.execute_trade
+        progress_step = max(1, n // 100)
+        
+        for i in range(n):
+            if progress is not None and i % progress_step == 0:
+                progress(i / n, accumulator.result() if accumulator is not None else {})
+            
+            current_price = price_list[i]
+            sentiment = sentiment_list[i]
+            
+            signal = generate_signal(sentiment, current_price)
+            trade = None
+            if signal != 'HOLD':
+                trade = execute_trade(signal, current_price, sentiment, timestamps[i])
+                signal_codes[i] = SIGNAL_CODES[signal]
+            
+            strategy.update_portfolio_value(current_price)
+            portfolio_values[i] = strategy.portfolio_value
+            cash_values[i] = strategy.cash
+            holdings_values[i] = strategy.holdings
+            
+            if accumulator is not None:
+                accumulator.add_trade(trade)
+                accumulator.update(strategy.portfolio_value, buy_hold_list[i])
+        
+        return pd.DataFrame({
+            'date': timestamps,
+            'price': prices,
+            'sentiment': sentiments,
+            'signal': signal_column(signal_codes),
+            'portfolio_value': portfolio_values,
+            'buy_hold_value': buy_hold_list,
+            'cash': cash_values,
+            'holdings': holdings_values
+        })
+    
+    def _run_loop(
+        self,
+        symbol: str,
+        price_data: pd.DataFrame,
+        strategy: TradingStrategy,
+        initial_capital: float
+    ) -> pd.DataFrame:
+        """Run the original per-date backtest loop (reference engine)."""
         # Prepare results storage
         results = []
         buy_hold_value = initial_capital
@@ -64,6 +539,9 @@ class Backtester:
         
         logger.info(f"Backtesting over {len(dates)} trading days")
         
+        # Simulated sentiment for every date (mock data for demo)
+        sentiments = generate_sentiment(symbol, dates)
+        
         # Simulate Buy & Hold (buy on first day)
         first_price = price_data.iloc[0]['close']
         buy_hold_shares = initial_capital / first_price
@@ -78,15 +556,15 @@ class Backtester:
             current_price = day_data.iloc[0]['close']
             timestamp = pd.to_datetime(day_data.iloc[0]['date'])
             
-            # Get sentiment for this date (simulate with mock data for demo)
+            # Get sentiment for this date
             # In production, you'd fetch historical news for each date
-            sentiment = self._get_sentiment_for_date(symbol, date, i, len(dates))
+            sentiment = sentiments[i]
             
             # Generate signal
             signal = strategy.generate_signal(sentiment, current_price)
             
             # Execute trade
-            trade = strategy.execute_trade(signal, current_price, sentiment, timestamp)
+            strategy.execute_trade(signal, current_price, sentiment, timestamp)
             
             # Update portfolio value
             portfolio_state = strategy.get_portfolio_state(current_price)
@@ -103,131 +581,49 @@ class Backtester:
                 'portfolio_value': portfolio_state['portfolio_value'],
                 'buy_hold_value': buy_hold_value,
                 'cash': portfolio_state['cash'],
-                'holdings': portfolio_state['holdings'],
-                'trade': trade
+                'holdings': portfolio_state['holdings']
             })
         
         # Convert to DataFrame
         results_df = pd.DataFrame(results)
-        
-        # Calculate performance metrics
-        metrics = self._calculate_metrics(results_df, strategy, initial_capital)
-        
-        logger.info(f"Backtest complete. Strategy return: {metrics['strategy_return']:.2%}, "
-                   f"Buy & Hold return: {metrics['buy_hold_return']:.2%}")
-        
-        return {
-            'symbol': symbol,
-            'results': results_df,
-            'metrics': metrics,
-            'trades': strategy.trades,
-            'initial_capital': initial_capital
-        }
+        if not results_df.empty:
+            results_df['signal'] = signal_column(results_df['signal'].map(SIGNAL_CODES))
+        return results_df
     
-    def _get_sentiment_for_date(
+    def _calculate_metrics(
         self,
-        symbol: str,
-        date,
-        day_index: int,
-        total_days: int
-    ) -> float:
+        results_df: pd.DataFrame,
+        strategy: TradingStrategy,
+        initial_capital: float,
+        accumulator: Optional[MetricsAccumulator] = None
+    ) -> Dict:
         """
-        Get sentiment for a specific date.
-        For demo purposes, this generates realistic sentiment patterns.
-        In production, you'd fetch actual historical news.
+        Calculate performance metrics.
         
         Args:
-            symbol: Stock ticker
-            date: Date to get sentiment for
-            day_index: Index of current day
-            total_days: Total number of days
+            results_df: Per-bar results with 'portfolio_value' and 'buy_hold_value'
+            strategy: Strategy holding the executed trades
+            initial_capital: Starting capital
+            accumulator: Accumulator already fed during the simulation; when
+                given, its metrics are returned in O(1)
             
         Returns:
-            Sentiment score
+            Dictionary of performance metrics
         """
-        # Generate realistic sentiment pattern with some randomness
-        # This simulates news sentiment cycles
-        np.random.seed(hash(str(date)) % 2**32)
-        
-        # Base trend
-        trend = np.sin(day_index / total_days * 4 * np.pi) * 0.3
-        
-        # Random noise
-        noise = np.random.normal(0, 0.3)
-        
-        # Occasional strong signals
-        if np.random.random() < 0.1:  # 10% chance of strong signal
-            noise += np.random.choice([-0.5, 0.5])
-        
-        sentiment = np.clip(trend + noise, -1, 1)
-        
-        return sentiment
-    
-    def _calculate_metrics(
-        self,
-        results_df: pd.DataFrame,
-        strategy: TradingStrategy,
-        initial_capital: float
-    ) -> Dict:
-        """Calculate performance metrics."""
         if results_df.empty:
             return {}
         
-        final_portfolio = results_df.iloc[-1]['portfolio_value']
-        final_buy_hold = results_df.iloc[-1]['buy_hold_value']
-        
-        # Returns
-        strategy_return = (final_portfolio - initial_capital) / initial_capital
-        buy_hold_return = (final_buy_hold - initial_capital) / initial_capital
-        
-        # Calculate daily returns for Sharpe ratio
-        results_df['strategy_returns'] = results_df['portfolio_value'].pct_change()
-        results_df['buy_hold_returns'] = results_df['buy_hold_value'].pct_change()
-        
-        # Sharpe ratio (assuming 252 trading days, 0% risk-free rate)
-        strategy_sharpe = (
-            results_df['strategy_returns'].mean() / results_df['strategy_returns'].std() * np.sqrt(252)
-            if results_df['strategy_returns'].std() > 0 else 0
-        )
-        
-        buy_hold_sharpe = (
-            results_df['buy_hold_returns'].mean() / results_df['buy_hold_returns'].std() * np.sqrt(252)
-            if results_df['buy_hold_returns'].std() > 0 else 0
-        )
-        
-        # Max drawdown
-        strategy_cummax = results_df['portfolio_value'].cummax()
-        strategy_drawdown = (results_df['portfolio_value'] - strategy_cummax) / strategy_cummax
-        max_drawdown = strategy_drawdown.min()
-        
-        # Win rate
-        winning_trades = [t for t in strategy.trades if self._is_winning_trade(t, strategy.trades)]
-        win_rate = len(winning_trades) / len(strategy.trades) if strategy.trades else 0
-        
-        return {
-            'strategy_return': strategy_return,
-            'buy_hold_return': buy_hold_return,
-            'outperformance': strategy_return - buy_hold_return,
-            'strategy_sharpe': strategy_sharpe,
-            'buy_hold_sharpe': buy_hold_sharpe,
-            'max_drawdown': max_drawdown,
-            'total_trades': len(strategy.trades),
-            'win_rate': win_rate,
-            'final_portfolio_value': final_portfolio,
-            'final_buy_hold_value': final_buy_hold
-        }
-    
-    def _is_winning_trade(self, trade: Dict, all_trades: List[Dict]) -> bool:
-        """Determine if a trade was profitable."""
-        if trade['action'] != 'SELL':
-            return False
-        
-        # Find the corresponding buy trade
-        for prev_trade in reversed(all_trades):
-            if prev_trade['timestamp'] < trade['timestamp'] and prev_trade['action'] == 'BUY':
-                return trade['price'] > prev_trade['price']
+        if accumulator is None:
+            accumulator = MetricsAccumulator(initial_capital)
+            for portfolio_value, buy_hold_value in zip(
+                results_df['portfolio_value'].tolist(),
+                results_df['buy_hold_value'].tolist()
+            ):
+                accumulator.update(portfolio_value, buy_hold_value)
+            for trade in strategy.trades:
+                accumulator.add_trade(trade)
         
-        return False
+        return accumulator.result()
     
     def _empty_result(self, symbol: str) -> Dict:
         """Return empty result structure."""
@@ -0,0 +1,100 @@
+"""Event-time alignment of news to price bars (sorted as-of joins)."""
+import numpy as np
+import pandas as pd
+from options import INTRADAY_INTERVALS, SUPPORTED_INTERVALS
+
+# Regular-session bars per trading day (6.5 hours; yfinance splits it into 7 hourly bars)
+BARS_PER_DAY = {'1m': 390, '5m': 78, '15m': 26, '30m': 13, '1h': 7, '1d': 1}
+
+
+def is_intraday(interval: str) -> bool:
+    """Whether bars of this interval are shorter than a day."""
+    return interval in INTRADAY_INTERVALS
+
+
+def periods_per_year(interval: str) -> int:
+    """Bars per year used to annualize Sharpe ratios (252 trading days)."""
+    return 252 * BARS_PER_DAY.get(interval, 1)
+
+
+def to_utc_ns(times) -> np.ndarray:
+    """
+    Convert timestamps to UTC epoch nanoseconds (naive values are UTC).
+
+    Args:
+        times: Datetime-like array, Series or index
+
+    Returns:
+        int64 array
+    """
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    if times.tz is None:
+        times = times.tz_localize('UTC')
+    return times.tz_convert('UTC').as_unit('ns').asi8
+
+
+def session_close_times(days, close: str = '16:00', timezone: str = 'America/New_York') -> pd.DatetimeIndex:
+    """
+    Get the time each trading day's session closes.
+
+    Args:
+        days: Calendar dates of daily bars (naive, in the exchange's timezone)
+        close: Closing time of day on the exchange ('HH:MM')
+        timezone: Exchange timezone
+
+    Returns:
+        Closing times (UTC)
+    """
+    days = pd.DatetimeIndex(pd.to_datetime(days)).normalize()
+    if days.tz is not None:
+        days = days.tz_localize(None)
+    closes = (days + pd.Timedelta(f"{close}:00")).tz_localize(
+        timezone, ambiguous=False, nonexistent='shift_forward'
+    )
+    return closes.tz_convert('UTC')
+
+
+def asof_bar_positions(bar_times: np.ndarray, event_times: np.ndarray) -> np.ndarray:
+    """
+    Find the first bar at or after each event (a forward as-of join).
+
+    Both inputs are sorted UTC nanoseconds; the join is one binary search
+    per event, O((bars + events) log bars) with no per-bar filtering.
+
+    Args:
+        bar_times: Ascending bar times
+        event_times: Event times
+
+    Returns:
+        Bar position per event (len(bar_times) for events after the last bar)
+    """
+    return np.searchsorted(bar_times, event_times, side='left')
+
+
+def mean_per_bar(
+    n_bars: int,
+    positions: np.ndarray,
+    values: np.ndarray,
+    fill: float = 0.0
+) -> np.ndarray:
+    """
+    Average the values of the events aligned to each bar.
+
+    Args:
+        n_bars: Number of bars
+        positions: Bar position per event (from asof_bar_positions)
+        values: Value per event
+        fill: Value of bars without events
+
+    Returns:
+        Mean value per bar
+    """
+    inside = positions < n_bars
+    positions = positions[inside]
+    values = np.asarray(values, dtype=float)[inside]
+
+    sums = np.bincount(positions, weights=values, minlength=n_bars)
+    counts = np.bincount(positions, minlength=n_bars)
+    means = np.full(n_bars, fill, dtype=float)
+    np.divide(sums, counts, out=means, where=counts > 0)
+    return means
@@ -0,0 +1,137 @@
+"""Logging overhead benchmark: a backtest with one trade per bar.
+
+Times the same run with per-trade logging off, written synchronously by
+the handler (what logging.basicConfig sets up), handed to the background
+writer of log_pipeline.py as text or JSON lines, and sampled. Log lines go
+to a temporary file. Runs offline on synthetic data:
+
+    python benchmark_logging.py --trades 100000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from backtester import Backtester
+from log_pipeline import TEXT_FORMAT, configure_logging, sample_loggers, stop_logging
+from trading_strategy import TradingStrategy
+
+logger = logging.getLogger(__name__)
+
+# Modes: (description, writer: None/'sync'/'queue', JSON lines, keep 1 in N)
+MODES = {
+    'off': ('per-trade logging off', None, False, 0),
+    'sync_text': ('synchronous handler, text', 'sync', False, 1),
+    'queue_text': ('background writer, text', 'queue', False, 1),
+    'queue_json': ('background writer, JSON lines', 'queue', True, 1),
+    'queue_json_sampled': ('background writer, JSON lines, 1 in 100', 'queue', True, 100)
+}
+
+
+def synthetic_run(trades: int, seed: int = 0):
+    """
+    Build a backtest that trades on every bar.
+
+    Sentiment alternates between strongly positive and strongly negative,
+    so the strategy buys and sells on alternate bars.
+
+    Returns:
+        Function running the backtest and returning its number of trades
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range('2000-01-01', periods=trades, freq='min')
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, trades)))
+    sentiments = np.where(np.arange(trades) % 2 == 0, 0.9, -0.9)
+    backtester = Backtester()
+
+    def run() -> int:
+        strategy = TradingStrategy(initial_capital=10000)
+        backtester._simulate(strategy, timestamps, prices, sentiments, 10000)
+        return len(strategy.trades)
+
+    return run
+
+
+def use_writer(writer, json_lines: bool, path: str):
+    """Point the root logger at a fresh log file through the given writer."""
+    stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    if writer == 'queue':
+        configure_logging(logging.INFO, json_lines=json_lines, path=path)
+    else:
+        handler = logging.FileHandler(path)
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+
+
+def run_mode(run, mode: str, repeats: int) -> dict:
+    """
+    Time one mode: best of several runs, then the time to drain the queue.
+
+    Returns:
+        Dictionary of run and drain seconds, trades and lines written
+    """
+    _, writer, json_lines, every = MODES[mode]
+    best = None
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trades.log')
+            use_writer(writer, json_lines, path)
+
+            with sample_loggers({'trading_strategy': every, 'backtester': 0}):
+                started = time.perf_counter()
+                trades = run()
+                ran = time.perf_counter()
+            stop_logging()
+            for handler in logging.getLogger().handlers:
+                handler.flush()
+            drained = time.perf_counter()
+
+            with open(path) as f:
+                lines = sum(1 for _ in f)
+            timing = {
+                'run_seconds': ran - started,
+                'drain_seconds': drained - ran,
+                'trades': trades,
+                'lines': lines
+            }
+            if best is None or timing['run_seconds'] < best['run_seconds']:
+                best = timing
+    return best
+
+
+def main(argv=None):
+    """Run every mode and print the slowdown relative to logging off."""
+    parser = argparse.ArgumentParser(description='Per-trade logging overhead benchmark')
+    parser.add_argument('--trades', type=int, default=100000, help='Number of trades (one per bar)')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per mode (best is kept)')
+    args = parser.parse_args(argv)
+
+    run = synthetic_run(args.trades)
+    results = {mode: run_mode(run, mode, args.repeats) for mode in MODES}
+
+    # Back to the default setup once every mode has run
+    configure_logging()
+
+    baseline = results['off']['run_seconds']
+    print(f"{results['off']['trades']:,} trades")
+    print(f"{'mode':45} {'run s':>8} {'drain s':>8} {'slowdown':>9} {'us/trade':>9} {'lines':>8}")
+    for mode, result in results.items():
+        extra = (result['run_seconds'] - baseline) / result['trades'] * 1e6
+        print(
+            f"{MODES[mode][0]:45} {result['run_seconds']:>8.3f} {result['drain_seconds']:>8.3f} "
+            f"{result['run_seconds'] / baseline:>8.2f}x {extra:>9.2f} {result['lines']:>8,}"
+        )
+    return results
+
+
+if __name__ == '__main__':
+    configure_logging()
+    main()
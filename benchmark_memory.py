@@ -0,0 +1,124 @@
+"""Memory benchmark of backtest results: bytes per bar and per trade.
+
+Compares the compact representation (int8 categorical signal column,
+trades kept only as __slots__ Trade records) with the previous one
+(string signal column, an object column holding every trade dict next to
+the strategy's own list of trade dicts). Runs offline on synthetic data:
+
+    python benchmark_memory.py --bars 1000000
+"""
+import argparse
+import gc
+import sys
+import logging
+import tracemalloc
+import numpy as np
+import pandas as pd
+from backtester import Backtester
+from log_pipeline import configure_logging
+from trading_strategy import TradingStrategy
+
+logger = logging.getLogger(__name__)
+
+
+def retained_bytes(build):
+    """
+    Measure the memory a builder allocates and keeps alive.
+
+    Returns:
+        Tuple of (built object, bytes still allocated after building)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return built, current
+
+
+def legacy_frame(results_df: pd.DataFrame, trade_dicts, trade_rows) -> pd.DataFrame:
+    """Rebuild the previous per-bar frame: string signals and a trade object column."""
+    trades = [None] * len(results_df)
+    for row, trade in zip(trade_rows, trade_dicts):
+        trades[row] = trade
+    frame = results_df.copy()
+    frame['signal'] = frame['signal'].astype(object)
+    frame['trade'] = trades
+    return frame
+
+
+def trade_bytes(trade) -> int:
+    """Size of a trade record and its values (interned strings excluded)."""
+    values = trade.values() if isinstance(trade, dict) else (getattr(trade, f) for f in trade.__slots__)
+    return sys.getsizeof(trade) + sum(
+        sys.getsizeof(value) for value in values if not isinstance(value, str) and value is not None
+    )
+
+
+def run(bars: int, seed: int = 0) -> dict:
+    """
+    Backtest synthetic bars and measure both representations.
+
+    Args:
+        bars: Number of bars
+        seed: Seed of the synthetic prices and sentiment
+
+    Returns:
+        Dictionary of bytes per bar and per trade, before and after
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range('2000-01-01', periods=bars, freq='min')
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, bars)))
+    sentiments = np.clip(rng.normal(0, 0.4, bars), -1, 1)
+
+    logging.disable(logging.INFO)
+    try:
+        backtester = Backtester()
+        strategy = TradingStrategy(initial_capital=10000)
+        results_df = backtester._simulate(strategy, timestamps, prices, sentiments, 10000)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    trades = strategy.trades
+    trade_rows = np.flatnonzero(results_df['signal'].to_numpy() != 'HOLD')
+
+    # Per-bar frame: copies of the new frame versus the rebuilt old one
+    _, compact_frame = retained_bytes(lambda: results_df.copy())
+    trade_dicts = [trade.to_dict() for trade in trades]
+    _, legacy_frame_bytes = retained_bytes(lambda: legacy_frame(results_df, trade_dicts, trade_rows))
+
+    compact_trade = float(np.mean([trade_bytes(trade) for trade in trades])) if trades else 0.0
+    legacy_trade = float(np.mean([trade_bytes(trade) for trade in trade_dicts])) if trades else 0.0
+
+    return {
+        'bars': bars,
+        'trades': len(trades),
+        'bytes_per_bar': {'before': legacy_frame_bytes / bars, 'after': compact_frame / bars},
+        'bytes_per_trade': {'before': legacy_trade, 'after': compact_trade},
+        'signal_column_bytes': {
+            'before': int(results_df['signal'].astype(object).memory_usage(index=False)),
+            'after': int(results_df['signal'].memory_usage(index=False))
+        }
+    }
+
+
+def main(argv=None):
+    """Run the benchmark and print a before/after table."""
+    parser = argparse.ArgumentParser(description='Backtest result memory benchmark')
+    parser.add_argument('--bars', type=int, default=1000000, help='Number of synthetic bars')
+    args = parser.parse_args(argv)
+
+    result = run(args.bars)
+    print(f"{result['bars']:,} bars, {result['trades']:,} trades")
+    print(f"{'':18} {'before':>10} {'after':>10}")
+    for key in ('bytes_per_bar', 'bytes_per_trade'):
+        before, after = result[key]['before'], result[key]['after']
+        print(f"{key:18} {before:>10.1f} {after:>10.1f}  ({1 - after / before:.0%} less)")
+    return result
+
+
+if __name__ == '__main__':
+    configure_logging()
+    main()
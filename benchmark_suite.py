@@ -0,0 +1,498 @@
+"""Offline benchmark suite for the backtest, sentiment and API hot paths.
+
+Every case runs on generated bars and headlines (no yfinance or NewsAPI
+access) and the timings are written as JSON, one file per commit, so two
+runs can be compared:
+
+    python benchmark_suite.py                      # default sizes
+    python benchmark_suite.py --preset full        # up to 10M bars, 1M articles
+    python benchmark_suite.py --cases backtest,api --bars 1000,100000
+    python benchmark_suite.py --cases startup      # CLI and worker cold starts
+    python benchmark_suite.py --compare .cache/benchmarks/<old>.json
+"""
+import os
+
+# Offline: keep the news store, near-duplicate index and price cache out of it
+for _name in ('NEWS_STORE_ENABLED', 'DEDUP_ENABLED', 'PRICE_CACHE_ENABLED'):
+    os.environ.setdefault(_name, 'false')
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import logging
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from backtester import Backtester
+from data_sources import NewsSource, PriceSource
+from log_pipeline import configure_logging
+from market_data import MarketData
+from news_analyzer import NewsAnalyzer
+from response_encoding import EncodedBody, dumps
+from synthetic_sentiment import stable_seed
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+DEFAULT_OUTPUT_DIR = os.path.join('.cache', 'benchmarks')
+
+# Sizes per preset: bars for the price-based cases, articles for sentiment
+PRESETS = {
+    'quick': {'bars': [1000, 10000], 'articles': [1000]},
+    'default': {'bars': [1000, 10000, 100000, 1000000], 'articles': [1000, 10000, 100000]},
+    'full': {
+        'bars': [1000, 10000, 100000, 1000000, 10000000],
+        'articles': [1000, 10000, 100000, 1000000]
+    }
+}
+
+# Per-bar JSON records get slow and large quickly; they are skipped above this
+MAX_RECORDS_BARS = 1000000
+
+# Cold starts timed in fresh interpreters: case name -> interpreter arguments
+STARTUP_COMMANDS = {
+    'startup.python': ['-c', 'pass'],
+    'startup.main_help': ['main.py', '--help'],
+    'startup.import_backtester': ['-c', 'from backtester import Backtester; Backtester()'],
+    'startup.import_api_server': ['-c', 'import api_server']
+}
+
+SUBJECTS = ('Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Tyrell')
+EVENTS = (
+    'beats earnings expectations', 'shares slide after downgrade',
+    'announces new product line', 'faces regulatory probe',
+    'raises full-year guidance', 'misses revenue estimates',
+    'wins major contract', 'recalls faulty devices'
+)
+DETAILS = (
+    'as demand stays strong', 'amid supply chain concerns', 'analysts say',
+    'ahead of the holiday season', 'despite weak macro data', 'in a surprise move'
+)
+
+
+class SyntheticPriceSource(PriceSource):
+    """Price source serving the same generated one-minute bars for every request."""
+
+    def __init__(self, bars: int, seed: int = 0):
+        """
+        Generate the bars.
+
+        Args:
+            bars: Number of bars returned by get_history
+            seed: Seed of the random walk
+        """
+        rng = np.random.default_rng(stable_seed('benchmark', seed, bars))
+        times = pd.date_range('2000-01-03 14:30', periods=bars, freq='min', tz='UTC')
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, bars)))
+        self.frame = pd.DataFrame({
+            'datetime': times,
+            'open': close,
+            'high': close,
+            'low': close,
+            'close': close,
+            'volume': np.full(bars, 1000)
+        })
+
+    @property
+    def days(self) -> int:
+        """Days back from now() that cover every bar."""
+        return int(len(self.frame) // (24 * 60)) + 1
+
+    def now(self) -> datetime:
+        return self.frame['datetime'].iloc[-1].to_pydatetime()
+
+    def get_history(self, symbol, start, end, interval='1m') -> pd.DataFrame:
+        return self.frame
+
+    def get_latest_price(self, symbol: str) -> Optional[float]:
+        return float(self.frame['close'].iloc[-1])
+
+
+class NoNewsSource(NewsSource):
+    """News source without articles (the benchmarks score their own headlines)."""
+
+    def get_articles(self, symbol, query, start, end) -> List[Dict]:
+        return []
+
+
+def generate_headlines(count: int, seed: int = 0) -> List[str]:
+    """Generate distinct headline-like texts (no two hit the sentiment cache)."""
+    rng = np.random.default_rng(stable_seed('benchmark-headlines', seed, count))
+    subjects = rng.integers(len(SUBJECTS), size=count).tolist()
+    events = rng.integers(len(EVENTS), size=count).tolist()
+    details = rng.integers(len(DETAILS), size=count).tolist()
+    return [
+        f"{SUBJECTS[s]} {EVENTS[e]} {DETAILS[d]} (report {i})"
+        for i, (s, e, d) in enumerate(zip(subjects, events, details))
+    ]
+
+
+def measure(run: Callable[[], object], repeats: int, setup: Optional[Callable[[], None]] = None) -> List[float]:
+    """
+    Time a callable several times.
+
+    Args:
+        run: Code under test
+        repeats: Number of timed runs
+        setup: Untimed code run before every timed run
+
+    Returns:
+        Seconds per run
+    """
+    times = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def repeats_for(size: int, repeats: int) -> int:
+    """Fewer repeats for the largest inputs (one run of 10M bars is enough)."""
+    if size >= 1000000:
+        return 1
+    if size >= 100000:
+        return min(repeats, 3)
+    return repeats
+
+
+def record(name: str, size: int, unit: str, times: List[float], **extra) -> Dict:
+    """Summarize the timings of one case at one size."""
+    best = min(times)
+    return {
+        'name': name,
+        'size': size,
+        'unit': unit,
+        'repeats': len(times),
+        'min_seconds': best,
+        'median_seconds': statistics.median(times),
+        'mean_seconds': statistics.fmean(times),
+        'ns_per_item': best / size * 1e9,
+        'items_per_second': size / best if best > 0 else None,
+        **extra
+    }
+
+
+def synthetic_backtest(bars: int):
+    """
+    Create a backtester over generated bars and a function running it.
+
+    Returns:
+        Tuple of (backtester, function returning a run_backtest result)
+    """
+    source = SyntheticPriceSource(bars)
+    backtester = Backtester(
+        market_data=MarketData(price_source=source)
+    )
+
+    def run() -> Dict:
+        result = backtester.run_backtest('BENCH', days=source.days, interval='1m')
+        if len(result['results']) != bars:
+            raise RuntimeError(f"Backtest covered {len(result['results'])} of {bars} bars")
+        return result
+
+    return backtester, run
+
+
+def bench_backtest(bars: int, repeats: int) -> List[Dict]:
+    """Time Backtester.run_backtest end to end and _calculate_metrics on its results."""
+    backtester, run_backtest = synthetic_backtest(bars)
+    repeats = repeats_for(bars, repeats)
+    results = {}
+
+    def run():
+        results.update(run_backtest())
+
+    times = measure(run, repeats)
+    rows = [record(
+        'backtest.run_backtest', bars, 'bars', times,
+        trades=len(results['trades'])
+    )]
+
+    # The streaming accumulator makes metrics O(1) after a run; this times
+    # the full recomputation used by the loop engine
+    strategy = SimpleNamespace(trades=results['trades'])
+    times = measure(
+        lambda: backtester._calculate_metrics(results['results'], strategy, 10000),
+        repeats
+    )
+    rows.append(record('backtest.calculate_metrics', bars, 'bars', times))
+    return rows
+
+
+def bench_indicators(bars: int, repeats: int) -> List[Dict]:
+    """Time the MarketData indicator methods."""
+    market_data = MarketData(price_source=SyntheticPriceSource(bars))
+    frame = market_data.price_source.frame
+    repeats = repeats_for(bars, repeats)
+    return [
+        record(
+            'market_data.calculate_returns', bars, 'bars',
+            measure(lambda: market_data.calculate_returns(frame), repeats)
+        ),
+        record(
+            'market_data.calculate_moving_average', bars, 'bars',
+            measure(lambda: market_data.calculate_moving_average(frame, 20), repeats)
+        )
+    ]
+
+
+def bench_api(bars: int, repeats: int) -> List[Dict]:
+    """Time the /api/backtest serialization path: serialize, encode, gzip."""
+    from api_server import serialize_backtest
+
+    _, run_backtest = synthetic_backtest(bars)
+    results = run_backtest()
+    repeats = repeats_for(bars, repeats)
+
+    rows = []
+    for layout in ('columnar', 'records'):
+        if layout == 'records' and bars > MAX_RECORDS_BARS:
+            continue
+        encoded = {}
+
+        def run():
+            encoded['body'] = EncodedBody(dumps(serialize_backtest('BENCH', results, layout)))
+
+        times = measure(run, repeats)
+        rows.append(record(
+            f'api.serialize_{layout}', bars, 'bars', times,
+            body_bytes=len(encoded['body'].raw)
+        ))
+
+    # Compression of the columnar body for 'Accept-Encoding: gzip' (a new
+    # EncodedBody per run, since compressed variants are cached)
+    raw = dumps(serialize_backtest('BENCH', results))
+    accept = {'gzip': 1, 'br': 0}
+    compressed = {}
+
+    def run():
+        compressed['body'] = EncodedBody(raw).negotiate(accept)[0]
+
+    times = measure(run, repeats)
+    rows.append(record('api.gzip_body', bars, 'bars', times, gzip_bytes=len(compressed['body'])))
+    return rows
+
+
+def bench_sentiment(articles: int, repeats: int) -> List[Dict]:
+    """Time NewsAnalyzer.analyze_sentiment over distinct headlines, cold and cached."""
+    analyzer = NewsAnalyzer(news_source=NoNewsSource())
+    texts = generate_headlines(articles)
+    analyze = analyzer.analyze_sentiment
+    repeats = repeats_for(articles, repeats)
+
+    def run():
+        for text in texts:
+            analyze(text)
+
+    def clear_cache():
+        analyzer.cache = {}
+
+    cold = measure(run, repeats, clear_cache)
+    cached = measure(run, repeats)
+    return [
+        record('sentiment.analyze_sentiment', articles, 'articles', cold),
+        record('sentiment.analyze_sentiment_cached', articles, 'articles', cached)
+    ]
+
+
+def bench_startup(runs: int, repeats: int) -> List[Dict]:
+    """
+    Time cold starts: a new interpreter running each of STARTUP_COMMANDS.
+
+    'startup.python' is the interpreter alone; the other cases include it.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    rows = []
+    for name, arguments in STARTUP_COMMANDS.items():
+        def run():
+            for _ in range(runs):
+                subprocess.run(
+                    [sys.executable, *arguments],
+                    cwd=root,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=True
+                )
+
+        rows.append(record(name, runs, 'runs', measure(run, repeats)))
+    return rows
+
+
+# Case groups: (runner, size kind)
+CASES = {
+    'backtest': (bench_backtest, 'bars'),
+    'indicators': (bench_indicators, 'bars'),
+    'api': (bench_api, 'bars'),
+    'sentiment': (bench_sentiment, 'articles'),
+    'startup': (bench_startup, 'runs')
+}
+
+
+def git_revision() -> Dict:
+    """Commit the benchmark ran on, and whether the tree had local changes."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit, 'dirty': dirty}
+
+
+def run_suite(
+    cases: List[str],
+    bars: List[int],
+    articles: List[int],
+    repeats: int = 5
+) -> Dict:
+    """
+    Run benchmark cases at every size.
+
+    Args:
+        cases: Case groups to run (keys of CASES)
+        bars: Bar counts for the price-based cases
+        articles: Article counts for the sentiment cases
+        repeats: Timed runs per case and size (fewer for large sizes)
+
+    Returns:
+        Report with environment details and one result per case and size
+    """
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {', '.join(sorted(unknown))}")
+
+    results = []
+    for case in cases:
+        runner, kind = CASES[case]
+        sizes = {'bars': bars, 'articles': articles}.get(kind, [1])
+        for size in sizes:
+            logger.info(f"Benchmarking {case} with {size:,} {kind}")
+            # Per-trade and per-run logging would dominate the timings
+            logging.disable(logging.INFO)
+            try:
+                rows = runner(size, repeats)
+            finally:
+                logging.disable(logging.NOTSET)
+            for row in rows:
+                logger.info(
+                    f"  {row['name']}: {row['min_seconds']:.4f}s "
+                    f"({row['ns_per_item']:.0f} ns per {row['unit'][:-1]})"
+                )
+            results.extend(rows)
+
+    return {
+        'schema': SCHEMA_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__
+        },
+        'results': results
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[Dict]:
+    """
+    Compare two reports case by case.
+
+    Args:
+        baseline: Earlier report
+        current: Later report
+        threshold: Relative slowdown of the best time flagged as a regression
+
+    Returns:
+        One row per case and size present in both reports
+    """
+    before = {(row['name'], row['size']): row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        old = before.get((row['name'], row['size']))
+        if old is None or not old['min_seconds']:
+            continue
+        ratio = row['min_seconds'] / old['min_seconds']
+        rows.append({
+            'name': row['name'],
+            'size': row['size'],
+            'before_seconds': old['min_seconds'],
+            'after_seconds': row['min_seconds'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold
+        })
+    return rows
+
+
+def parse_sizes(value: str) -> List[int]:
+    """Parse a comma-separated list of sizes (e.g. '1000,100000' or '1e6')."""
+    try:
+        return [int(float(v)) for v in value.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected comma-separated sizes, got '{value}'")
+
+
+def main(argv=None):
+    """Run the suite, save the JSON report and optionally compare it with a baseline."""
+    parser = argparse.ArgumentParser(description='Offline benchmark suite')
+    parser.add_argument('--preset', choices=list(PRESETS), default='default', help='Input sizes')
+    parser.add_argument('--cases', default=','.join(CASES), help=f"Comma-separated cases ({', '.join(CASES)})")
+    parser.add_argument('--bars', type=parse_sizes, help='Bar counts (overrides the preset)')
+    parser.add_argument('--articles', type=parse_sizes, help='Article counts (overrides the preset)')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per case and size')
+    parser.add_argument('--output', help=f'Report path (default: {DEFAULT_OUTPUT_DIR}/<commit>.json)')
+    parser.add_argument('--compare', metavar='BASELINE', help='Earlier report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Slowdown flagged as a regression (default: 0.1)')
+    args = parser.parse_args(argv)
+
+    preset = PRESETS[args.preset]
+    report = run_suite(
+        [case.strip() for case in args.cases.split(',') if case.strip()],
+        args.bars or preset['bars'],
+        args.articles or preset['articles'],
+        args.repeats
+    )
+
+    output = args.output
+    if output is None:
+        commit = report['git']['commit'] or 'unknown'
+        suffix = '-dirty' if report['git']['dirty'] else ''
+        output = os.path.join(DEFAULT_OUTPUT_DIR, f"{commit[:12]}{suffix}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {len(report['results'])} results to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        print(f"{'case':40} {'size':>10} {'before':>10} {'after':>10} {'ratio':>7}")
+        for row in rows:
+            flag = '  REGRESSION' if row['regression'] else ''
+            print(
+                f"{row['name']:40} {row['size']:>10,} {row['before_seconds']:>10.4f} "
+                f"{row['after_seconds']:>10.4f} {row['ratio']:>7.2f}{flag}"
+            )
+        if any(row['regression'] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    configure_logging()
+    sys.exit(main())
@@ -11,6 +11,16 @@ class Config:
     # API Keys
     NEWS_API_KEY = os.getenv('NEWS_API_KEY', '')
     
+    # NewsAPI Fetching (concurrent pages and symbols over one pooled session)
+    NEWS_API_URL = os.getenv('NEWS_API_URL', 'https://newsapi.org/v2')
+    NEWS_FETCH_WORKERS = int(os.getenv('NEWS_FETCH_WORKERS', '16'))
+    NEWS_FETCH_MAX_PAGES = int(os.getenv('NEWS_FETCH_MAX_PAGES', '5'))
+    NEWS_FETCH_RETRIES = int(os.getenv('NEWS_FETCH_RETRIES', '3'))
+    # NewsAPI has plan quotas but no documented per-second limit: 10/s is a
+    # conservative default that bounds large refreshes (0 disables throttling)
+    NEWS_API_RATE = float(os.getenv('NEWS_API_RATE', '10'))  # requests per second
+    NEWS_API_BURST = float(os.getenv('NEWS_API_BURST', '20'))
+    
     # Trading Strategy Parameters
     SENTIMENT_BUY_THRESHOLD = float(os.getenv('SENTIMENT_BUY_THRESHOLD', '0.5'))
     SENTIMENT_SELL_THRESHOLD = float(os.getenv('SENTIMENT_SELL_THRESHOLD', '-0.5'))
@@ -21,13 +31,63 @@ class Config:
     DEFAULT_SYMBOL = os.getenv('DEFAULT_SYMBOL', 'AAPL')
     BACKTEST_DAYS = int(os.getenv('BACKTEST_DAYS', '90'))
     
+    # Market Data Cache
+    PRICE_CACHE_ENABLED = os.getenv('PRICE_CACHE_ENABLED', 'true').lower() == 'true'
+    PRICE_CACHE_DIR = os.getenv('PRICE_CACHE_DIR', '.cache/prices')
+    PRICE_CACHE_MAX_AGE = float(os.getenv('PRICE_CACHE_MAX_AGE', '900'))  # seconds
+    
+    # News Store (scored articles kept for historical backtests)
+    NEWS_STORE_ENABLED = os.getenv('NEWS_STORE_ENABLED', 'true').lower() == 'true'
+    NEWS_STORE_PATH = os.getenv('NEWS_STORE_PATH', '.cache/news.db')
+    
+    # Near-Duplicate Filter (syndicated copies scored and counted once)
+    DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', 'true').lower() == 'true'
+    DEDUP_INDEX_PATH = os.getenv('DEDUP_INDEX_PATH', '.cache/near_duplicates.db')
+    DEDUP_THRESHOLD = float(os.getenv('DEDUP_THRESHOLD', '0.5'))  # Jaccard similarity
+    
+    # Decayed Sentiment Signal (sentiment_kernel.py)
+    SENTIMENT_HALF_LIFE_HOURS = float(os.getenv('SENTIMENT_HALF_LIFE_HOURS', '24'))
+    SENTIMENT_PRIOR_WEIGHT = float(os.getenv('SENTIMENT_PRIOR_WEIGHT', '0.5'))
+    SENTIMENT_DECAY_LOOKBACK = float(os.getenv('SENTIMENT_DECAY_LOOKBACK', '10'))  # half-lives
+    # Daily bars read the signal at their session's close on the exchange
+    MARKET_TIMEZONE = os.getenv('MARKET_TIMEZONE', 'America/New_York')
+    MARKET_CLOSE_TIME = os.getenv('MARKET_CLOSE_TIME', '16:00')
+    
     # NLP Configuration
     # Using VADER (lightweight, no GPU, no model download required)
     # Replaces transformers/DistilBERT (~1GB) with vaderSentiment (~500KB)
 
+    # API Server Background Jobs
+    API_JOB_WORKERS = int(os.getenv('API_JOB_WORKERS', '2'))
+    API_JOB_MAX_PENDING = int(os.getenv('API_JOB_MAX_PENDING', '32'))
+    # Job states shared by the server's worker processes (empty: per process)
+    API_JOB_STORE_PATH = os.getenv('API_JOB_STORE_PATH', '.cache/jobs.db')
+    
+    # API Server Result Cache
+    API_RESULT_CACHE_SIZE = int(os.getenv('API_RESULT_CACHE_SIZE', '128'))
+    API_RESULT_CACHE_TTL = float(os.getenv('API_RESULT_CACHE_TTL', '300'))  # seconds
+    
+    # Live Paper Trading (seconds between polls per symbol)
+    LIVE_NEWS_INTERVAL = float(os.getenv('LIVE_NEWS_INTERVAL', '300'))
+    LIVE_PRICE_INTERVAL = float(os.getenv('LIVE_PRICE_INTERVAL', '60'))
+    LIVE_FETCH_TIMEOUT = float(os.getenv('LIVE_FETCH_TIMEOUT', '30'))
+    
+    # Chart Downsampling (max points per series sent to charts, 0 disables)
+    CHART_MAX_POINTS = int(os.getenv('CHART_MAX_POINTS', '2000'))
+    
+    # Logging (records are written by a background thread, see log_pipeline.py)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' (JSON lines) or 'text'
+    LOG_FILE = os.getenv('LOG_FILE', '')  # Empty writes to stderr
+    # Per-logger sampling in sweeps and replays: keep 1 in N INFO records, 0 none
+    LOG_HOT_PATH_SAMPLING = os.getenv('LOG_HOT_PATH_SAMPLING', 'trading_strategy=0,backtester=0')
+    
     # Dashboard Configuration
     DASHBOARD_HOST = '127.0.0.1'
     DASHBOARD_PORT = 8050
+    # Background callback jobs and their results, cached on disk by inputs
+    DASHBOARD_CACHE_DIR = os.getenv('DASHBOARD_CACHE_DIR', '.cache/dashboard')
+    DASHBOARD_CACHE_TTL = float(os.getenv('DASHBOARD_CACHE_TTL', '900'))  # seconds
     
     @classmethod
     def validate(cls):
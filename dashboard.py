@@ -1,24 +1,92 @@
-"""Interactive dashboard for visualizing trading bot performance."""
+"""Interactive dashboard for visualizing trading bot performance.
+
+Backtests run as Dash background callbacks: the page stays responsive,
+shows progress and can cancel a run. Their outputs are cached on disk by
+inputs (DASHBOARD_CACHE_DIR, for DASHBOARD_CACHE_TTL seconds), so repeat
+views are served without recomputing.
+"""
 import dash
-from dash import dcc, html, Input, Output, State
+import diskcache
+from dash import DiskcacheManager, dcc, html, Input, Output, State
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, Optional
 import logging
 from backtester import Backtester
-from news_analyzer import NewsAnalyzer
+from downsampling import CHART_SERIES, downsample_frame, target_points
+from response_encoding import clean_metrics
 from config import Config
+from log_pipeline import configure_logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def strategy_settings():
+    """Strategy settings a cached result depends on besides the inputs."""
+    return (
+        Config.SENTIMENT_BUY_THRESHOLD,
+        Config.SENTIMENT_SELL_THRESHOLD,
+        Config.POSITION_SIZE
+    )
+
+
+# Job queue and result cache of the background callbacks
+background_cache = diskcache.Cache(Config.DASHBOARD_CACHE_DIR)
+
+
+def is_failed_run(result) -> bool:
+    """
+    Whether a background callback result is a failed backtest.
+    
+    run_backtest leaves 'last-run' untouched (no_update) when it fails;
+    an exception Dash caught is stored as a 'long_callback_error' dict.
+    """
+    if isinstance(result, dict):
+        return 'long_callback_error' in result
+    return (
+        isinstance(result, (list, tuple))
+        and len(result) == 5
+        and dash.no_update.is_no_update(result[-1])
+    )
+
+
+class SuccessCacheManager(DiskcacheManager):
+    """
+    Background callback manager caching successful runs only.
+    
+    Dash stores whatever a callback returns, errors included. A failed run
+    (e.g. a yfinance outage) is delivered to the browser that asked for it
+    and then dropped, so the same inputs run again next time instead of
+    getting the error back for DASHBOARD_CACHE_TTL seconds.
+    """
+    
+    def get_result(self, key, job):
+        result = super().get_result(key, job)
+        if is_failed_run(result):
+            self.clear_cache_entry(key)
+        return result
+
+
+background_callback_manager = SuccessCacheManager(
+    background_cache,
+    cache_by=[strategy_settings],
+    expire=Config.DASHBOARD_CACHE_TTL
+)
+
+# Callback arguments left out of cache keys (the Run button's click count)
+UNCACHED_ARGS = [0]
+
 # Initialize Dash app with modern theme
 app = dash.Dash(
     __name__,
     external_stylesheets=[dbc.themes.CYBORG],
-    suppress_callback_exceptions=True
+    suppress_callback_exceptions=True,
+    background_callback_manager=background_callback_manager
 )
 
 # Popular symbols for dropdown
@@ -27,15 +95,21 @@ SYMBOLS = [
     'META', 'NVDA', 'BTC-USD', 'ETH-USD'
 ]
 
-# Global state
+# Shared components (results are per session: they only go to the
+# browser that asked for them)
 backtester = Backtester()
 news_analyzer = None
-current_results = None
 
 
 def create_layout():
     """Create the dashboard layout."""
     return dbc.Container([
+        # Browser viewport width, used to size chart point budgets
+        dcc.Store(id='viewport-width'),
+        
+        # Inputs and metrics of this browser session's last backtest
+        dcc.Store(id='last-run', storage_type='session'),
+        
         # Header
         dbc.Row([
             dbc.Col([
@@ -86,12 +160,33 @@ def create_layout():
                                 )
                             ], md=4)
                         ]),
-                        dbc.Button(
-                            "Run Backtest",
-                            id='run-button',
-                            color="primary",
-                            size="lg",
-                            className="w-100"
+                        dbc.Row([
+                            dbc.Col([
+                                dbc.Button(
+                                    "Run Backtest",
+                                    id='run-button',
+                                    color="primary",
+                                    size="lg",
+                                    className="w-100"
+                                )
+                            ], md=9),
+                            dbc.Col([
+                                dbc.Button(
+                                    "Cancel",
+                                    id='cancel-button',
+                                    color="secondary",
+                                    size="lg",
+                                    disabled=True,
+                                    className="w-100"
+                                )
+                            ], md=3)
+                        ]),
+                        dbc.Progress(
+                            id='progress-bar',
+                            value=0,
+                            striped=True,
+                            animated=True,
+                            className="mt-3"
                         )
                     ])
                 ], className="mb-4")
@@ -319,48 +414,121 @@ def create_sentiment_chart(results_df):
     return fig
 
 
-@app.callback(
-    [Output('metrics-cards', 'children'),
-     Output('performance-chart', 'figure'),
-     Output('sentiment-chart', 'figure'),
-     Output('news-section', 'children')],
-    [Input('run-button', 'n_clicks')],
-    [State('symbol-dropdown', 'value'),
-     State('days-input', 'value'),
-     State('capital-input', 'value')]
+# Record the viewport width in the browser when the page loads
+app.clientside_callback(
+    """
+    function(symbol) {
+        return window.innerWidth * (window.devicePixelRatio || 1);
+    }
+    """,
+    Output('viewport-width', 'data'),
+    Input('symbol-dropdown', 'value')
 )
-def run_backtest(n_clicks, symbol, days, capital):
-    """Run backtest and update all visualizations."""
-    global current_results, news_analyzer
+
+
+def fetch_recent_news(symbol: str) -> Optional[Dict]:
+    """
+    Get the last day's news sentiment for a symbol.
     
-    if n_clicks is None:
-        return html.Div(), go.Figure(), go.Figure(), html.Div()
+    Returns:
+        Aggregated sentiment (see NewsAnalyzer.get_aggregated_sentiment),
+        or None if the news could not be fetched
+    """
+    global news_analyzer
     
     try:
-        logger.info(f"Running backtest: {symbol}, {days} days, ${capital}")
-        
-        # Run backtest
-        results = backtester.run_backtest(symbol, days, capital)
-        current_results = results
-        
-        # Create visualizations
-        metrics_cards = create_metrics_cards(results['metrics'])
-        performance_chart = create_performance_chart(results['results'])
-        sentiment_chart = create_sentiment_chart(results['results'])
-        
-        # Get recent news
         if news_analyzer is None:
+            from news_analyzer import NewsAnalyzer
             news_analyzer = NewsAnalyzer()
+        return news_analyzer.get_aggregated_sentiment(symbol, days=1)
+    except Exception as e:
+        logger.error(f"Error fetching news for {symbol}: {e}")
+        return None
+
+
+@app.callback(
+    output=[Output('metrics-cards', 'children'),
+            Output('performance-chart', 'figure'),
+            Output('sentiment-chart', 'figure'),
+            Output('news-section', 'children'),
+            Output('last-run', 'data')],
+    inputs=[Input('run-button', 'n_clicks')],
+    state=[State('symbol-dropdown', 'value'),
+           State('days-input', 'value'),
+           State('capital-input', 'value'),
+           State('viewport-width', 'data')],
+    background=True,
+    running=[(Output('run-button', 'disabled'), True, False),
+             (Output('cancel-button', 'disabled'), False, True)],
+    cancel=[Input('cancel-button', 'n_clicks')],
+    progress=[Output('progress-bar', 'value'), Output('progress-bar', 'label')],
+    progress_default=[0, ''],
+    # Cached by symbol, days, capital and viewport width, not by click count
+    cache_args_to_ignore=UNCACHED_ARGS,
+    prevent_initial_call=True
+)
+def run_backtest(set_progress, n_clicks, symbol, days, capital, viewport_width=None):
+    """
+    Run a backtest and update all visualizations (as a background job).
+    
+    The last day's news is fetched on another thread while the backtest
+    runs; the progress bar follows the backtest, then the news.
+    """
+    logger.info(f"Running backtest: {symbol}, {days} days, ${capital}")
+    
+    def report(fraction, metrics):
+        percent = int(fraction * 100)
+        set_progress((percent, f"Backtest {percent}%"))
+    
+    try:
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='dashboard-news') as pool:
+            news_future = pool.submit(fetch_recent_news, symbol)
+            
+            results = backtester.run_backtest(symbol, days, capital, progress=report)
+            if results['results'].empty:
+                raise ValueError(f"No price data for {symbol}")
+            
+            # Downsample long runs so charts stay responsive (signals are kept)
+            points = target_points(viewport_width, Config.CHART_MAX_POINTS)
+            chart_df = downsample_frame(results['results'], CHART_SERIES, points)
+            
+            # Create visualizations
+            metrics_cards = create_metrics_cards(results['metrics'])
+            performance_chart = create_performance_chart(chart_df)
+            sentiment_chart = create_sentiment_chart(chart_df)
+            
+            if not news_future.done():
+                set_progress((100, "Fetching news"))
+            news_section = create_news_section(news_future.result())
         
-        news_data = news_analyzer.get_aggregated_sentiment(symbol, days=1)
-        news_section = create_news_section(news_data)
-        
-        return metrics_cards, performance_chart, sentiment_chart, news_section
+        set_progress((100, "Done"))
+        last_run = {
+            'symbol': symbol,
+            'days': days,
+            'capital': capital,
+            'metrics': clean_metrics(results['metrics'])
+        }
+        return metrics_cards, performance_chart, sentiment_chart, news_section, last_run
         
     except Exception as e:
         logger.error(f"Error running backtest: {e}")
         error_msg = dbc.Alert(f"Error: {str(e)}", color="danger")
-        return error_msg, go.Figure(), go.Figure(), html.Div()
+        # Keeping the last run also keeps this result out of the cache (see is_failed_run)
+        return error_msg, go.Figure(), go.Figure(), html.Div(), dash.no_update
+
+
+@app.callback(
+    [Output('symbol-dropdown', 'value'),
+     Output('days-input', 'value'),
+     Output('capital-input', 'value')],
+    [Input('last-run', 'modified_timestamp')],
+    [State('last-run', 'data')]
+)
+def restore_last_run(_, last_run):
+    """Show this session's last backtest inputs again after a page reload."""
+    if not last_run:
+        raise PreventUpdate
+    return last_run['symbol'], last_run['days'], last_run['capital']
 
 
 def create_news_section(news_data):
@@ -412,6 +580,7 @@ app.layout = create_layout()
 
 
 if __name__ == '__main__':
+    configure_logging()
     logger.info(f"Starting dashboard on {Config.DASHBOARD_HOST}:{Config.DASHBOARD_PORT}")
     app.run_server(
         debug=True,
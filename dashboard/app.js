@@ -26,7 +26,9 @@ async function runBacktest() {
     chartsSection.classList.add('hidden');
 
     try {
-        const response = await fetch(`${API_BASE}/backtest/${symbol}?days=${days}&capital=${capital}`);
+        // Ask for about one point per pixel of chart width (charts are hidden while loading)
+        const width = Math.round(document.documentElement.clientWidth * (window.devicePixelRatio || 1));
+        const response = await fetch(`${API_BASE}/backtest/${symbol}?days=${days}&capital=${capital}&width=${width}`);
         const result = await response.json();
 
         if (result.success) {
@@ -41,7 +43,7 @@ async function runBacktest() {
             updateSentimentChart(result.data, symbol);
             
             // Update trades table
-            updateTradesTable(result.data);
+            updateTradesTable(result.trades);
             
             // Show results
             metricsSection.classList.remove('hidden');
@@ -95,14 +97,14 @@ function updateMetrics(metrics) {
 function updatePerformanceChart(data, symbol) {
     const ctx = document.getElementById('performanceChart').getContext('2d');
 
-    // Prepare data
-    const dates = data.map(d => new Date(d.date).toLocaleDateString());
-    const strategyValues = data.map(d => d.portfolio_value);
-    const buyHoldValues = data.map(d => d.buy_hold_value);
+    // Prepare data (columnar: one array per field)
+    const dates = data.date.map(d => new Date(d).toLocaleDateString());
+    const strategyValues = data.portfolio_value;
+    const buyHoldValues = data.buy_hold_value;
 
     // Find buy/sell signals
-    const buySignals = data.filter(d => d.signal === 'BUY');
-    const sellSignals = data.filter(d => d.signal === 'SELL');
+    const buySignals = signalIndices(data, 'BUY');
+    const sellSignals = signalIndices(data, 'SELL');
 
     // Destroy existing chart
     if (performanceChart) {
@@ -140,9 +142,9 @@ function updatePerformanceChart(data, symbol) {
                 },
                 {
                     label: 'Buy Signal',
-                    data: buySignals.map(s => ({
-                        x: new Date(s.date).toLocaleDateString(),
-                        y: s.portfolio_value
+                    data: buySignals.map(i => ({
+                        x: dates[i],
+                        y: strategyValues[i]
                     })),
                     backgroundColor: '#00ff88',
                     borderColor: '#00ff88',
@@ -153,9 +155,9 @@ function updatePerformanceChart(data, symbol) {
                 },
                 {
                     label: 'Sell Signal',
-                    data: sellSignals.map(s => ({
-                        x: new Date(s.date).toLocaleDateString(),
-                        y: s.portfolio_value
+                    data: sellSignals.map(i => ({
+                        x: dates[i],
+                        y: strategyValues[i]
                     })),
                     backgroundColor: '#ff4757',
                     borderColor: '#ff4757',
@@ -239,10 +241,10 @@ function updatePerformanceChart(data, symbol) {
 function updateSentimentChart(data, symbol) {
     const ctx = document.getElementById('sentimentChart').getContext('2d');
 
-    // Prepare data
-    const dates = data.map(d => new Date(d.date).toLocaleDateString());
-    const sentiments = data.map(d => d.sentiment);
-    const prices = data.map(d => d.price);
+    // Prepare data (columnar: one array per field)
+    const dates = data.date.map(d => new Date(d).toLocaleDateString());
+    const sentiments = data.sentiment;
+    const prices = data.price;
 
     // Color sentiments
     const sentimentColors = sentiments.map(s => s > 0 ? '#00ff88' : '#ff4757');
@@ -359,40 +361,45 @@ function updateSentimentChart(data, symbol) {
 }
 
 // Update Trades Table
-function updateTradesTable(data) {
+function updateTradesTable(trades) {
     const tbody = document.getElementById('tradesBody');
     tbody.innerHTML = '';
 
-    // Get trades (filter for BUY/SELL signals)
-    const trades = data.filter(d => d.signal === 'BUY' || d.signal === 'SELL');
-    
-    // Show last 10 trades
-    const recentTrades = trades.slice(-10).reverse();
+    // The full trade list (columnar); the chart series is downsampled
+    // and can skip the bars trades happened on
+    const count = trades.action ? trades.action.length : 0;
 
-    recentTrades.forEach(trade => {
+    // Show last 10 trades
+    for (let i = count - 1; i >= Math.max(0, count - 10); i--) {
         const row = document.createElement('tr');
-        
-        const date = new Date(trade.date).toLocaleDateString();
-        const action = trade.signal;
-        const price = trade.price;
-        const shares = trade.holdings || 0;
-        const amount = price * shares;
-        const sentiment = trade.sentiment;
+
+        const date = new Date(trades.timestamp[i]).toLocaleDateString();
+        const action = trades.action[i];
 
         row.innerHTML = `
             <td>${date}</td>
             <td class="trade-${action.toLowerCase()}">${action === 'BUY' ? '🟢' : '🔴'} ${action}</td>
-            <td>${formatCurrency(price)}</td>
-            <td>${shares.toFixed(4)}</td>
-            <td>${formatCurrency(amount)}</td>
-            <td>${sentiment.toFixed(3)}</td>
+            <td>${formatCurrency(trades.price[i])}</td>
+            <td>${trades.shares[i].toFixed(4)}</td>
+            <td>${formatCurrency(trades.amount[i])}</td>
+            <td>${trades.sentiment[i].toFixed(3)}</td>
         `;
 
         tbody.appendChild(row);
-    });
+    }
 }
 
 // Utility Functions
+function signalIndices(data, signal) {
+    const indices = [];
+    data.signal.forEach((s, i) => {
+        if (s === signal) {
+            indices.push(i);
+        }
+    });
+    return indices;
+}
+
 function formatPercent(value) {
     return (value * 100).toFixed(2) + '%';
 }
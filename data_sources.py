@@ -0,0 +1,225 @@
+"""Pluggable price and news sources.
+
+MarketData and NewsAnalyzer fetch through these interfaces, so the live
+providers (yfinance, NewsAPI) can be swapped for recorded data (see
+replay.py) without changing backtests or the live loop. The providers'
+client libraries are imported on first use.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+import pandas as pd
+from instrumentation import external_call
+
+logger = logging.getLogger(__name__)
+
+
+# Intraday history yfinance keeps (days back from now)
+YFINANCE_MAX_DAYS = {'1m': 29, '5m': 59, '15m': 59, '30m': 59, '1h': 729}
+
+# Longest window of one yfinance request, where shorter than the history
+YFINANCE_MAX_REQUEST_DAYS = {'1m': 7}
+
+
+class PriceSource(ABC):
+    """Interface of OHLCV bar providers."""
+
+    # Whether MarketData may keep this source's bars in the on-disk cache
+    cacheable = False
+
+    def now(self) -> datetime:
+        """Current time as seen by this source (the end of every window)."""
+        return datetime.now()
+
+    @abstractmethod
+    def get_history(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = '1d'
+    ) -> pd.DataFrame:
+        """
+        Get bars between start and end.
+
+        Args:
+            symbol: Stock ticker symbol
+            start: First bar time (inclusive)
+            end: Last bar time (exclusive)
+            interval: Bar interval ('1d', '1h', etc.)
+
+        Returns:
+            DataFrame whose first column is the bar time, followed by
+            lowercase OHLCV columns (empty if there is no data)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_latest_price(self, symbol: str) -> Optional[float]:
+        """Get the most recent price (None if unavailable)."""
+        raise NotImplementedError
+
+
+class NewsSource(ABC):
+    """Interface of news article providers."""
+
+    def now(self) -> datetime:
+        """Current time as seen by this source (the end of every window)."""
+        return datetime.now()
+
+    @abstractmethod
+    def get_articles(
+        self,
+        symbol: str,
+        query: str,
+        start: datetime,
+        end: datetime
+    ) -> List[Dict]:
+        """
+        Get articles about a symbol published between start and end.
+
+        Args:
+            symbol: Stock ticker symbol
+            query: Search query (symbol OR company name)
+            start: Earliest publication time
+            end: Latest publication time
+
+        Returns:
+            List of NewsAPI-style articles (title, description, url,
+            publishedAt, ...)
+        """
+        raise NotImplementedError
+
+    def get_articles_many(
+        self,
+        queries: Dict[str, str],
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get articles for several symbols (one after another by default).
+
+        Args:
+            queries: Symbol -> search query
+            start: Earliest publication time
+            end: Latest publication time
+
+        Returns:
+            Symbol -> list of articles
+        """
+        return {
+            symbol: self.get_articles(symbol, query, start, end)
+            for symbol, query in queries.items()
+        }
+
+
+class YFinancePriceSource(PriceSource):
+    """Bars from Yahoo Finance via yfinance."""
+
+    cacheable = True
+
+    def get_history(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = '1d'
+    ) -> pd.DataFrame:
+        """
+        Download bars from yfinance with lowercase column names.
+
+        Windows longer than yfinance serves per request (7 days of 1m
+        bars) are fetched in consecutive requests.
+        """
+        max_days = YFINANCE_MAX_DAYS.get(interval)
+        if max_days is not None:
+            earliest = datetime.now() - timedelta(days=max_days)
+            if start < earliest:
+                logger.warning(
+                    f"yfinance only serves {max_days} days of {interval} bars; "
+                    f"fetching {symbol} from {earliest.date()}"
+                )
+                start = earliest
+            if end <= start:
+                return pd.DataFrame()
+
+        import yfinance as yf
+
+        ticker = yf.Ticker(symbol)
+        request_days = YFINANCE_MAX_REQUEST_DAYS.get(interval)
+        windows = [(start, end)]
+        if request_days is not None:
+            step = timedelta(days=request_days)
+            windows = [
+                (window_start, min(window_start + step, end))
+                for window_start in pd.date_range(start, end, freq=step, inclusive='left').to_pydatetime()
+            ]
+
+        frames = []
+        for window_start, window_end in windows:
+            with external_call('yfinance'):
+                frames.append(ticker.history(
+                    start=window_start,
+                    end=window_end,
+                    interval=interval
+                ))
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        df = df[~df.index.duplicated()]
+
+        # Clean and prepare data
+        df = df.reset_index()
+        df.columns = [col.lower() for col in df.columns]
+        return df
+
+    def get_latest_price(self, symbol: str) -> Optional[float]:
+        """Get the last 1-minute close of the current session."""
+        import yfinance as yf
+
+        ticker = yf.Ticker(symbol)
+        with external_call('yfinance'):
+            data = ticker.history(period='1d', interval='1m')
+
+        if data.empty:
+            return None
+
+        return float(data['Close'].iloc[-1])
+
+
+class NewsApiSource(NewsSource):
+    """Articles from NewsAPI, every page, fetched concurrently."""
+
+    def __init__(self, api_key: Optional[str] = None, fetcher: Optional['NewsFetcher'] = None):
+        """
+        Initialize the NewsAPI fetcher.
+
+        Args:
+            api_key: NewsAPI key (default: Config.NEWS_API_KEY)
+            fetcher: Shared NewsFetcher (created if None)
+        """
+        if fetcher is None:
+            from news_fetcher import NewsFetcher
+            fetcher = NewsFetcher(api_key=api_key)
+        self.fetcher = fetcher
+
+    def get_articles(
+        self,
+        symbol: str,
+        query: str,
+        start: datetime,
+        end: datetime
+    ) -> List[Dict]:
+        """Search NewsAPI for the most relevant English articles."""
+        return self.fetcher.fetch(symbol, query, start, end)
+
+    def get_articles_many(
+        self,
+        queries: Dict[str, str],
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, List[Dict]]:
+        """Search NewsAPI for several symbols, all pages in parallel."""
+        return self.fetcher.fetch_all(queries, start, end)
@@ -5,6 +5,9 @@ from datetime import datetime, timedelta
 from market_data import MarketData
 from trading_strategy import TradingStrategy
 from backtester import Backtester
+from log_pipeline import configure_logging
+
+configure_logging()
 
 print("=" * 70)
 print("  📈 NEWS-BASED ALGORITHMIC TRADING BOT - DEMO")
@@ -0,0 +1,191 @@
+"""Largest-Triangle-Three-Buckets (LTTB) downsampling for chart series."""
+from typing import List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+# Bounds for viewport-derived point targets
+MIN_POINTS = 100
+SIGNAL_COLUMN = 'signal'
+SIGNAL_VALUES = ('BUY', 'SELL')
+
+# Series drawn by the dashboards
+CHART_SERIES: List[str] = ['portfolio_value', 'buy_hold_value', 'price', 'sentiment']
+
+
+def target_points(width: Optional[float], max_points: int, points_per_pixel: float = 1.0) -> int:
+    """
+    Derive a point budget from the chart width.
+
+    More points than horizontal pixels cannot be told apart, so one point
+    per pixel is plenty.
+
+    Args:
+        width: Chart width in (device) pixels, None if unknown
+        max_points: Upper bound (0 disables downsampling)
+        points_per_pixel: Points drawn per pixel
+
+    Returns:
+        Target number of points per series (0 means no downsampling)
+    """
+    if max_points <= 0:
+        return 0
+    if not width or width <= 0:
+        return max_points
+    return int(min(max(width * points_per_pixel, MIN_POINTS), max_points))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the points of one series that best preserve its visual shape.
+
+    The first and last points are always kept; the rest are split into
+    threshold - 2 equal buckets, and from each bucket the point forming
+    the largest triangle with the previously selected point and the
+    average of the next bucket is kept.
+
+    Args:
+        x: Ascending x values (numeric)
+        y: Y values (NaN never wins a bucket)
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted positional indices of the selected points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket boundaries over the points between first and last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end]
+        avg_y = np.nanmean(next_y) if np.isfinite(next_y).any() else y[previous]
+
+        # Twice the triangle area; the constant factor does not change argmax
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        area = np.nan_to_num(area, nan=-1.0)
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def _numeric_x(values: pd.Series) -> np.ndarray:
+    """Convert an x column (dates or numbers) to floats."""
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    return values.to_numpy(dtype=float)
+
+
+def signal_indices(x: np.ndarray, signals: pd.Series, buckets: int) -> np.ndarray:
+    """
+    Select the BUY/SELL rows to mark, at most one of each per x bucket.
+
+    Every signal is kept while there are no more than buckets of them;
+    beyond that, the x range is split into buckets equal-width slices (one
+    per pixel at one point per pixel) and only the first BUY and the first
+    SELL of each slice are kept, since more markers on one pixel cannot be
+    told apart. Markers therefore never exceed 2 * buckets.
+
+    Args:
+        x: Ascending x values (numeric)
+        signals: Signal per row
+        buckets: Number of x slices
+
+    Returns:
+        Sorted positional indices of the kept signal rows
+    """
+    positions = np.flatnonzero(signals.isin(SIGNAL_VALUES).to_numpy())
+    if len(positions) <= buckets:
+        return positions
+
+    span = x[-1] - x[0]
+    if span > 0:
+        slices = ((x[positions] - x[0]) / span * buckets).astype(np.int64)
+        slices = np.minimum(slices, buckets - 1)
+    else:
+        slices = np.zeros(len(positions), dtype=np.int64)
+    is_sell = (signals.to_numpy()[positions] == 'SELL').astype(np.int64)
+    _, first = np.unique(slices * 2 + is_sell, return_index=True)
+    return np.sort(positions[first])
+
+
+def downsample_indices(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    threshold: int,
+    x_column: str = 'date',
+    keep_signals: bool = True
+) -> np.ndarray:
+    """
+    Pick the rows to draw so that every series keeps its shape.
+
+    LTTB runs on each series separately and the selections are merged, so
+    all series still share the same x values. The minimum and maximum of
+    every series are always kept, and so are BUY/SELL rows, up to one of
+    each per 1/threshold of the x range (see signal_indices). The result
+    is bounded by the budget, not by the length of the history.
+
+    Args:
+        df: Frame with one row per bar
+        columns: Numeric columns drawn as series
+        threshold: Target points per series (0 or >= len(df) keeps every row)
+        x_column: Column used as x axis (row position if missing)
+        keep_signals: Keep rows with a BUY/SELL signal (see signal_indices)
+
+    Returns:
+        Sorted positional row indices
+    """
+    n = len(df)
+    if threshold <= 0 or n <= threshold:
+        return np.arange(n)
+
+    x = _numeric_x(df[x_column]) if x_column in df.columns else np.arange(n, dtype=float)
+    keep = [np.array([0, n - 1])]
+
+    for column in columns:
+        if column not in df.columns:
+            continue
+        y = df[column].to_numpy(dtype=float)
+        keep.append(lttb_indices(x, y, threshold))
+        if np.isfinite(y).any():
+            keep.append(np.array([np.nanargmin(y), np.nanargmax(y)]))
+
+    if keep_signals and SIGNAL_COLUMN in df.columns:
+        keep.append(signal_indices(x, df[SIGNAL_COLUMN], threshold))
+
+    return np.unique(np.concatenate(keep))
+
+
+def downsample_frame(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    threshold: int,
+    x_column: str = 'date',
+    keep_signals: bool = True
+) -> pd.DataFrame:
+    """
+    Downsample a results frame for charting (see downsample_indices).
+
+    Returns:
+        Frame with the selected rows, in their original order
+    """
+    indices = downsample_indices(df, columns, threshold, x_column, keep_signals)
+    if len(indices) == len(df):
+        return df
+    return df.iloc[indices]
@@ -0,0 +1,282 @@
+"""Low-overhead stage timers and Prometheus metrics.
+
+Code under measurement wraps its stages in `with stage('name'):`. Every
+stage is observed in a process-wide latency histogram and, when a
+collect_timings() block is active on the same thread or task, added to that
+block's timings dictionary (this is how backtest results get their
+'timings'). render_prometheus() exposes the histograms, cache hit ratios
+and external-call counters in the Prometheus text format.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Latency histogram buckets in seconds (1 ms to 1 minute)
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Timings dictionaries of the collect_timings() blocks enclosing this context
+_collectors: ContextVar[Tuple[Dict[str, float], ...]] = ContextVar('stage_timing_collectors', default=())
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    """Format a label set, e.g. {stage="simulation",le="0.5"}."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    """Format a sample value (integers without a trailing .0)."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        """
+        Initialize the counter.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """Add amount to the sample with these label values."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        """Snapshot of label values -> count."""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        """Lines of this metric in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Latency histogram with labels and fixed buckets."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+            buckets: Upper bounds of the buckets, ascending
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        """Record one observation for these label values."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        """Lines of this metric in the Prometheus text format (cumulative buckets)."""
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    'trading_bot_stage_seconds',
+    'Time spent in each pipeline stage',
+    ('stage',)
+)
+REQUEST_SECONDS = Histogram(
+    'trading_bot_http_request_seconds',
+    'API request latency',
+    ('endpoint', 'method', 'status')
+)
+EXTERNAL_SECONDS = Histogram(
+    'trading_bot_external_call_seconds',
+    'Latency of calls to external services',
+    ('service',)
+)
+EXTERNAL_CALLS = Counter(
+    'trading_bot_external_calls_total',
+    'Calls to external services by outcome',
+    ('service', 'outcome')
+)
+CACHE_REQUESTS = Counter(
+    'trading_bot_cache_requests_total',
+    'Cache lookups by result',
+    ('cache', 'result')
+)
+
+METRICS = (STAGE_SECONDS, REQUEST_SECONDS, EXTERNAL_SECONDS, EXTERNAL_CALLS, CACHE_REQUESTS)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a stage (a perf_counter pair plus one histogram update).
+
+    Time spent in a stage also counts toward every enclosing
+    collect_timings() block; repeated stages add up.
+
+    Args:
+        name: Stage name (a label of trading_bot_stage_seconds)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, name)
+        for timings in _collectors.get():
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, float]]:
+    """
+    Collect the stages run inside the block into a dictionary.
+
+    The dictionary maps stage name to seconds and gets a 'total' entry
+    (wall time of the whole block) when the block exits. Stages on other
+    threads (e.g. the news fetcher's pool) are not collected.
+
+    Yields:
+        The timings dictionary, filled as stages finish
+    """
+    timings = {}
+    token = _collectors.set(_collectors.get() + (timings,))
+    started = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings['total'] = time.perf_counter() - started
+        _collectors.reset(token)
+
+
+def count_cache(cache: str, hit: bool, amount: int = 1):
+    """
+    Count cache lookups.
+
+    Args:
+        cache: Cache name ('backtest', 'price', 'sentiment', ...)
+        hit: Whether the lookups were served from the cache
+        amount: Number of lookups
+    """
+    if amount:
+        CACHE_REQUESTS.inc(cache, 'hit' if hit else 'miss', amount=amount)
+
+
+class ExternalCall:
+    """An external call in progress; set outcome to label a failed response."""
+
+    __slots__ = ('outcome',)
+
+    def __init__(self):
+        self.outcome = 'ok'
+
+
+@contextmanager
+def external_call(service: str) -> Iterator[ExternalCall]:
+    """
+    Count and time one call to an external service.
+
+    The outcome is 'ok' unless the block raises ('error') or sets
+    call.outcome itself (e.g. to 'http_429').
+
+    Args:
+        service: Service name ('yfinance', 'newsapi', ...)
+    """
+    call = ExternalCall()
+    started = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call.outcome = 'error'
+        raise
+    finally:
+        EXTERNAL_SECONDS.observe(time.perf_counter() - started, service)
+        EXTERNAL_CALLS.inc(service, call.outcome)
+
+
+def cache_hit_ratios() -> Dict[str, float]:
+    """Hit ratio of every cache looked up so far."""
+    counts = {}
+    for (cache, result), value in CACHE_REQUESTS.values().items():
+        counts.setdefault(cache, {'hit': 0.0, 'miss': 0.0})[result] += value
+    return {
+        cache: count['hit'] / (count['hit'] + count['miss'])
+        for cache, count in counts.items()
+        if count['hit'] + count['miss'] > 0
+    }
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+
+    name = 'trading_bot_cache_hit_ratio'
+    lines.append(f"# HELP {name} Fraction of cache lookups served from the cache")
+    lines.append(f"# TYPE {name} gauge")
+    for cache, ratio in sorted(cache_hit_ratios().items()):
+        lines.append(f"{name}{_labels(('cache',), (cache,))} {_number(ratio)}")
+    return '\n'.join(lines) + '\n'
+
+
+def server_timing(timings: Optional[Dict[str, float]]) -> str:
+    """Format timings as a Server-Timing header value (durations in ms)."""
+    return ', '.join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in (timings or {}).items()
+    )
@@ -4,6 +4,9 @@ os.environ['NEWS_API_KEY'] = 'demo_key'
 
 from dashboard import app
 from config import Config
+from log_pipeline import configure_logging
+
+configure_logging()
 
 print("=" * 70)
 print("  📈 LAUNCHING TRADING BOT DASHBOARD")
@@ -0,0 +1,443 @@
+"""Live paper trading: poll news and prices and trade on paper."""
+import asyncio
+import math
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from trading_strategy import TradingStrategy
+from performance_metrics import MetricsAccumulator
+from synthetic_sentiment import stable_seed
+from sentiment_kernel import DecayedSentiment
+from options import SENTIMENT_SIGNALS
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def make_signal() -> DecayedSentiment:
+    """Create an empty decayed sentiment signal with the configured half-life."""
+    return DecayedSentiment(Config.SENTIMENT_HALF_LIFE_HOURS * 3600, Config.SENTIMENT_PRIOR_WEIGHT)
+
+
+class NewsAnalyzerSource:
+    """Sentiment source backed by NewsAPI + VADER."""
+
+    def __init__(self, news_analyzer=None, days: int = 1, signal: str = 'mean'):
+        """
+        Initialize the source.
+
+        Args:
+            news_analyzer: NewsAnalyzer instance (created if None)
+            days: Days of news averaged per reading
+            signal: 'mean' (average sentiment of the window) or 'decay'
+                (time-decayed sentiment, see sentiment_kernel.py)
+        """
+        if signal not in SENTIMENT_SIGNALS:
+            raise ValueError(f"Unknown sentiment signal: {signal}")
+        if news_analyzer is None:
+            from news_analyzer import NewsAnalyzer
+            news_analyzer = NewsAnalyzer()
+        self.news_analyzer = news_analyzer
+        self.days = days
+        self.signal = signal
+        self._signals = {}
+        # URL -> publication time (epoch seconds) of articles already added
+        self._seen = {}
+
+    def get_sentiment(self, symbol: str) -> Optional[float]:
+        """Get the current sentiment reading (None if there is no news)."""
+        if self.signal == 'mean':
+            data = self.news_analyzer.get_aggregated_sentiment(symbol, days=self.days)
+            if not data['article_count']:
+                return None
+            return data['sentiment']
+
+        fetched = self.news_analyzer.fetch_news(symbol, self.days)
+        stories = self.news_analyzer.score_articles(symbol, fetched) if fetched else []
+        signal = self._signals.get(symbol)
+        seen = self._seen.setdefault(symbol, {})
+        articles = []
+        for article in stories:
+            # A story is added once, whichever copy of it was fetched
+            key = article.get('cluster') or article['url'] or article['title']
+            if key in seen or not article['published_at']:
+                continue
+            published = pd.Timestamp(article['published_at']).timestamp()
+            seen[key] = published
+            articles.append((published, article['sentiment']))
+
+        # Only the new articles are added, oldest first: O(1) each
+        if articles:
+            if signal is None:
+                signal = self._signals[symbol] = make_signal()
+            for published, sentiment in sorted(articles):
+                signal.add(published, sentiment)
+        if signal is None:
+            return None
+
+        now = self.news_analyzer.news_source.now().timestamp()
+        # Articles older than the window are never fetched again
+        horizon = now - self.days * 86400 - 3600
+        for key in [key for key, published in seen.items() if published < horizon]:
+            del seen[key]
+        return signal.value(now)
+
+
+class MarketDataSource:
+    """Price source backed by yfinance."""
+
+    def __init__(self, market_data=None):
+        """
+        Initialize the source.
+
+        Args:
+            market_data: MarketData instance (created if None)
+        """
+        if market_data is None:
+            from market_data import MarketData
+            market_data = MarketData()
+        self.market_data = market_data
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Get the latest price (None if unavailable)."""
+        return self.market_data.get_current_price(symbol)
+
+
+class StubNewsSource:
+    """Offline sentiment source producing a deterministic random series."""
+
+    def __init__(self, delay: float = 0.0, slow_symbols: Optional[Dict[str, float]] = None):
+        """
+        Initialize the stub.
+
+        Args:
+            delay: Seconds each fetch blocks (simulates network latency)
+            slow_symbols: Per-symbol delay overrides
+        """
+        self.delay = delay
+        self.slow_symbols = slow_symbols or {}
+        self._rngs = {}
+
+    def get_sentiment(self, symbol: str) -> Optional[float]:
+        """Get the next sentiment reading for a symbol."""
+        time.sleep(self.slow_symbols.get(symbol, self.delay))
+        rng = self._rngs.setdefault(symbol, np.random.default_rng(stable_seed('news', symbol)))
+        return float(np.clip(rng.normal(0, 0.5), -1, 1))
+
+
+class StubPriceSource:
+    """Offline price source producing a deterministic random walk."""
+
+    def __init__(self, delay: float = 0.0, slow_symbols: Optional[Dict[str, float]] = None):
+        """
+        Initialize the stub.
+
+        Args:
+            delay: Seconds each fetch blocks (simulates network latency)
+            slow_symbols: Per-symbol delay overrides
+        """
+        self.delay = delay
+        self.slow_symbols = slow_symbols or {}
+        self._prices = {}
+        self._rngs = {}
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Get the next price for a symbol."""
+        time.sleep(self.slow_symbols.get(symbol, self.delay))
+        rng = self._rngs.setdefault(symbol, np.random.default_rng(stable_seed('price', symbol)))
+        price = self._prices.get(symbol, 100.0) * math.exp(rng.normal(0, 0.01))
+        self._prices[symbol] = price
+        return price
+
+
+class SymbolState:
+    """Paper position and latest readings of one symbol."""
+
+    def __init__(self, symbol: str, strategy: TradingStrategy):
+        """
+        Initialize the state.
+
+        Args:
+            symbol: Stock ticker
+            strategy: Strategy instance trading this symbol
+        """
+        self.symbol = symbol
+        self.strategy = strategy
+        self.metrics = MetricsAccumulator(strategy.initial_capital)
+        self.price = None
+        self.sentiment = None
+        self.first_price = None
+        self.last_signal = 'HOLD'
+
+    def to_dict(self) -> Dict:
+        """Get a summary of the paper position."""
+        state = {'symbol': self.symbol, 'price': self.price, 'sentiment': self.sentiment}
+        if self.price is not None:
+            state.update(self.strategy.get_portfolio_state(self.price))
+        return state
+
+
+class LiveTrader:
+    """
+    Paper-trades a watchlist from live news and price polls.
+
+    News and prices are polled on independent schedules, each symbol in
+    its own asyncio task, with blocking fetches run on a thread pool and
+    bounded by a timeout, so one slow symbol never delays the others.
+    Every news reading is a decision point: the symbol's strategy trades
+    on it at the latest known price. Price readings mark positions to
+    market in between. The capital is split evenly across the watchlist,
+    so the total paper value starts at the capital given.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        news_source,
+        price_source,
+        news_interval: float = 300,
+        price_interval: float = 60,
+        fetch_timeout: float = 30,
+        max_workers: int = 32,
+        initial_capital: Optional[float] = None,
+        **strategy_params
+    ):
+        """
+        Initialize the trader.
+
+        Args:
+            symbols: Watchlist
+            news_source: Object with get_sentiment(symbol) -> float or None
+            price_source: Object with get_price(symbol) -> float or None
+            news_interval: Seconds between news polls of a symbol
+            price_interval: Seconds between price polls of a symbol
+            fetch_timeout: Seconds before a fetch is given up for this cycle
+            max_workers: Threads running blocking fetches
+            initial_capital: Capital of the whole watchlist, split evenly
+                across symbols (default: Config.INITIAL_CAPITAL)
+            **strategy_params: Passed to each symbol's TradingStrategy
+        """
+        if not symbols:
+            raise ValueError("LiveTrader needs at least one symbol")
+        if initial_capital is None:
+            initial_capital = Config.INITIAL_CAPITAL
+        self.news_source = news_source
+        self.price_source = price_source
+        self.news_interval = news_interval
+        self.price_interval = price_interval
+        self.fetch_timeout = fetch_timeout
+        self.max_workers = max_workers
+        self.initial_capital = initial_capital
+        per_symbol = initial_capital / len(symbols)
+        self.states = {
+            symbol: SymbolState(
+                symbol, TradingStrategy(initial_capital=per_symbol, **strategy_params)
+            )
+            for symbol in symbols
+        }
+        # Most recent poll cycles: symbol, kind, latency (seconds), ok
+        self.cycles = deque(maxlen=10000)
+        self._executor = None
+
+    async def run(self, duration: Optional[float] = None):
+        """
+        Poll and trade until cancelled or for a fixed duration.
+
+        Args:
+            duration: Seconds to run (None runs until cancelled)
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='live-fetch'
+        )
+        tasks = []
+        for symbol in self.states:
+            tasks.append(asyncio.create_task(self._poll(symbol, 'price', self.price_interval)))
+            tasks.append(asyncio.create_task(self._poll(symbol, 'news', self.news_interval)))
+
+        logger.info(
+            f"Live paper trading {len(self.states)} symbols "
+            f"(news every {self.news_interval}s, prices every {self.price_interval}s)"
+        )
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Abandon fetches that are still blocked rather than waiting on them
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _poll(self, symbol: str, kind: str, interval: float):
+        """Poll one source for one symbol on a fixed schedule."""
+        loop = asyncio.get_running_loop()
+        fetch = self.price_source.get_price if kind == 'price' else self.news_source.get_sentiment
+        next_run = loop.time()
+        pending = None
+
+        while True:
+            started = time.perf_counter()
+            ok = True
+            try:
+                # A fetch that timed out keeps its thread until it returns;
+                # wait for it instead of piling more work onto the pool
+                if pending is None or pending.done():
+                    pending = loop.run_in_executor(self._executor, fetch, symbol)
+                value = await asyncio.wait_for(asyncio.shield(pending), timeout=self.fetch_timeout)
+                pending = None
+            except asyncio.TimeoutError:
+                logger.warning(f"{kind} fetch for {symbol} timed out after {self.fetch_timeout}s")
+                value, ok = None, False
+            except Exception as e:
+                logger.error(f"{kind} fetch for {symbol} failed: {e}")
+                value, ok, pending = None, False, None
+
+            if value is not None:
+                if kind == 'price':
+                    self.on_price(symbol, value)
+                else:
+                    self.on_sentiment(symbol, value)
+
+            self.cycles.append({
+                'symbol': symbol,
+                'kind': kind,
+                'latency': time.perf_counter() - started,
+                'ok': ok
+            })
+
+            # Fixed-rate schedule; skip missed ticks instead of bursting
+            next_run += interval
+            now = loop.time()
+            if next_run < now:
+                next_run = now
+            await asyncio.sleep(next_run - now)
+
+    async def replay(
+        self,
+        source,
+        speed: Optional[float] = None,
+        scorer=None,
+        signal: str = 'mean'
+    ) -> int:
+        """
+        Trade a recorded event stream instead of polling.
+
+        Bars update prices and every article is a trading decision, scored
+        with its recorded 'sentiment' or, if missing, with scorer.
+
+        Args:
+            source: ReplaySource with the recording
+            speed: 1.0 for real time, N for N times faster, None for as
+                fast as possible
+            scorer: Function text -> sentiment for unscored articles
+            signal: 'mean' trades on each article's own sentiment, 'decay'
+                on the time-decayed sentiment of all articles so far
+
+        Returns:
+            Number of events replayed
+        """
+        if signal not in SENTIMENT_SIGNALS:
+            raise ValueError(f"Unknown sentiment signal: {signal}")
+        signals = {}
+        count = 0
+        async for event in source.aplay(list(self.states), speed):
+            count += 1
+            if event.kind == 'bar':
+                self.on_price(event.symbol, float(event.data.close))
+                continue
+
+            sentiment = event.data.get('sentiment')
+            if sentiment is None and scorer is not None:
+                sentiment = scorer(
+                    f"{event.data.get('title', '')}. {event.data.get('description', '')}"
+                )
+            if sentiment is None:
+                continue
+            if signal == 'decay':
+                decayed = signals.get(event.symbol)
+                if decayed is None:
+                    decayed = signals[event.symbol] = make_signal()
+                decayed.add(event.time / 1e9, sentiment)
+                sentiment = decayed.value()
+            self.on_sentiment(event.symbol, sentiment, event.timestamp.to_pydatetime())
+        return count
+
+    def on_price(self, symbol: str, price: float):
+        """Record a new price and mark the position to market."""
+        state = self.states[symbol]
+        state.price = price
+        if state.first_price is None:
+            state.first_price = price
+        state.strategy.update_portfolio_value(price)
+
+    def on_sentiment(self, symbol: str, sentiment: float, timestamp: Optional[datetime] = None):
+        """
+        Record a new sentiment reading and trade on it.
+
+        Readings that arrive before the first price are kept but not traded.
+        """
+        state = self.states[symbol]
+        state.sentiment = sentiment
+        if state.price is None:
+            return
+
+        strategy = state.strategy
+        signal = strategy.generate_signal(sentiment, state.price)
+        trade = strategy.execute_trade(signal, state.price, sentiment, timestamp or datetime.now())
+        strategy.update_portfolio_value(state.price)
+        state.last_signal = signal
+
+        buy_hold_value = strategy.initial_capital * state.price / state.first_price
+        state.metrics.update(strategy.portfolio_value, buy_hold_value)
+        state.metrics.add_trade(trade)
+
+    def latency_summary(self) -> Dict:
+        """
+        Summarize recent poll cycle latencies per source.
+
+        Returns:
+            Dictionary per kind with count, failures, mean, p95 and max seconds
+        """
+        summary = {}
+        for kind in ('price', 'news'):
+            cycles = [cycle for cycle in self.cycles if cycle['kind'] == kind]
+            if not cycles:
+                continue
+            latencies = np.array([cycle['latency'] for cycle in cycles])
+            summary[kind] = {
+                'count': len(cycles),
+                'failures': sum(1 for cycle in cycles if not cycle['ok']),
+                'mean': float(latencies.mean()),
+                'p95': float(np.percentile(latencies, 95)),
+                'max': float(latencies.max())
+            }
+        return summary
+
+    def snapshot(self) -> Dict:
+        """
+        Get the paper positions and metrics of every symbol.
+
+        Returns:
+            Dictionary with per-symbol state and total portfolio value
+        """
+        positions = {}
+        total_value = 0.0
+        for symbol, state in self.states.items():
+            position = state.to_dict()
+            position['signal'] = state.last_signal
+            position['metrics'] = state.metrics.result()
+            positions[symbol] = position
+            total_value += state.strategy.portfolio_value
+        return {
+            'positions': positions,
+            'total_value': total_value,
+            'latency': self.latency_summary()
+        }
@@ -0,0 +1,377 @@
+"""Queue-based logging with JSON lines output and hot-path sampling.
+
+configure_logging() replaces the root handlers with a handler that only
+puts records on a queue; a background listener thread formats them (as
+text or as one JSON object per line) and writes them out. Code that logs
+from tight loops passes %-style arguments, so even the message is built on
+the listener thread, not in the loop.
+
+sample_loggers() keeps 1 in N INFO/DEBUG records of chosen loggers, or
+none, while warnings and errors always pass, until the returned
+LogSampling is restored (it is a context manager); sweeps and replays
+apply Config.LOG_HOT_PATH_SAMPLING to the per-trade and per-run loggers. Lines
+logged once per trade go through a hot_path_logger(), which skips sampled
+out calls before a LogRecord is even created.
+"""
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+from datetime import datetime, timezone
+from typing import Dict, Optional, Union
+from config import Config
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed in `extra`
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord('', logging.INFO, '', 0, '', (), None).__dict__
+) | {'message', 'asctime', 'taskName'}
+
+# Listener writing queued records (None until configure_logging())
+_listener = None
+_atexit_registered = False
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Serialize a record.
+
+        The object has 'time' (UTC, ISO 8601), 'level', 'logger' and
+        'message', then every field passed in `extra`, then 'exception'
+        and 'stack' when present.
+        """
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in `every` records below WARNING (0 keeps none)."""
+
+    def __init__(self, every: int):
+        """
+        Initialize the filter.
+
+        Args:
+            every: Keep the first record and every every-th after it;
+                0 drops every INFO/DEBUG record
+        """
+        super().__init__()
+        self.every = every
+        self.suppressed = 0
+        self._seen = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Whether the record is written."""
+        if record.levelno >= logging.WARNING or hasattr(record, 'sample_rate'):
+            # Sampled already, by a hot path front end
+            return True
+        if self.every and next(self._seen) % self.every == 0:
+            return True
+        self.suppressed += 1
+        return False
+
+
+class HotPathLogger:
+    """
+    Front end of a logger for lines logged from tight loops.
+
+    Sampling happens here, before the logger builds a LogRecord (which
+    costs far more than the skipped call). Kept records carry their
+    'sample_rate' when sampled, so counts can be scaled back up.
+    """
+
+    __slots__ = ('logger', 'every', 'suppressed', '_skip')
+
+    def __init__(self, logger: logging.Logger):
+        """
+        Initialize the front end.
+
+        Args:
+            logger: Logger the kept records go to
+        """
+        self.logger = logger
+        self.every = 1
+        self.suppressed = 0
+        self._skip = 0
+
+    def sample(self, every: int):
+        """Keep the next call and then 1 in every calls (0 keeps none)."""
+        self.every = every
+        self.suppressed = 0
+        self._skip = 0
+
+    def _log(self, level: int, msg: str, args: tuple, extra: Optional[Dict]):
+        if self._skip:
+            self._skip -= 1
+            self.suppressed += 1
+            return
+        if self.every == 1:
+            self.logger.log(level, msg, *args, extra=extra, stacklevel=3)
+            return
+        if self.every == 0:
+            self.suppressed += 1
+            return
+        self._skip = self.every - 1
+        extra = {**(extra or {}), 'sample_rate': self.every}
+        self.logger.log(level, msg, *args, extra=extra, stacklevel=3)
+
+    def debug(self, msg: str, *args, extra: Optional[Dict] = None):
+        """Log a DEBUG line, subject to sampling."""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, extra)
+
+    def info(self, msg: str, *args, extra: Optional[Dict] = None):
+        """Log an INFO line, subject to sampling."""
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, extra)
+
+
+# Hot path front ends by logger name, and the rates set by sample_loggers()
+_hot_path_loggers = {}
+_sample_rates = {}
+
+
+def hot_path_logger(name: str) -> HotPathLogger:
+    """Get the (shared) hot path front end of a logger."""
+    front_end = _hot_path_loggers.get(name)
+    if front_end is None:
+        front_end = HotPathLogger(logging.getLogger(name))
+        front_end.sample(_sample_rates.get(name, 1))
+        front_end = _hot_path_loggers.setdefault(name, front_end)
+    return front_end
+
+
+def _queue_handler_class():
+    """QueueHandler subclass that leaves formatting to the listener."""
+    from logging.handlers import QueueHandler
+
+    class DeferredQueueHandler(QueueHandler):
+        """Put records on the queue as they are (messages unformatted)."""
+
+        def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+            # The stock handler formats here, on the logging thread; the
+            # queue never leaves the process, so the record can go as is.
+            # Arguments are read when the listener formats the record, so
+            # log values, not objects that change afterwards.
+            return record
+
+    return DeferredQueueHandler
+
+
+def configure_logging(
+    level: Union[int, str, None] = None,
+    json_lines: Optional[bool] = None,
+    path: Optional[str] = None
+):
+    """
+    Send all logging through a queue to a background writer thread.
+
+    Replaces any root handlers (e.g. from logging.basicConfig) and can be
+    called again to reconfigure. The queue is drained at exit.
+
+    Args:
+        level: Root level (default: Config.LOG_LEVEL)
+        json_lines: Write JSON lines instead of text (default:
+            Config.LOG_FORMAT == 'json')
+        path: File to append to (default: Config.LOG_FILE, or stderr)
+    """
+    global _listener, _atexit_registered
+    from logging.handlers import QueueListener
+
+    stop_logging()
+
+    level = level or Config.LOG_LEVEL
+    if json_lines is None:
+        json_lines = Config.LOG_FORMAT == 'json'
+    path = path if path is not None else Config.LOG_FILE
+
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+        existing.close()
+
+    # Neither format shows threads or processes: skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(_queue_handler_class()(log_queue))
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+    if not _atexit_registered:
+        atexit.register(stop_logging)
+        _atexit_registered = True
+
+
+def stop_logging():
+    """Write every queued record and stop the writer thread (if running)."""
+    global _listener
+    if _listener is None:
+        return
+
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+
+
+def _log_synchronously_in_child():
+    """Attach the writer's handlers directly in forked children."""
+    global _listener
+    if _listener is None:
+        return
+
+    # The writer thread is not copied by fork: records queued in the child
+    # would never be written
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if getattr(handler, 'queue', None) is _listener.queue:
+            root.removeHandler(handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_log_synchronously_in_child)
+
+
+def parse_sampling(spec: str) -> Dict[str, int]:
+    """
+    Parse a sampling policy such as 'trading_strategy=100,backtester=0'.
+
+    Returns:
+        Mapping of logger name to N (keep 1 in N records, 0 keeps none)
+    """
+    policy = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        name, _, every = item.partition('=')
+        try:
+            policy[name.strip()] = max(int(every), 0)
+        except ValueError:
+            raise ValueError(f"Invalid log sampling entry '{item}' (expected logger=N)")
+    return policy
+
+
+class LogSampling:
+    """
+    Sampling installed by sample_loggers(), until restore() undoes it.
+
+    Use it as a context manager to sample only within a block:
+
+        with sample_loggers():
+            run_sweep()
+    """
+
+    def __init__(self, filters: Dict[str, SamplingFilter], previous: Dict[str, tuple]):
+        """
+        Initialize the handle.
+
+        Args:
+            filters: Sampling filters installed, by logger name
+            previous: Logger name -> (level, sampling filters, rate) before
+        """
+        self.filters = filters
+        self._previous = previous
+
+    def restore(self):
+        """Put the sampled loggers back as they were (idempotent)."""
+        previous, self._previous = self._previous, {}
+        for name, (level, filters, rate) in previous.items():
+            _apply_sampling(name, level, filters, rate)
+
+    def __enter__(self) -> 'LogSampling':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.restore()
+
+
+def _apply_sampling(name: str, level: int, filters, rate: Optional[int]):
+    """Set a logger's level, sampling filters and hot path rate (None: unsampled)."""
+    logger = logging.getLogger(name)
+    for existing in logger.filters[:]:
+        if isinstance(existing, SamplingFilter):
+            logger.removeFilter(existing)
+    for sampling_filter in filters:
+        logger.addFilter(sampling_filter)
+    logger.setLevel(level)
+    if rate is None:
+        _sample_rates.pop(name, None)
+    else:
+        _sample_rates[name] = rate
+    if name in _hot_path_loggers:
+        _hot_path_loggers[name].sample(1 if rate is None else rate)
+
+
+def sample_loggers(policy: Union[str, Dict[str, int], None] = None) -> LogSampling:
+    """
+    Sample the INFO/DEBUG records of some loggers.
+
+    Replaces any sampling installed earlier on the same loggers (1 turns
+    sampling off). Their hot path front ends sample 1 in N calls; a filter
+    samples their other records. Warnings and errors are never dropped.
+
+    Args:
+        policy: Logger name -> N (keep 1 in N, 0 keeps none), or a string
+            for parse_sampling (default: Config.LOG_HOT_PATH_SAMPLING)
+
+    Returns:
+        LogSampling restoring the loggers' previous state on restore() or
+        at the end of a with block; its 'filters' are the sampling filters
+        installed, by logger name ('suppressed' counts the records they
+        dropped). Loggers keeping none are set to WARNING instead
+    """
+    if policy is None:
+        policy = Config.LOG_HOT_PATH_SAMPLING
+    if isinstance(policy, str):
+        policy = parse_sampling(policy)
+
+    filters = {}
+    previous = {}
+    for name, every in policy.items():
+        logger = logging.getLogger(name)
+        previous[name] = (
+            logger.level,
+            [existing for existing in logger.filters if isinstance(existing, SamplingFilter)],
+            _sample_rates.get(name)
+        )
+        if every > 1:
+            filters[name] = SamplingFilter(every)
+        # Dropping everything is a level: no record is even created
+        _apply_sampling(
+            name,
+            logging.WARNING if every == 0 else logging.NOTSET,
+            [filters[name]] if name in filters else [],
+            every
+        )
+    return LogSampling(filters, previous)
@@ -1,36 +1,58 @@
-"""Main entry point for the trading bot."""
+"""Main entry point for the trading bot.
+
+Engines (and pandas, yfinance, VADER, ...) are imported by the command that
+needs them, so `--help` and argument errors return immediately.
+"""
 import argparse
+import contextlib
 import sys
+import time
 import logging
+from datetime import datetime
 from config import Config
-from backtester import Backtester
-from news_analyzer import NewsAnalyzer
+from log_pipeline import configure_logging, sample_loggers
+from options import SENTIMENT_SIGNALS, SENTIMENT_SOURCES, SUPPORTED_INTERVALS, WINDOW_MODES
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
+def create_backtester(args):
+    """Create a backtester on live data, or on a recording with --replay."""
+    from backtester import Backtester
+    from market_data import MarketData
+    from replay import ReplaySource
+    
+    if not args.replay:
+        return Backtester()
+    
+    replay = ReplaySource(args.replay, interval=args.interval)
+    return Backtester(
+        market_data=MarketData(price_source=replay),
+        news_source=replay
+    )
+
+
 def run_backtest_cli(args):
     """Run backtest from command line."""
     try:
-        # Validate configuration
-        Config.validate()
+        # Validate configuration (recordings need no API key)
+        if not args.replay:
+            Config.validate()
         
         logger.info("="*60)
         logger.info("NEWS-BASED ALGORITHMIC TRADING BOT")
         logger.info("="*60)
         
         # Initialize backtester
-        backtester = Backtester()
+        backtester = create_backtester(args)
         
         # Run backtest
         results = backtester.run_backtest(
             symbol=args.symbol,
             days=args.days,
-            initial_capital=args.capital
+            initial_capital=args.capital,
+            sentiment_source=args.sentiment_source,
+            interval=args.interval
         )
         
         # Display results
@@ -38,7 +60,7 @@ def run_backtest_cli(args):
         print("BACKTEST RESULTS")
         print("="*60)
         print(f"Symbol: {results['symbol']}")
-        print(f"Period: {args.days} days")
+        print(f"Period: {args.days} days ({args.interval} bars)")
         print(f"Initial Capital: ${args.capital:,.2f}")
         print("\nPERFORMANCE METRICS:")
         print("-"*60)
@@ -57,10 +79,11 @@ def run_backtest_cli(args):
         
         # Show recent trades
         if results['trades']:
+            time_format = '%Y-%m-%d' if args.interval == '1d' else '%Y-%m-%d %H:%M'
             print("\nRECENT TRADES (Last 5):")
             print("-"*60)
             for trade in results['trades'][-5:]:
-                print(f"{trade['timestamp'].strftime('%Y-%m-%d')} | "
+                print(f"{trade['timestamp'].strftime(time_format)} | "
                       f"{trade['action']:4} | "
                       f"${trade['price']:8.2f} | "
                       f"Shares: {trade['shares']:8.4f} | "
@@ -80,6 +103,335 @@ def run_backtest_cli(args):
         sys.exit(1)
 
 
+def run_portfolio_cli(args):
+    """Run a shared-cash portfolio backtest over --symbols from command line."""
+    from portfolio_backtester import PortfolioBacktester
+    
+    try:
+        # Validate configuration (recordings need no API key)
+        if not args.replay:
+            Config.validate()
+        if args.interval != '1d' or args.sentiment_source != 'simulated':
+            raise ValueError("--portfolio backtests daily bars with simulated sentiment")
+        
+        symbols = args.symbols or [args.symbol]
+        results = PortfolioBacktester(create_backtester(args)).run_backtest(
+            symbols,
+            days=args.days,
+            initial_capital=args.capital
+        )
+        if not results['symbols']:
+            print("\n❌ No overlapping price data for the portfolio")
+            sys.exit(1)
+        
+        # Display results
+        print("\n" + "="*60)
+        print("PORTFOLIO BACKTEST RESULTS")
+        print("="*60)
+        print(f"Symbols: {', '.join(results['symbols'])}")
+        print(f"Period: {args.days} days")
+        print(f"Initial Capital: ${args.capital:,.2f} (shared)")
+        print("\nPERFORMANCE METRICS:")
+        print("-"*60)
+        
+        metrics = results['metrics']
+        print(f"Strategy Return:      {metrics['strategy_return']:>10.2%}")
+        print(f"Buy & Hold Return:    {metrics['buy_hold_return']:>10.2%}")
+        print(f"Outperformance:       {metrics['outperformance']:>10.2%}")
+        print(f"Sharpe Ratio:         {metrics['strategy_sharpe']:>10.2f}")
+        print(f"Max Drawdown:         {metrics['max_drawdown']:>10.2%}")
+        print(f"Win Rate:             {metrics['win_rate']:>10.1%}")
+        print(f"Total Trades:         {metrics['total_trades']:>10}")
+        print(f"\nFinal Portfolio Value: ${metrics['final_portfolio_value']:,.2f}")
+        print(f"Final Buy & Hold Value: ${metrics['final_buy_hold_value']:,.2f}")
+        print("="*60)
+        
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error running portfolio backtest: {e}", exc_info=True)
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+
+def parse_float_list(value):
+    """Parse a comma-separated list of floats (e.g. '0.2,0.3,0.5')."""
+    try:
+        return [float(v) for v in value.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected comma-separated numbers, got '{value}'")
+
+
+def run_sweep_cli(args):
+    """Run a strategy parameter sweep from command line."""
+    from parameter_sweep import ParameterSweep
+    
+    try:
+        # Validate configuration (recordings need no API key)
+        if not args.replay:
+            Config.validate()
+        
+        param_grid = {
+            'buy_threshold': args.buy_thresholds or [Config.SENTIMENT_BUY_THRESHOLD],
+            'sell_threshold': args.sell_thresholds or [Config.SENTIMENT_SELL_THRESHOLD],
+            'position_size': args.position_sizes or [Config.POSITION_SIZE]
+        }
+        
+        table = ParameterSweep(create_backtester(args)).run(
+            symbol=args.symbol,
+            param_grid=param_grid,
+            days=args.days,
+            initial_capital=args.capital,
+            workers=args.workers,
+            rank_by=args.rank_by,
+            sentiment_source=args.sentiment_source,
+            interval=args.interval
+        )
+        
+        if table.empty:
+            print("\n❌ No results (no price data available)")
+            sys.exit(1)
+        
+        print("\n" + "="*60)
+        print("PARAMETER SWEEP RESULTS")
+        print("="*60)
+        print(f"Symbol: {args.symbol}")
+        print(f"Period: {args.days} days")
+        print(f"Combinations: {len(table)}")
+        print(f"Ranked by: {args.rank_by}")
+        print("-"*60)
+        
+        columns = [
+            'buy_threshold', 'sell_threshold', 'position_size',
+            'strategy_return', 'strategy_sharpe', 'max_drawdown',
+            'win_rate', 'total_trades'
+        ]
+        print(table[columns].head(args.top).to_string(index=False))
+        print("="*60)
+        
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        print(f"\n❌ Error: {e}")
+        print("\nPlease set up your .env file with required API keys.")
+        print("Copy .env.example to .env and add your NewsAPI key.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error running sweep: {e}", exc_info=True)
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+
+def run_walk_forward_cli(args):
+    """Run a walk-forward optimization from command line."""
+    from walk_forward import WalkForward
+    
+    try:
+        # Validate configuration (recordings need no API key)
+        if not args.replay:
+            Config.validate()
+        
+        param_grid = {
+            'buy_threshold': args.buy_thresholds or [Config.SENTIMENT_BUY_THRESHOLD],
+            'sell_threshold': args.sell_thresholds or [Config.SENTIMENT_SELL_THRESHOLD],
+            'position_size': args.position_sizes or [Config.POSITION_SIZE]
+        }
+        
+        results = WalkForward(create_backtester(args)).run(
+            symbol=args.symbol,
+            param_grid=param_grid,
+            train_bars=args.train_bars,
+            test_bars=args.test_bars,
+            step=args.step_bars,
+            mode=args.window,
+            days=args.days,
+            initial_capital=args.capital,
+            workers=args.workers,
+            rank_by=args.rank_by,
+            sentiment_source=args.sentiment_source,
+            interval=args.interval
+        )
+        
+        folds = results['folds']
+        if folds.empty:
+            print("\n❌ No results (no price data, or fewer bars than one training window)")
+            sys.exit(1)
+        
+        print("\n" + "="*60)
+        print("WALK-FORWARD RESULTS (OUT OF SAMPLE)")
+        print("="*60)
+        print(f"Symbol: {args.symbol}")
+        print(f"Windows: {args.window}, {args.train_bars} training / {args.test_bars} test bars")
+        print(f"Folds: {len(folds)}, optimized for {args.rank_by}")
+        print("-"*60)
+        
+        columns = [
+            'fold', 'test_start', 'buy_threshold', 'sell_threshold', 'position_size',
+            'strategy_return', 'buy_hold_return', 'total_trades',
+            'train_seconds', 'test_seconds'
+        ]
+        print(folds[columns].to_string(index=False))
+        print("-"*60)
+        
+        metrics = results['metrics']
+        print(f"Strategy Return:      {metrics['strategy_return']:>10.2%}")
+        print(f"Buy & Hold Return:    {metrics['buy_hold_return']:>10.2%}")
+        print(f"Sharpe Ratio:         {metrics['strategy_sharpe']:>10.2f}")
+        print(f"Max Drawdown:         {metrics['max_drawdown']:>10.2%}")
+        print(f"Win Rate:             {metrics['win_rate']:>10.1%}")
+        print(f"Total Trades:         {metrics['total_trades']:>10}")
+        
+        timing = results['timing']
+        print(f"\nLoaded data in {timing['load_seconds']:.2f}s, "
+              f"finished in {timing['total_seconds']:.2f}s on {timing['workers']} worker(s)")
+        print("="*60)
+        
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        print(f"\n❌ Error: {e}")
+        print("\nPlease set up your .env file with required API keys.")
+        print("Copy .env.example to .env and add your NewsAPI key.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error running walk-forward: {e}", exc_info=True)
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+
+def print_live_snapshot(snapshot):
+    """Print the paper positions and poll latencies of a live session."""
+    print("\n" + "="*60)
+    print(f"PAPER PORTFOLIO  {datetime.now():%Y-%m-%d %H:%M:%S}")
+    print("="*60)
+    for symbol, position in snapshot['positions'].items():
+        if position['price'] is None:
+            print(f"{symbol:8} | waiting for first price")
+            continue
+        sentiment = position['sentiment']
+        sentiment_text = f"{sentiment:6.3f}" if sentiment is not None else "   n/a"
+        print(f"{symbol:8} | "
+              f"${position['price']:10.2f} | "
+              f"Sentiment: {sentiment_text} | "
+              f"{position['signal']:4} | "
+              f"Value: ${position['portfolio_value']:12,.2f} | "
+              f"Trades: {position['total_trades']}")
+    print("-"*60)
+    print(f"Total Value: ${snapshot['total_value']:,.2f}")
+    for kind, stats in snapshot['latency'].items():
+        print(f"{kind.capitalize():6} polls: {stats['count']:5} "
+              f"(failed {stats['failures']}) | "
+              f"mean {stats['mean'] * 1000:7.1f} ms | "
+              f"p95 {stats['p95'] * 1000:7.1f} ms | "
+              f"max {stats['max'] * 1000:7.1f} ms")
+    print("="*60)
+
+
+async def run_live_session(
+    trader, duration, report_interval, replay=None, speed=None, scorer=None, signal='mean'
+):
+    """
+    Run the live trader and print a snapshot every report_interval seconds.
+    
+    With a replay source and a speed, the trader polls as usual while the
+    replay clock advances through the recording; without a speed, the
+    recorded events are fed to the trader as fast as possible.
+    """
+    import asyncio
+    
+    async def report():
+        while True:
+            await asyncio.sleep(report_interval)
+            print_live_snapshot(trader.snapshot())
+    
+    reporter = asyncio.create_task(report())
+    try:
+        if replay is None:
+            await trader.run(duration)
+        elif speed:
+            clock = asyncio.create_task(replay.run_clock(list(trader.states), speed))
+            polling = asyncio.create_task(trader.run(duration))
+            done, pending = await asyncio.wait({clock, polling}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        else:
+            started = time.perf_counter()
+            events = await asyncio.wait_for(trader.replay(replay, scorer=scorer, signal=signal), duration)
+            elapsed = time.perf_counter() - started
+            logger.info(f"Replayed {events:,} events in {elapsed:.2f}s ({events / max(elapsed, 1e-9):,.0f}/s)")
+    finally:
+        reporter.cancel()
+
+
+def run_live_cli(args):
+    """Run live paper trading from command line."""
+    import asyncio
+    from live_trader import (
+        LiveTrader, MarketDataSource, NewsAnalyzerSource,
+        StubNewsSource, StubPriceSource
+    )
+    from market_data import MarketData
+    from news_analyzer import NewsAnalyzer
+    from replay import ReplaySource
+    
+    try:
+        replay = None
+        scorer = None
+        symbols = args.symbols or [args.symbol]
+        
+        if args.replay:
+            # Recorded bars and articles stand in for yfinance and NewsAPI
+            replay = ReplaySource(args.replay)
+            symbols = args.symbols or replay.symbols
+            news_analyzer = NewsAnalyzer(news_source=replay)
+            scorer = news_analyzer.analyze_sentiment
+            news_source = NewsAnalyzerSource(news_analyzer, signal=args.sentiment_signal)
+            price_source = MarketDataSource(MarketData(price_source=replay))
+        elif args.stub:
+            # Offline mode: deterministic synthetic news and prices
+            news_source = StubNewsSource(delay=0.05)
+            price_source = StubPriceSource(delay=0.05)
+        else:
+            Config.validate()
+            news_source = NewsAnalyzerSource(signal=args.sentiment_signal)
+            price_source = MarketDataSource()
+        
+        trader = LiveTrader(
+            symbols,
+            news_source,
+            price_source,
+            news_interval=args.news_interval,
+            price_interval=args.price_interval,
+            fetch_timeout=Config.LIVE_FETCH_TIMEOUT,
+            initial_capital=args.capital
+        )
+        
+        logger.info("="*60)
+        logger.info("LIVE PAPER TRADING (no real orders are placed)")
+        logger.info("="*60)
+        
+        try:
+            asyncio.run(run_live_session(
+                trader, args.duration, args.report_interval, replay, args.speed, scorer,
+                args.sentiment_signal
+            ))
+        except KeyboardInterrupt:
+            logger.info("Stopping live paper trading")
+        
+        print_live_snapshot(trader.snapshot())
+        
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        print(f"\n❌ Error: {e}")
+        print("\nPlease set up your .env file with required API keys, or use --stub.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error in live trading: {e}", exc_info=True)
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+
 def launch_dashboard():
     """Launch the interactive dashboard."""
     try:
@@ -118,6 +470,30 @@ Examples:
   # Run backtest with custom capital
   python main.py --backtest --symbol TSLA --days 60 --capital 50000
   
+  # Backtest on 5-minute bars with stored news aligned to the bar after publication
+  python main.py --backtest --symbol AAPL --days 30 --interval 5m --sentiment-source stored
+  
+  # Trade on a 24h half-life decayed signal of the stored news (SENTIMENT_HALF_LIFE_HOURS)
+  python main.py --backtest --symbol AAPL --days 90 --sentiment-source decayed
+  
+  # Backtest a watchlist as one portfolio sharing the capital
+  python main.py --portfolio --symbols AAPL,MSFT,BTC-USD --days 180 --capital 30000
+  
+  # Sweep strategy thresholds across all cores
+  python main.py --sweep --symbol AAPL --buy-thresholds 0.2,0.3,0.5 --sell-thresholds=-0.2,-0.5
+  
+  # Walk-forward: optimize on a year, trade the next quarter out of sample, roll forward
+  python main.py --walk-forward --symbol AAPL --days 1825 --train-bars 252 --test-bars 63 \\
+      --buy-thresholds 0.2,0.3,0.5 --sell-thresholds=-0.2,-0.5
+  
+  # Paper trade a watchlist live (offline with --stub)
+  python main.py --live --symbols AAPL,MSFT,TSLA --price-interval 60 --news-interval 300
+  python main.py --live --stub --symbols AAPL,MSFT --price-interval 1 --news-interval 2 --duration 30
+  
+  # Backtest or paper trade against a recording (no network access)
+  python main.py --backtest --replay recordings/ --symbol AAPL --days 365
+  python main.py --live --replay recordings/ --speed 3600
+  
   # Launch interactive dashboard
   python main.py --dashboard
         """
@@ -129,6 +505,30 @@ Examples:
         help='Run backtest mode'
     )
     
+    parser.add_argument(
+        '--portfolio',
+        action='store_true',
+        help='Backtest --symbols as one portfolio sharing --capital'
+    )
+    
+    parser.add_argument(
+        '--sweep',
+        action='store_true',
+        help='Run a parameter sweep over strategy thresholds'
+    )
+    
+    parser.add_argument(
+        '--walk-forward',
+        action='store_true',
+        help='Optimize thresholds on rolling training windows and test them out of sample'
+    )
+    
+    parser.add_argument(
+        '--live',
+        action='store_true',
+        help='Run live paper trading on a watchlist'
+    )
+    
     parser.add_argument(
         '--dashboard',
         action='store_true',
@@ -153,20 +553,180 @@ Examples:
         '--capital',
         type=float,
         default=Config.INITIAL_CAPITAL,
-        help=f'Initial capital (default: ${Config.INITIAL_CAPITAL:,.0f})'
+        help=f'Initial capital, split across --symbols in --live (default: ${Config.INITIAL_CAPITAL:,.0f})'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        choices=list(SUPPORTED_INTERVALS),
+        default='1d',
+        help='Bar interval for --backtest, --sweep and --walk-forward (default: 1d; yfinance keeps '
+             '1m bars for ~30 days, served 7 days per request, and 5m-30m bars for 60 days)'
+    )
+    
+    parser.add_argument(
+        '--sentiment-source',
+        choices=list(SENTIMENT_SOURCES),
+        default='simulated',
+        help='Backtest sentiment: simulated cycles, articles saved in the news store, '
+             'or those articles as a time-decayed signal (default: simulated)'
+    )
+    
+    parser.add_argument(
+        '--sentiment-signal',
+        choices=list(SENTIMENT_SIGNALS),
+        default='mean',
+        help='Live sentiment: average of the latest news window, or time-decayed '
+             'sentiment of every article seen (default: mean)'
+    )
+    
+    parser.add_argument(
+        '--buy-thresholds',
+        type=parse_float_list,
+        help='Comma-separated buy thresholds to sweep'
+    )
+    
+    parser.add_argument(
+        '--sell-thresholds',
+        type=parse_float_list,
+        help='Comma-separated sell thresholds to sweep'
+    )
+    
+    parser.add_argument(
+        '--position-sizes',
+        type=parse_float_list,
+        help='Comma-separated position sizes to sweep'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for --sweep and --walk-forward (default: all cores)'
+    )
+    
+    parser.add_argument(
+        '--train-bars',
+        type=int,
+        default=252,
+        help='Bars per --walk-forward training window (default: 252)'
+    )
+    
+    parser.add_argument(
+        '--test-bars',
+        type=int,
+        default=63,
+        help='Bars per --walk-forward test window (default: 63)'
+    )
+    
+    parser.add_argument(
+        '--step-bars',
+        type=int,
+        default=None,
+        help='Bars between --walk-forward test windows, at least --test-bars (default: --test-bars)'
+    )
+    
+    parser.add_argument(
+        '--window',
+        choices=list(WINDOW_MODES),
+        default='rolling',
+        help='--walk-forward training window: fixed length, or all bars since the start (default: rolling)'
+    )
+    
+    parser.add_argument(
+        '--rank-by',
+        type=str,
+        default='strategy_sharpe',
+        help='Metric used to rank sweep results and pick walk-forward parameters '
+             '(default: strategy_sharpe)'
+    )
+    
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        help='Number of sweep results to display (default: 10)'
+    )
+    
+    parser.add_argument(
+        '--symbols',
+        type=lambda value: [s.strip().upper() for s in value.split(',') if s.strip()],
+        help='Comma-separated watchlist for --live and --portfolio (default: --symbol)'
+    )
+    
+    parser.add_argument(
+        '--news-interval',
+        type=float,
+        default=Config.LIVE_NEWS_INTERVAL,
+        help=f'Seconds between news polls in --live (default: {Config.LIVE_NEWS_INTERVAL:g})'
+    )
+    
+    parser.add_argument(
+        '--price-interval',
+        type=float,
+        default=Config.LIVE_PRICE_INTERVAL,
+        help=f'Seconds between price polls in --live (default: {Config.LIVE_PRICE_INTERVAL:g})'
+    )
+    
+    parser.add_argument(
+        '--duration',
+        type=float,
+        default=None,
+        help='Seconds to run --live (default: until Ctrl+C)'
+    )
+    
+    parser.add_argument(
+        '--report-interval',
+        type=float,
+        default=60,
+        help='Seconds between portfolio reports in --live (default: 60)'
+    )
+    
+    parser.add_argument(
+        '--replay',
+        type=str,
+        metavar='DIR',
+        help='Use recorded bars and articles from DIR instead of yfinance/NewsAPI'
+    )
+    
+    parser.add_argument(
+        '--speed',
+        type=float,
+        default=None,
+        help='Replay speed for --live --replay (1 = real time; default: as fast as possible)'
+    )
+    
+    parser.add_argument(
+        '--stub',
+        action='store_true',
+        help='Use offline synthetic news and prices in --live'
     )
     
     args = parser.parse_args()
     
+    # Replays trade quickly: sample per-trade logging while they run
+    sampling = sample_loggers() if args.replay else contextlib.nullcontext()
+    
     # Determine mode
-    if args.dashboard:
-        launch_dashboard()
-    elif args.backtest:
-        run_backtest_cli(args)
-    else:
-        parser.print_help()
-        print("\n💡 Tip: Use --backtest to run a backtest or --dashboard to launch the UI")
+    with sampling:
+        if args.dashboard:
+            launch_dashboard()
+        elif args.live:
+            run_live_cli(args)
+        elif args.portfolio:
+            run_portfolio_cli(args)
+        elif args.sweep:
+            run_sweep_cli(args)
+        elif args.walk_forward:
+            run_walk_forward_cli(args)
+        elif args.backtest:
+            run_backtest_cli(args)
+        else:
+            parser.print_help()
+            print("\n💡 Tip: Use --backtest to run a backtest or --dashboard to launch the UI")
 
 
 if __name__ == '__main__':
+    # Text or JSON lines (LOG_FORMAT), written by a background thread
+    configure_logging()
     main()
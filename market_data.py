@@ -1,20 +1,55 @@
 """Market data integration using yfinance."""
-import yfinance as yf
 import pandas as pd
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional
 import logging
+from config import Config
+from data_sources import PriceSource, YFinancePriceSource
+from price_cache import PriceCache
+from instrumentation import count_cache, stage
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class MarketData:
-    """Fetches and processes market data using yfinance."""
+    """Fetches and processes market data (yfinance unless another source is given)."""
     
-    def __init__(self):
-        """Initialize the market data handler."""
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        cache_max_age: Optional[float] = None,
+        price_source: Optional[PriceSource] = None
+    ):
+        """
+        Initialize the market data handler.
+        
+        Args:
+            cache_dir: Directory of the on-disk price cache
+                (default: Config.PRICE_CACHE_DIR)
+            cache_max_age: Seconds before cached bars are refreshed from
+                the source (default: Config.PRICE_CACHE_MAX_AGE)
+            price_source: Where bars come from (default: yfinance); only
+                cacheable sources use the on-disk cache
+        """
+        self.price_source = price_source or YFinancePriceSource()
+        
+        # In-memory copy of the on-disk cache: (symbol, interval) -> (df, meta)
         self.cache = {}
+        self.cache_max_age = (
+            cache_max_age if cache_max_age is not None else Config.PRICE_CACHE_MAX_AGE
+        )
+        self.price_cache = None
+        self._cache_locks = defaultdict(threading.Lock)
+        
+        if Config.PRICE_CACHE_ENABLED and self.price_source.cacheable:
+            try:
+                self.price_cache = PriceCache(cache_dir or Config.PRICE_CACHE_DIR)
+            except (ImportError, OSError) as e:
+                logger.warning(f"Price cache disabled: {e}")
     
     def get_price_history(
         self, 
@@ -25,6 +60,10 @@ class MarketData:
         """
         Get historical price data for a symbol.
         
+        With the price cache enabled, requests are served as slices of the
+        widest range fetched so far and only bars missing from it (since
+        the last cached bar, or before the first one) are downloaded.
+        
         Args:
             symbol: Stock ticker symbol (e.g., 'AAPL', 'BTC-USD')
             days: Number of days of historical data
@@ -35,27 +74,22 @@ class MarketData:
         """
         try:
             # Calculate date range
-            end_date = datetime.now()
+            end_date = self.price_source.now()
             start_date = end_date - timedelta(days=days)
             
-            logger.info(f"Fetching {days} days of data for {symbol}")
-            
-            # Fetch data from yfinance
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(
-                start=start_date,
-                end=end_date,
-                interval=interval
-            )
+            with stage('price_history'):
+                if self.price_cache is None:
+                    logger.info(f"Fetching {days} days of data for {symbol}")
+                    df = self._download(symbol, start_date, end_date, interval)
+                else:
+                    df = self._get_cached_history(symbol, start_date, end_date, interval)
+                    if not df.empty:
+                        df = self._slice_from(df, start_date, interval)
             
             if df.empty:
                 logger.warning(f"No data found for {symbol}")
                 return pd.DataFrame()
             
-            # Clean and prepare data
-            df = df.reset_index()
-            df.columns = [col.lower() for col in df.columns]
-            
             logger.info(f"Retrieved {len(df)} data points for {symbol}")
             
             return df
@@ -64,6 +98,158 @@ class MarketData:
             logger.error(f"Error fetching price data: {e}")
             return pd.DataFrame()
     
+    def _download(
+        self,
+        symbol: str,
+        start_date,
+        end_date,
+        interval: str
+    ) -> pd.DataFrame:
+        """Download bars from the price source with lowercase column names."""
+        with stage('price_download'):
+            return self.price_source.get_history(symbol, start_date, end_date, interval)
+    
+    def _get_cached_history(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str
+    ) -> pd.DataFrame:
+        """
+        Get bars covering [start_date, end_date] through the price cache.
+        
+        Returns the full cached range; callers slice it.
+        """
+        key = (symbol, interval)
+        
+        with self._cache_locks[key]:
+            df, meta = self._load_cached(symbol, interval)
+            
+            if df is None or df.empty:
+                count_cache('price', hit=False)
+                logger.info(f"Fetching {(end_date - start_date).days} days of data for {symbol}")
+                df = self._download(symbol, start_date, end_date, interval)
+                if not df.empty:
+                    self._store_cached(symbol, interval, df, start_date, time.time())
+                return df
+            
+            time_col = df.columns[0]
+            coverage_start = meta['start']
+            fetched_at = meta['fetched_at']
+            parts = [df]
+            
+            # Missing head: a wider window than any requested before
+            if start_date < coverage_start:
+                logger.info(f"Fetching {symbol} history from {start_date.date()} to {coverage_start.date()}")
+                parts.insert(0, self._download(symbol, start_date, df[time_col].iloc[0], interval))
+                coverage_start = start_date
+            
+            # Missing tail: bars since the last cached one (refreshing that
+            # bar too, since it may have been incomplete when fetched)
+            if time.time() - fetched_at > self.cache_max_age:
+                last_bar = df[time_col].iloc[-1]
+                logger.info(f"Fetching {symbol} bars since {last_bar}")
+                try:
+                    parts.append(self._download(symbol, last_bar, end_date, interval))
+                    fetched_at = time.time()
+                except Exception as e:
+                    logger.warning(f"Serving cached {symbol} data, refresh failed: {e}")
+            
+            # A hit when no bars had to be requested upstream
+            count_cache('price', hit=len(parts) == 1)
+            
+            if any(part is not df and not part.empty for part in parts):
+                df = self._merge_bars(parts, time_col)
+                self._store_cached(symbol, interval, df, coverage_start, fetched_at)
+            elif len(parts) > 1:
+                # Nothing new upstream; remember that we checked
+                self.price_cache.update_meta(symbol, interval, coverage_start, fetched_at)
+                self.cache[key] = (df, {'start': coverage_start, 'fetched_at': fetched_at})
+            
+            return df
+    
+    def _load_cached(self, symbol: str, interval: str):
+        """Load cached bars and metadata, preferring the in-memory copy while fresh."""
+        key = (symbol, interval)
+        
+        if key in self.cache:
+            df, meta = self.cache[key]
+            if time.time() - meta['fetched_at'] <= self.cache_max_age:
+                return df, meta
+        
+        # Another process may have refreshed the files since
+        meta = self.price_cache.load_meta(symbol, interval)
+        df = self.price_cache.load(symbol, interval) if meta else None
+        if df is not None:
+            self.cache[key] = (df, meta)
+        return df, meta
+    
+    def _store_cached(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame,
+        start_date: datetime,
+        fetched_at: float
+    ):
+        """Write bars to the on-disk cache and the in-memory copy."""
+        self.cache[(symbol, interval)] = (df, {'start': start_date, 'fetched_at': fetched_at})
+        try:
+            self.price_cache.store(symbol, interval, df, start_date, fetched_at)
+        except Exception as e:
+            logger.warning(f"Could not write price cache for {symbol}: {e}")
+    
+    def _merge_bars(self, parts: List[pd.DataFrame], time_col: str) -> pd.DataFrame:
+        """Concatenate bar frames, keeping the latest copy of each timestamp."""
+        parts = [part for part in parts if not part.empty]
+        merged = pd.concat(parts, ignore_index=True)
+        merged = merged.drop_duplicates(subset=time_col, keep='last')
+        return merged.sort_values(time_col, kind='stable').reset_index(drop=True)
+    
+    def _slice_from(self, df: pd.DataFrame, start_date: datetime, interval: str) -> pd.DataFrame:
+        """Return the bars at or after start_date (whole days for daily+ intervals)."""
+        time_col = df.columns[0]
+        times = df[time_col]
+        
+        cutoff = pd.Timestamp(start_date)
+        if interval[-1] not in 'mh':
+            cutoff = cutoff.normalize()
+        if times.dt.tz is not None:
+            cutoff = cutoff.tz_localize(times.dt.tz)
+        
+        return df[times >= cutoff].reset_index(drop=True)
+    
+    def get_price_histories(
+        self,
+        symbols: List[str],
+        days: int = 90,
+        interval: str = '1d',
+        max_workers: int = 8
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get historical price data for several symbols concurrently.
+        
+        Args:
+            symbols: Stock ticker symbols
+            days: Number of days of historical data
+            interval: Data interval ('1d', '1h', etc.)
+            max_workers: Maximum number of concurrent downloads
+            
+        Returns:
+            Dictionary mapping symbol to its OHLCV DataFrame
+        """
+        if not symbols:
+            return {}
+        
+        workers = min(max_workers, len(symbols))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            frames = pool.map(
+                lambda symbol: self.get_price_history(symbol, days=days, interval=interval),
+                symbols
+            )
+            return dict(zip(symbols, frames))
+    
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
         Get the current price for a symbol.
@@ -75,14 +261,7 @@ class MarketData:
             Current price or None if unavailable
         """
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period='1d', interval='1m')
-            
-            if data.empty:
-                return None
-            
-            current_price = data['Close'].iloc[-1]
-            return float(current_price)
+            return self.price_source.get_latest_price(symbol)
             
         except Exception as e:
             logger.error(f"Error fetching current price: {e}")
@@ -138,6 +317,8 @@ class MarketData:
             Dictionary with ticker info
         """
         try:
+            import yfinance as yf
+
             ticker = yf.Ticker(symbol)
             info = ticker.info
             
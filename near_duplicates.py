@@ -0,0 +1,396 @@
+"""Near-duplicate detection of news articles (MinHash + LSH).
+
+Syndicated stories reach NewsAPI many times with small wording changes.
+Each text is reduced to a MinHash signature of its word bigrams; signatures
+are split into bands and hashed into LSH buckets, so near-duplicates are
+found by a few dictionary lookups instead of comparing against every
+article seen. Clusters (and their sentiment) persist in SQLite, so copies
+arriving in later fetches are recognized without being scored again.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+import logging
+from contextlib import contextmanager
+from itertools import chain
+from typing import Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clusters (
+    id INTEGER PRIMARY KEY,
+    sentiment REAL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS members (
+    key TEXT PRIMARY KEY,
+    cluster_id INTEGER NOT NULL,
+    signature BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_members_cluster ON members (cluster_id);
+CREATE TABLE IF NOT EXISTS claims (
+    cluster_id INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    PRIMARY KEY (cluster_id, symbol)
+);
+"""
+
+# Member signatures kept per cluster for matching (the first copies seen)
+MAX_SIGNATURES = 8
+
+_WORD = re.compile(r"\w+")
+
+# Multiply-shift hashes (a * x + b mod 2^64) >> 32 with odd a, one per
+# signature row; the coefficients are fixed so persisted signatures stay
+# comparable across runs
+_MAX_PERMUTATIONS = 256
+_rng = np.random.default_rng(20240101)
+_A = _rng.integers(0, 1 << 63, _MAX_PERMUTATIONS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _rng.integers(0, 1 << 63, _MAX_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str, size: int = 2) -> List[int]:
+    """
+    Hash the word n-grams of a text (lowercased, punctuation ignored).
+
+    Args:
+        text: Text to shingle
+        size: Words per shingle (texts shorter than this form one shingle)
+
+    Returns:
+        Distinct 32-bit shingle hashes (empty for empty texts)
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return []
+    grams = {' '.join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    return [zlib.crc32(gram.encode()) for gram in grams]
+
+
+def minhash_signatures(texts: List[str], num_perm: int = 64) -> np.ndarray:
+    """
+    Compute MinHash signatures of many texts in one vectorized pass.
+
+    Args:
+        texts: Texts to sign
+        num_perm: Signature length (number of hash functions)
+
+    Returns:
+        (len(texts), num_perm) uint64 array; rows of empty texts are all
+        the maximum value
+    """
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    hashed = [shingles(text) for text in texts]
+    lengths = np.array([len(h) for h in hashed], dtype=np.int64)
+    if not lengths.sum():
+        return signatures
+
+    # All shingles of the batch hashed by every function at once, then the
+    # minimum per text with one reduceat over the text boundaries
+    values = np.fromiter(chain.from_iterable(hashed), dtype=np.uint64, count=int(lengths.sum()))
+    permuted = (_A[:num_perm, None] * values[None, :] + _B[:num_perm, None]) >> np.uint64(32)
+    present = np.flatnonzero(lengths)
+    offsets = np.r_[0, np.cumsum(lengths)[:-1]][present]
+    signatures[present] = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return signatures
+
+
+def band_keys(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """
+    Hash each band of each signature into an LSH bucket key.
+
+    Args:
+        signatures: (n, num_perm) MinHash signatures
+        bands: Number of bands (num_perm must be a multiple)
+
+    Returns:
+        (n, bands) uint64 array; equal keys in the same column mean equal bands
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    banded = signatures.reshape(n, bands, rows)
+    keys = (banded * _A[:rows]).sum(axis=2, dtype=np.uint64)
+    # Salt with the band number so equal values in different bands differ
+    return keys ^ _B[:bands]
+
+
+class NearDuplicateIndex:
+    """
+    Persistent LSH index assigning articles to near-duplicate clusters.
+
+    A new article joins the cluster of the first candidate (sharing at
+    least one LSH band with one of its members) whose estimated Jaccard
+    similarity reaches the threshold; otherwise it starts a cluster and
+    becomes its representative. Matching against several members, not just
+    the representative, keeps two edits of the same wire story together.
+    Articles are keyed by URL, so refetching an article never grows its
+    cluster twice.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.5,
+        max_clusters: int = 100000
+    ):
+        """
+        Initialize the index, loading persisted clusters.
+
+        Args:
+            db_path: SQLite file the clusters persist in (None keeps them in memory)
+            num_perm: MinHash signature length
+            bands: LSH bands (num_perm must be a multiple); more bands find
+                less similar candidates
+            threshold: Estimated Jaccard similarity of near-duplicates
+            max_clusters: Clusters kept before the oldest are dropped
+        """
+        if num_perm > _MAX_PERMUTATIONS or num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands and at most 256")
+        self.db_path = db_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_clusters = max_clusters
+
+        self._buckets = {}
+        self._signatures = {}  # Cluster ID -> member signatures
+        self._sentiments = {}  # Cluster ID -> sentiment of the representative
+        self._sizes = {}
+        self._members = {}  # URL (or text) -> cluster ID
+        self._claims = {}  # Cluster ID -> symbols it was claimed for
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(SCHEMA)
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    @contextmanager
+    def _connect(self):
+        """Open a transaction on a fresh connection."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _load(self):
+        """Rebuild the in-memory buckets from the database."""
+        with self._connect() as conn:
+            clusters = conn.execute("SELECT id, sentiment, size FROM clusters ORDER BY id").fetchall()
+            members = conn.execute("SELECT key, cluster_id, signature FROM members ORDER BY rowid").fetchall()
+            claims = conn.execute("SELECT cluster_id, symbol FROM claims").fetchall()
+
+        for cluster_id, sentiment, size in clusters:
+            self._signatures[cluster_id] = []
+            self._sentiments[cluster_id] = sentiment
+            self._sizes[cluster_id] = size
+            self._next_id = cluster_id + 1
+        for cluster_id, symbol in claims:
+            if cluster_id in self._sizes:
+                self._claims.setdefault(cluster_id, set()).add(symbol)
+        stored = []
+        for key, cluster_id, blob in members:
+            if cluster_id not in self._sizes:
+                continue
+            self._members[key] = cluster_id
+            if blob is not None and len(blob) == self.num_perm * 8:
+                stored.append((cluster_id, np.frombuffer(blob, dtype=np.uint64)))
+        if stored:
+            signatures = np.stack([signature for _, signature in stored])
+            for (cluster_id, signature), keys in zip(stored, band_keys(signatures, self.bands).tolist()):
+                self._add_signature(cluster_id, signature, keys)
+        logger.info(f"Loaded {len(self)} near-duplicate clusters")
+
+    def _add_signature(self, cluster_id: int, signature: np.ndarray, keys: List[int]) -> bool:
+        """Register a member signature in the buckets (False if the cluster has enough)."""
+        signatures = self._signatures[cluster_id]
+        if len(signatures) >= MAX_SIGNATURES:
+            return False
+        signatures.append(signature)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(cluster_id)
+        return True
+
+    def _find(self, signature: np.ndarray, keys: List[int]) -> Optional[int]:
+        """Find the cluster a signature belongs to (None if none is similar enough)."""
+        seen = set()
+        for key in keys:
+            for cluster_id in self._buckets.get(key, ()):
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+                matches = np.count_nonzero(np.asarray(self._signatures[cluster_id]) == signature, axis=1)
+                if matches.max() >= self.threshold * self.num_perm:
+                    return cluster_id
+        return None
+
+    def assign(self, texts: List[str], urls: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Assign articles to clusters, creating clusters for new stories.
+
+        Args:
+            texts: Article texts (title + description)
+            urls: Article URLs (known URLs keep their cluster)
+
+        Returns:
+            Per article: 'cluster' ID, 'new' (whether it started the
+            cluster, i.e. it is the representative to score) and
+            'sentiment' (the cluster's score, None until set_sentiment)
+        """
+        urls = urls or [''] * len(texts)
+        signatures = minhash_signatures(texts, self.num_perm)
+        all_keys = band_keys(signatures, self.bands).tolist()
+        assignments = []
+        new_clusters = []
+        new_members = []
+
+        with self._lock:
+            for text, url, signature, keys in zip(texts, urls, signatures, all_keys):
+                key = url or text
+                cluster_id = self._members.get(key)
+                if cluster_id is not None:
+                    assignments.append({'cluster': cluster_id, 'new': False})
+                    continue
+
+                cluster_id = self._find(signature, keys) if text.strip() else None
+                is_new = cluster_id is None
+                if is_new:
+                    cluster_id = self._next_id
+                    self._next_id += 1
+                    self._signatures[cluster_id] = []
+                    self._sentiments[cluster_id] = None
+                    self._sizes[cluster_id] = 1
+                    new_clusters.append(cluster_id)
+                else:
+                    self._sizes[cluster_id] += 1
+                stored = self._add_signature(cluster_id, signature, keys)
+                self._members[key] = cluster_id
+                new_members.append((key, cluster_id, signature.tobytes() if stored else None))
+                assignments.append({'cluster': cluster_id, 'new': is_new})
+
+            for assignment in assignments:
+                assignment['sentiment'] = self._sentiments.get(assignment['cluster'])
+            evicted = self._evict()
+
+        if self.db_path and (new_members or evicted):
+            self._persist(new_clusters, new_members, evicted)
+        return assignments
+
+    def set_sentiment(self, sentiments: Dict[int, float]):
+        """
+        Record the scores of cluster representatives.
+
+        Args:
+            sentiments: Cluster ID -> sentiment
+        """
+        with self._lock:
+            sentiments = {cid: score for cid, score in sentiments.items() if cid in self._sizes}
+            self._sentiments.update(sentiments)
+        if self.db_path and sentiments:
+            with self._connect() as conn:
+                conn.executemany(
+                    "UPDATE clusters SET sentiment = ? WHERE id = ?",
+                    [(score, cluster_id) for cluster_id, score in sentiments.items()]
+                )
+
+    def claim(self, symbol: str, cluster_ids: List[int]) -> List[bool]:
+        """
+        Claim clusters for a symbol, e.g. when storing their story under it.
+
+        Clusters are shared by every symbol (a story is scored once however
+        many symbols it is fetched for), so whether a symbol already has a
+        story is tracked separately.
+
+        Args:
+            symbol: Stock ticker symbol
+            cluster_ids: Clusters to claim
+
+        Returns:
+            Per cluster ID, whether this is its first claim for the symbol
+        """
+        first = []
+        new_claims = []
+        with self._lock:
+            for cluster_id in cluster_ids:
+                is_first = symbol not in self._claims.get(cluster_id, ())
+                if is_first and cluster_id in self._sizes:
+                    self._claims.setdefault(cluster_id, set()).add(symbol)
+                    new_claims.append((cluster_id, symbol))
+                first.append(is_first)
+        if self.db_path and new_claims:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO claims (cluster_id, symbol) VALUES (?, ?)",
+                    new_claims
+                )
+        return first
+
+    def cluster_size(self, cluster_id: int) -> int:
+        """Number of distinct articles seen in a cluster."""
+        return self._sizes.get(cluster_id, 0)
+
+    def _evict(self) -> List[int]:
+        """Drop the oldest clusters beyond max_clusters (lock held)."""
+        excess = len(self._sizes) - self.max_clusters
+        if excess <= 0:
+            return []
+
+        # Cluster IDs increase with creation time and dicts keep insertion order
+        evicted = list(self._sizes)[:excess]
+        for cluster_id in evicted:
+            self._sentiments.pop(cluster_id, None)
+            self._sizes.pop(cluster_id, None)
+            self._claims.pop(cluster_id, None)
+            signatures = self._signatures.pop(cluster_id, [])
+            if not signatures:
+                continue
+            for key in chain.from_iterable(band_keys(np.stack(signatures), self.bands).tolist()):
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.remove(cluster_id)
+                        if not bucket:
+                            del self._buckets[key]
+        gone = set(evicted)
+        self._members = {key: cid for key, cid in self._members.items() if cid not in gone}
+        return evicted
+
+    def _persist(self, new_clusters: List[int], new_members: List, evicted: List[int]):
+        """Write new clusters and members, and delete evicted clusters."""
+        created = time.time()
+        with self._lock:
+            touched = {cluster_id for _, cluster_id, _ in new_members}
+            sizes = [(self._sizes[cid], cid) for cid in touched if cid in self._sizes]
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO clusters (id, size, created_at) VALUES (?, 1, ?)",
+                [(cluster_id, created) for cluster_id in new_clusters]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO members (key, cluster_id, signature) VALUES (?, ?, ?)",
+                new_members
+            )
+            conn.executemany("UPDATE clusters SET size = ? WHERE id = ?", sizes)
+            if evicted:
+                conn.executemany("DELETE FROM clusters WHERE id = ?", [(cid,) for cid in evicted])
+                conn.executemany("DELETE FROM members WHERE cluster_id = ?", [(cid,) for cid in evicted])
+                conn.executemany("DELETE FROM claims WHERE cluster_id = ?", [(cid,) for cid in evicted])
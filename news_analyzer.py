@@ -5,32 +5,120 @@ a rule-based sentiment analyzer optimized for social media and financial text.
 - No GPU needed
 - No large model downloads (~500KB vs ~1GB)
 - Works offline
+
+VADER's lexicon is loaded on the first scored text, not at construction, so
+components that never score (e.g. backtests on simulated sentiment) skip it.
+The article store and near-duplicate index are likewise opened on first use.
 """
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from newsapi import NewsApiClient
-from datetime import datetime, timedelta
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import List, Dict, Optional
 import logging
+import os
+import threading
 from config import Config
+from data_sources import NewsApiSource, NewsSource
+from news_store import NewsStore
+from near_duplicates import NearDuplicateIndex
+from instrumentation import count_cache, stage
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-process VADER instance used by batch scoring workers
+_worker_analyzer = None
+
+
+def _load_vader():
+    """Import VADER and load its lexicon."""
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+def _init_scoring_worker():
+    """Load a VADER analyzer once per worker process."""
+    global _worker_analyzer
+    _worker_analyzer = _load_vader()
+
+
+def _score_texts(analyzer, texts: List[str]) -> List[float]:
+    """Score texts with VADER, returning 0.0 for texts that fail to score."""
+    scores = []
+    for text in texts:
+        try:
+            scores.append(analyzer.polarity_scores(text)['compound'])
+        except Exception as e:
+            logger.error(f"Error analyzing sentiment: {e}")
+            scores.append(0.0)
+    return scores
+
+
+def _score_chunk(texts: List[str]) -> List[float]:
+    """Score a chunk of texts in a worker process."""
+    return _score_texts(_worker_analyzer, texts)
+
 
 class NewsAnalyzer:
     """Analyzes financial news sentiment using VADER NLP."""
 
-    def __init__(self):
-        """Initialize the news analyzer with API client and VADER sentiment model."""
-        self.news_api = NewsApiClient(api_key=Config.NEWS_API_KEY)
+    def __init__(self, news_source: Optional[NewsSource] = None):
+        """
+        Initialize the news analyzer with a news source.
+
+        Args:
+            news_source: Where articles come from (default: NewsAPI)
+        """
+        self.news_source = news_source or NewsApiSource()
 
         # VADER: lightweight rule-based sentiment analyzer (no GPU, no download)
-        logger.info("Loading VADER sentiment analyzer (lightweight, no GPU needed)")
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self._sentiment_analyzer = None  # Lazy initialization
 
         # Cache for sentiment results
         self.cache = {}
 
+        # Article store and near-duplicate index, opened on first use so
+        # that constructing an analyzer creates no files
+        self._news_store = None
+        self._dedup_index = None
+        self._opened = set()
+        self._open_lock = threading.Lock()
+
+    @property
+    def sentiment_analyzer(self):
+        """VADER analyzer, loaded on first use."""
+        if self._sentiment_analyzer is None:
+            logger.info("Loading VADER sentiment analyzer (lightweight, no GPU needed)")
+            self._sentiment_analyzer = _load_vader()
+        return self._sentiment_analyzer
+
+    @property
+    def news_store(self) -> Optional[NewsStore]:
+        """Persistent store of every scored article (None if disabled), opened on first use."""
+        with self._open_lock:
+            if 'news_store' not in self._opened:
+                self._opened.add('news_store')
+                if Config.NEWS_STORE_ENABLED:
+                    try:
+                        self._news_store = NewsStore(Config.NEWS_STORE_PATH)
+                    except Exception as e:
+                        logger.warning(f"News store disabled: {e}")
+        return self._news_store
+
+    @property
+    def dedup_index(self) -> Optional[NearDuplicateIndex]:
+        """Near-duplicate clusters (None if disabled), so syndicated copies are scored once."""
+        with self._open_lock:
+            if 'dedup_index' not in self._opened:
+                self._opened.add('dedup_index')
+                if Config.DEDUP_ENABLED:
+                    try:
+                        self._dedup_index = NearDuplicateIndex(
+                            Config.DEDUP_INDEX_PATH or None,
+                            threshold=Config.DEDUP_THRESHOLD
+                        )
+                    except Exception as e:
+                        logger.warning(f"Near-duplicate filter disabled: {e}")
+        return self._dedup_index
+
     def fetch_news(self, symbol: str, days: int = 1) -> List[Dict]:
         """
         Fetch news articles for a given stock symbol.
@@ -43,20 +131,18 @@ class NewsAnalyzer:
             List of news articles with title, description, and published date
         """
         try:
-            to_date = datetime.now()
+            to_date = self.news_source.now()
             from_date = to_date - timedelta(days=days)
 
             logger.info(f"Fetching news for {symbol} from {from_date.date()} to {to_date.date()}")
-            response = self.news_api.get_everything(
-                q=f"{symbol} OR {self._get_company_name(symbol)}",
-                from_param=from_date.strftime('%Y-%m-%d'),
-                to=to_date.strftime('%Y-%m-%d'),
-                language='en',
-                sort_by='relevancy',
-                page_size=100
-            )
+            with stage('news_fetch'):
+                articles = self.news_source.get_articles(
+                    symbol,
+                    f"{symbol} OR {self._get_company_name(symbol)}",
+                    from_date,
+                    to_date
+                )
 
-            articles = response.get('articles', [])
             logger.info(f"Found {len(articles)} articles for {symbol}")
             return articles
 
@@ -64,6 +150,40 @@ class NewsAnalyzer:
             logger.error(f"Error fetching news: {e}")
             return []
 
+    def fetch_news_many(self, symbols: List[str], days: int = 1) -> Dict[str, List[Dict]]:
+        """
+        Fetch news articles for several symbols at once.
+
+        With NewsAPI, every symbol and page is requested concurrently, so a
+        watchlist refresh takes about as long as its slowest request, or as
+        the rate limit (Config.NEWS_API_RATE) allows for large watchlists.
+
+        Args:
+            symbols: Stock ticker symbols
+            days: Number of days to look back
+
+        Returns:
+            Symbol -> list of articles (empty for symbols that failed)
+        """
+        try:
+            to_date = self.news_source.now()
+            from_date = to_date - timedelta(days=days)
+
+            logger.info(f"Fetching news for {len(symbols)} symbols from {from_date.date()} to {to_date.date()}")
+            with stage('news_fetch'):
+                articles = self.news_source.get_articles_many(
+                    {symbol: f"{symbol} OR {self._get_company_name(symbol)}" for symbol in symbols},
+                    from_date,
+                    to_date
+                )
+
+            logger.info(f"Found {sum(len(found) for found in articles.values())} articles for {len(symbols)} symbols")
+            return {symbol: articles.get(symbol, []) for symbol in symbols}
+
+        except Exception as e:
+            logger.error(f"Error fetching news: {e}")
+            return {symbol: [] for symbol in symbols}
+
     def analyze_sentiment(self, text: str) -> float:
         """
         Analyze sentiment of a text using VADER.
@@ -79,7 +199,9 @@ class NewsAnalyzer:
 
         # Check cache
         if text in self.cache:
+            count_cache('sentiment', hit=True)
             return self.cache[text]
+        count_cache('sentiment', hit=False)
 
         try:
             # VADER returns a compound score in [-1, 1] directly
@@ -93,6 +215,73 @@ class NewsAnalyzer:
             logger.error(f"Error analyzing sentiment: {e}")
             return 0.0
 
+    def analyze_sentiment_batch(
+        self,
+        texts: List[str],
+        workers: Optional[int] = None,
+        chunk_size: int = 2000
+    ) -> List[float]:
+        """
+        Analyze sentiment of many texts, in parallel for large batches.
+
+        Cached and duplicate texts are scored once; the rest are split
+        into chunks scored by a process pool in which every worker has its
+        own VADER instance. Batches smaller than one chunk are scored in
+        this process.
+
+        Args:
+            texts: Texts to analyze
+            workers: Number of worker processes (default: all cores)
+            chunk_size: Number of texts per worker task
+
+        Returns:
+            Sentiment scores between -1 and 1, in the order of texts
+        """
+        results = [0.0] * len(texts)
+
+        # Unscored texts -> positions they appear at
+        pending = {}
+        lookups = 0
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            lookups += 1
+            if text in self.cache:
+                results[i] = self.cache[text]
+            else:
+                pending.setdefault(text, []).append(i)
+
+        # Repeats of a pending text are served by its single score, like cache hits
+        count_cache('sentiment', hit=True, amount=lookups - len(pending))
+        count_cache('sentiment', hit=False, amount=len(pending))
+        if not pending:
+            return results
+
+        unique_texts = list(pending)
+        workers = workers or os.cpu_count() or 1
+
+        with stage('sentiment_scoring'):
+            if workers == 1 or len(unique_texts) <= chunk_size:
+                scores = _score_texts(self.sentiment_analyzer, unique_texts)
+            else:
+                chunks = [
+                    unique_texts[i:i + chunk_size]
+                    for i in range(0, len(unique_texts), chunk_size)
+                ]
+                logger.info(
+                    f"Scoring {len(unique_texts)} texts in {len(chunks)} chunks "
+                    f"on {workers} worker(s)"
+                )
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_scoring_worker) as pool:
+                    scores = [score for chunk in pool.map(_score_chunk, chunks) for score in chunk]
+
+        for text, score in zip(unique_texts, scores):
+            self.cache[text] = score
+            for i in pending[text]:
+                results[i] = score
+
+        return results
+
     def get_aggregated_sentiment(self, symbol: str, days: int = 1) -> Dict:
         """
         Get aggregated sentiment for a symbol over a time period.
@@ -104,47 +293,138 @@ class NewsAnalyzer:
         Returns:
             Dictionary with sentiment score, article count, and details
         """
-        articles = self.fetch_news(symbol, days)
+        return self._aggregate(symbol, self.fetch_news(symbol, days))
+
+    def get_aggregated_sentiment_many(self, symbols: List[str], days: int = 1) -> Dict[str, Dict]:
+        """
+        Get aggregated sentiment for a watchlist, fetching all symbols at once.
+
+        Args:
+            symbols: Stock ticker symbols
+            days: Number of days to analyze
+
+        Returns:
+            Symbol -> dictionary as returned by get_aggregated_sentiment
+        """
+        fetched = self.fetch_news_many(symbols, days)
+        return {symbol: self._aggregate(symbol, articles) for symbol, articles in fetched.items()}
 
+    def _aggregate(self, symbol: str, articles: List[Dict]) -> Dict:
+        """Score, store and average the articles fetched for a symbol."""
         if not articles:
             return {
                 'symbol': symbol,
                 'sentiment': 0.0,
                 'article_count': 0,
+                'story_count': 0,
                 'articles': [],
-                'timestamp': datetime.now()
+                'timestamp': self.news_source.now()
             }
 
-        sentiments = []
-        analyzed_articles = []
-
-        for article in articles:
-            title = article.get('title', '')
-            description = article.get('description', '')
-            text = f"{title}. {description}"
-
-            sentiment = self.analyze_sentiment(text)
-            sentiments.append(sentiment)
-
-            analyzed_articles.append({
-                'title': title,
-                'description': description,
-                'url': article.get('url', ''),
-                'published_at': article.get('publishedAt', ''),
-                'sentiment': sentiment
-            })
+        analyzed_articles = self.score_articles(symbol, articles)
 
+        # Every story counts once, however many outlets syndicated it
+        sentiments = [article['sentiment'] for article in analyzed_articles]
         avg_sentiment = sum(sentiments) / len(sentiments) if sentiments else 0.0
-        logger.info(f"Average sentiment for {symbol}: {avg_sentiment:.3f} ({len(articles)} articles)")
+        logger.info(
+            f"Average sentiment for {symbol}: {avg_sentiment:.3f} "
+            f"({len(analyzed_articles)} stories in {len(articles)} articles)"
+        )
 
         return {
             'symbol': symbol,
             'sentiment': avg_sentiment,
             'article_count': len(articles),
-            'articles': analyzed_articles[:10],  # Top 10 articles
-            'timestamp': datetime.now()
+            'story_count': len(analyzed_articles),
+            'articles': analyzed_articles[:10],  # Top 10 stories
+            'timestamp': self.news_source.now()
         }
 
+    def score_articles(self, symbol: str, articles: List[Dict]) -> List[Dict]:
+        """
+        Score articles, once per near-duplicate cluster, and store new stories.
+
+        Copies of a story (in this fetch or earlier ones) are found with
+        the near-duplicate index; only the first copy of a story not yet
+        scored goes through VADER, and the rest reuse its score. A story is
+        stored under the symbol the first time it is fetched for it, even
+        if it was scored for another symbol before.
+
+        Args:
+            symbol: Stock ticker symbol
+            articles: NewsAPI articles
+
+        Returns:
+            One analyzed article per story, in order of first appearance,
+            with its 'cluster' ID and 'cluster_size' (copies in articles)
+        """
+        texts = [
+            f"{article.get('title', '')}. {article.get('description', '')}"
+            for article in articles
+        ]
+        urls = [article.get('url', '') for article in articles]
+
+        if self.dedup_index is None:
+            assignments = [{'cluster': None, 'new': True, 'sentiment': None} for _ in articles]
+            first = list(range(len(articles)))
+            sizes = [1] * len(articles)
+        else:
+            with stage('dedup'):
+                assignments = self.dedup_index.assign(texts, urls)
+            positions = {}
+            for i, assignment in enumerate(assignments):
+                positions.setdefault(assignment['cluster'], []).append(i)
+            first = [members[0] for members in positions.values()]
+            sizes = [len(members) for members in positions.values()]
+
+        unscored = [i for i in first if assignments[i]['sentiment'] is None]
+        scores = dict(zip(unscored, self.analyze_sentiment_batch([texts[i] for i in unscored])))
+        if self.dedup_index is not None and scores:
+            self.dedup_index.set_sentiment({assignments[i]['cluster']: score for i, score in scores.items()})
+
+        # Stories are stored once per symbol: the first time their cluster
+        # comes up for it, whichever symbol it was scored for
+        if self.dedup_index is None:
+            unstored = [True] * len(first)
+        else:
+            unstored = self.dedup_index.claim(symbol, [assignments[i]['cluster'] for i in first])
+
+        analyzed_articles = []
+        new_articles = []
+        for i, size, store in zip(first, sizes, unstored):
+            article = articles[i]
+            analyzed = {
+                'title': article.get('title', ''),
+                'description': article.get('description', ''),
+                'url': urls[i],
+                'published_at': article.get('publishedAt', ''),
+                'sentiment': scores.get(i, assignments[i]['sentiment']),
+                'cluster': assignments[i]['cluster'],
+                'cluster_size': size
+            }
+            analyzed_articles.append(analyzed)
+            if store:
+                new_articles.append(analyzed)
+
+        if len(analyzed_articles) < len(articles):
+            logger.info(
+                f"Scored {len(unscored)} of {len(articles)} articles for {symbol} "
+                f"({len(analyzed_articles)} distinct stories)"
+            )
+        self._store_articles(symbol, new_articles)
+        return analyzed_articles
+
+    def _store_articles(self, symbol: str, analyzed_articles: List[Dict]):
+        """Persist scored articles; storage problems never block analysis."""
+        if self.news_store is None:
+            return
+
+        try:
+            saved = self.news_store.save_articles(symbol, analyzed_articles)
+            logger.info(f"Stored {saved} scored articles for {symbol}")
+        except Exception as e:
+            logger.error(f"Error storing articles: {e}")
+
     def _get_company_name(self, symbol: str) -> str:
         """Map stock symbols to company names for better news search."""
         symbol_map = {
@@ -0,0 +1,251 @@
+"""Concurrent, paginated NewsAPI fetching over a pooled HTTP session.
+
+Pages and symbols are fetched in parallel on a thread pool sharing one
+keep-alive connection pool, throttled by a token bucket and retried with
+exponential backoff on rate limits (429) and server errors (5xx).
+"""
+import random
+import threading
+import time
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+from instrumentation import external_call
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: rate limited or a transient server problem
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class NewsFetchError(Exception):
+    """Raised when NewsAPI rejects a request or keeps failing after retries."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate requests per second, bursts of capacity."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second (0 disables limiting)
+            capacity: Maximum tokens (default: max(rate, 1))
+        """
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, blocking until they are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class NewsFetcher:
+    """
+    Fetches every page of NewsAPI /v2/everything for many symbols at once.
+
+    All requests share one requests.Session (a keep-alive pool sized to the
+    worker count) and one token bucket, so concurrent callers such as the
+    live trader's polling threads stay within the API rate limit together.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff: float = 0.5,
+        timeout: float = 10.0
+    ):
+        """
+        Initialize the fetcher (defaults come from Config).
+
+        Args:
+            api_key: NewsAPI key
+            base_url: API root, e.g. a local stub server
+            max_workers: Concurrent requests (and pooled connections)
+            max_pages: Pages fetched per query at most
+            rate: Requests per second allowed by the token bucket
+            burst: Requests allowed at once after an idle period
+            max_retries: Retries of a request after a 429/5xx or network error
+            backoff: Base delay in seconds, doubled on every retry
+            timeout: Seconds per HTTP request
+        """
+        self.api_key = api_key or Config.NEWS_API_KEY
+        self.base_url = (base_url or Config.NEWS_API_URL).rstrip('/')
+        self.max_workers = max_workers or Config.NEWS_FETCH_WORKERS
+        self.max_pages = max_pages or Config.NEWS_FETCH_MAX_PAGES
+        self.max_retries = Config.NEWS_FETCH_RETRIES if max_retries is None else max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(
+            Config.NEWS_API_RATE if rate is None else rate,
+            burst or Config.NEWS_API_BURST
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['X-Api-Key'] = self.api_key
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='news-fetch'
+        )
+
+    def close(self):
+        """Release the worker threads and pooled connections."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def fetch_page(self, query: str, start: datetime, end: datetime, page: int = 1) -> Dict:
+        """
+        Fetch one page of results, retrying rate limits and server errors.
+
+        Args:
+            query: Search query
+            start: Earliest publication date
+            end: Latest publication date
+            page: Page number (1-based)
+
+        Returns:
+            NewsAPI response with 'totalResults' and 'articles'
+        """
+        params = {
+            'q': query,
+            'from': start.strftime('%Y-%m-%d'),
+            'to': end.strftime('%Y-%m-%d'),
+            'language': 'en',
+            'sortBy': 'relevancy',
+            'pageSize': 100,
+            'page': page
+        }
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            retry_after = None
+            try:
+                with external_call('newsapi') as call:
+                    response = self.session.get(
+                        f"{self.base_url}/everything", params=params, timeout=self.timeout
+                    )
+                    if response.status_code != 200:
+                        call.outcome = f"http_{response.status_code}"
+            except requests.RequestException as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                error = f"HTTP {response.status_code}: {self._error_message(response)}"
+                if response.status_code not in RETRY_STATUSES:
+                    raise NewsFetchError(error)
+                retry_after = response.headers.get('Retry-After')
+
+            if attempt == self.max_retries:
+                break
+            delay = self.backoff * 2 ** attempt * (1 + random.random())
+            if retry_after is not None and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            logger.warning(f"News request for '{query}' page {page} failed ({error}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+        raise NewsFetchError(f"Giving up on '{query}' page {page} after {self.max_retries + 1} attempts: {error}")
+
+    def fetch_all(
+        self,
+        queries: Dict[str, str],
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch every page of several queries concurrently.
+
+        First pages of all queries are requested at once; as each returns,
+        its remaining pages (from totalResults, up to max_pages) are queued
+        too, so the whole refresh takes about as long as the slowest chain
+        of requests rather than their sum.
+
+        Args:
+            queries: Symbol -> search query
+            start: Earliest publication date
+            end: Latest publication date
+
+        Returns:
+            Symbol -> articles in page order (symbols whose requests failed
+            keep the pages that succeeded)
+        """
+        pages = {symbol: {} for symbol in queries}
+        pending = {
+            self._executor.submit(self.fetch_page, query, start, end, 1): (symbol, 1)
+            for symbol, query in queries.items()
+        }
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                symbol, page = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    # Free plans stop at the first 100 results (HTTP 426)
+                    log = logger.error if page == 1 else logger.warning
+                    log(f"Error fetching news for {symbol} (page {page}): {e}")
+                    continue
+
+                articles = response.get('articles', [])
+                pages[symbol][page] = articles
+                if page == 1 and articles:
+                    total_pages = -(-response.get('totalResults', 0) // 100)
+                    for next_page in range(2, min(total_pages, self.max_pages) + 1):
+                        future = self._executor.submit(
+                            self.fetch_page, queries[symbol], start, end, next_page
+                        )
+                        pending[future] = (symbol, next_page)
+
+        return {
+            symbol: [article for page in sorted(by_page) for article in by_page[page]]
+            for symbol, by_page in pages.items()
+        }
+
+    def fetch(self, symbol: str, query: str, start: datetime, end: datetime) -> List[Dict]:
+        """Fetch every page of one query (see fetch_all)."""
+        return self.fetch_all({symbol: query}, start, end)[symbol]
+
+    def _error_message(self, response) -> str:
+        """Extract NewsAPI's error message from a failed response."""
+        try:
+            return response.json().get('message', response.reason)
+        except ValueError:
+            return response.reason
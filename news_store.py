@@ -0,0 +1,227 @@
+"""Persistent, time-indexed store of scored news articles (SQLite)."""
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from typing import Dict, List, Union
+import numpy as np
+import pandas as pd
+from bar_alignment import asof_bar_positions, session_close_times, to_utc_ns
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    sentiment REAL NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (url, symbol)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_symbol_published
+    ON articles (symbol, published_at);
+"""
+
+
+def normalize_timestamp(value: Union[str, datetime, date]) -> str:
+    """
+    Normalize a timestamp to the sortable UTC form 'YYYY-MM-DDTHH:MM:SSZ'.
+
+    Args:
+        value: NewsAPI 'publishedAt' string, datetime or date
+
+    Returns:
+        ISO 8601 UTC timestamp string
+    """
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return timestamp.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class NewsStore:
+    """Stores every scored article so backtests can replay real sentiment."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open a transaction on a fresh connection (one per operation keeps the store thread-safe)."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save_articles(self, symbol: str, articles: List[Dict]) -> int:
+        """
+        Insert or update scored articles.
+
+        Args:
+            symbol: Stock ticker symbol the articles were fetched for
+            articles: Articles with 'url', 'published_at', 'title',
+                'description' and 'sentiment' keys
+
+        Returns:
+            Number of articles written
+        """
+        fetched_at = normalize_timestamp(datetime.now(timezone.utc))
+        rows = [
+            (
+                article['url'],
+                symbol,
+                normalize_timestamp(article['published_at']),
+                article.get('title', ''),
+                article.get('description', ''),
+                float(article['sentiment']),
+                fetched_at
+            )
+            for article in articles
+            if article.get('url') and article.get('published_at')
+        ]
+        if not rows:
+            return 0
+
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO articles
+                    (url, symbol, published_at, title, description, sentiment, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url, symbol) DO UPDATE SET
+                    published_at = excluded.published_at,
+                    title = excluded.title,
+                    description = excluded.description,
+                    sentiment = excluded.sentiment,
+                    fetched_at = excluded.fetched_at
+                """,
+                rows
+            )
+        return len(rows)
+
+    def get_articles(self, symbol: str, start, end) -> pd.DataFrame:
+        """
+        Get stored articles for a symbol published in [start, end].
+
+        Args:
+            symbol: Stock ticker symbol
+            start: Range start (date, datetime or ISO string)
+            end: Range end (date, datetime or ISO string); a date covers the whole day
+
+        Returns:
+            DataFrame of articles ordered by publication time
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                """
+                SELECT url, published_at, title, description, sentiment
+                FROM articles
+                WHERE symbol = ? AND published_at >= ? AND published_at <= ?
+                ORDER BY published_at
+                """,
+                conn,
+                params=(symbol, *self._range(start, end))
+            )
+
+    def get_sentiment_events(self, symbol: str, start, end):
+        """
+        Get the publication time and sentiment of every stored article.
+
+        Only the two columns needed for event-time alignment are read.
+
+        Args:
+            symbol: Stock ticker symbol
+            start: Range start (date, datetime or ISO string)
+            end: Range end (date, datetime or ISO string); a date covers the whole day
+
+        Returns:
+            Tuple of (UTC epoch nanoseconds, sentiment) arrays ordered by
+            publication time
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT published_at, sentiment
+                FROM articles
+                WHERE symbol = ? AND published_at >= ? AND published_at <= ?
+                ORDER BY published_at
+                """,
+                (symbol, *self._range(start, end))
+            ).fetchall()
+
+        if not rows:
+            return np.array([], dtype=np.int64), np.array([], dtype=float)
+
+        published, sentiment = zip(*rows)
+        times = pd.to_datetime(pd.Series(published), format='%Y-%m-%dT%H:%M:%SZ', utc=True)
+        return times.to_numpy(dtype='datetime64[ns]').astype(np.int64), np.array(sentiment, dtype=float)
+
+    def get_daily_sentiment(
+        self,
+        symbol: str,
+        days,
+        close: str = '16:00',
+        timezone: str = 'America/New_York'
+    ) -> pd.DataFrame:
+        """
+        Get per-session sentiment aggregates for a symbol with one range query.
+
+        A trading day collects the articles published after the previous
+        session's close, up to its own close: news from after the close
+        only reaches the next trading day, as it would live. The first day
+        starts at the close of the business day before it.
+
+        Args:
+            symbol: Stock ticker symbol
+            days: Trading dates (ascending, in the exchange's timezone)
+            close: Closing time of day on the exchange ('HH:MM')
+            timezone: Exchange timezone
+
+        Returns:
+            DataFrame indexed by date with 'sentiment' (mean) and
+            'article_count' columns; days without articles are absent
+        """
+        days = pd.DatetimeIndex(pd.to_datetime(days)).normalize()
+        if len(days) == 0:
+            return pd.DataFrame({'sentiment': [], 'article_count': []})
+
+        closes = session_close_times(days, close, timezone)
+        previous_close = session_close_times([days[0] - pd.offsets.BDay(1)], close, timezone)[0]
+        published, sentiment = self.get_sentiment_events(symbol, previous_close, closes[-1])
+        after_previous = published > previous_close.value
+        published, sentiment = published[after_previous], sentiment[after_previous]
+
+        positions = asof_bar_positions(to_utc_ns(closes), published)
+        counts = np.bincount(positions, minlength=len(days))[:len(days)]
+        sums = np.bincount(positions, weights=sentiment, minlength=len(days))[:len(days)]
+        has_news = counts > 0
+        return pd.DataFrame(
+            {'sentiment': sums[has_news] / counts[has_news], 'article_count': counts[has_news]},
+            index=days[has_news].date
+        )
+
+    def _range(self, start, end):
+        """Convert range bounds to normalized timestamp strings."""
+        end_text = normalize_timestamp(end)
+        if isinstance(end, date) and not isinstance(end, datetime):
+            end_text = end_text[:10] + 'T23:59:59Z'
+        return normalize_timestamp(start), end_text
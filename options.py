@@ -0,0 +1,19 @@
+"""Option values shared by the CLI and the engines.
+
+Kept free of heavy imports (NumPy, pandas, yfinance, ...) so that building
+the command line, e.g. `python main.py --help`, stays fast.
+"""
+
+# Bar intervals supported end to end (yfinance names)
+INTRADAY_INTERVALS = ('1m', '5m', '15m', '30m', '1h')
+SUPPORTED_INTERVALS = INTRADAY_INTERVALS + ('1d',)
+
+# Sentiment inputs of the backtest array engine
+SENTIMENT_SOURCES = ('simulated', 'stored', 'decayed')
+
+# Live sentiment signals: window average or time-decayed
+SENTIMENT_SIGNALS = ('mean', 'decay')
+
+# Walk-forward training windows: a fixed-length window sliding forward, or
+# every bar since the start of the data
+WINDOW_MODES = ('rolling', 'anchored')
@@ -0,0 +1,247 @@
+"""Multi-core parameter sweep over TradingStrategy thresholds."""
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from bar_alignment import periods_per_year
+from log_pipeline import sample_loggers
+from backtester import Backtester
+from performance_metrics import MetricsAccumulator
+from trading_strategy import TradingStrategy
+
+logger = logging.getLogger(__name__)
+
+# Strategy parameters that can be swept
+SWEEP_PARAMS = ('buy_threshold', 'sell_threshold', 'position_size')
+
+# Worker-side state, populated once per process by _init_worker
+_worker_arrays = {}
+_worker_segments = []
+_worker_timestamps = None
+_worker_backtester = None
+
+
+def expand_grid(param_grid: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    """
+    Expand a parameter grid into a list of parameter combinations.
+
+    Args:
+        param_grid: Mapping of strategy parameter name to candidate values
+
+    Returns:
+        List of {parameter: value} dictionaries
+    """
+    unknown = set(param_grid) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+
+def _share_array(array: np.ndarray):
+    """Copy an array into a new shared memory segment."""
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+    view[:] = array
+    return segment, (segment.name, array.shape, array.dtype.str)
+
+
+def _timezone(timestamps: pd.DatetimeIndex) -> Optional[str]:
+    """Time zone of bar times (shared memory only holds their UTC values)."""
+    return str(timestamps.tz) if timestamps.tz is not None else None
+
+
+def _init_worker(specs: Dict[str, tuple], timezone: Optional[str] = None):
+    """
+    Attach a worker process to the shared price/sentiment arrays.
+
+    Args:
+        specs: Array name -> (segment name, shape, dtype)
+        timezone: Time zone the bar times are restored to (None: naive)
+    """
+    global _worker_backtester, _worker_timestamps
+
+    # Kept for the worker's lifetime; the pool discards the process
+    sample_loggers()
+
+    for key, (name, shape, dtype) in specs.items():
+        segment = shared_memory.SharedMemory(name=name)
+        _worker_segments.append(segment)
+        _worker_arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+    _worker_timestamps = pd.DatetimeIndex(_worker_arrays['timestamps'])
+    if timezone is not None:
+        _worker_timestamps = _worker_timestamps.tz_localize('UTC').tz_convert(timezone)
+    _worker_backtester = Backtester()
+
+
+def _evaluate(
+    backtester: Backtester,
+    timestamps,
+    prices: np.ndarray,
+    sentiments: np.ndarray,
+    combos: List[Dict[str, float]],
+    initial_capital: float,
+    bars_per_year: int = 252
+) -> List[Dict]:
+    """Backtest parameter combinations and collect their metrics."""
+    rows = []
+    for params in combos:
+        strategy = TradingStrategy(initial_capital=initial_capital, **params)
+        accumulator = MetricsAccumulator(initial_capital, bars_per_year)
+        results_df = backtester._simulate(
+            strategy, timestamps, prices, sentiments, initial_capital, accumulator
+        )
+        metrics = backtester._calculate_metrics(results_df, strategy, initial_capital, accumulator)
+        rows.append({**params, **metrics})
+    return rows
+
+
+def _run_chunk(
+    combos: List[Dict[str, float]],
+    initial_capital: float,
+    bars_per_year: int = 252
+) -> List[Dict]:
+    """Backtest a chunk of parameter combinations against the shared arrays."""
+    return _evaluate(
+        _worker_backtester,
+        _worker_timestamps,
+        _worker_arrays['prices'],
+        _worker_arrays['sentiments'],
+        combos,
+        initial_capital,
+        bars_per_year
+    )
+
+
+class ParameterSweep:
+    """Runs a strategy parameter grid across a process pool."""
+
+    def __init__(self, backtester: Optional[Backtester] = None):
+        """
+        Initialize the sweep.
+
+        Args:
+            backtester: Backtester used to load price and sentiment data
+        """
+        self.backtester = backtester or Backtester()
+
+    def run(
+        self,
+        symbol: str,
+        param_grid: Dict[str, List[float]],
+        days: int = 90,
+        initial_capital: float = 10000,
+        workers: Optional[int] = None,
+        rank_by: str = 'strategy_sharpe',
+        sentiment_source: str = 'simulated',
+        interval: str = '1d'
+    ) -> pd.DataFrame:
+        """
+        Backtest every combination in a parameter grid.
+
+        Price and sentiment arrays are loaded once and placed in shared
+        memory; worker processes attach to them instead of receiving a
+        pickled copy per task.
+
+        Args:
+            symbol: Stock ticker symbol
+            param_grid: Mapping of strategy parameter name to candidate values
+            days: Number of days to backtest
+            initial_capital: Starting capital
+            workers: Number of worker processes (default: all cores)
+            rank_by: Metric used to rank the combinations (descending)
+            sentiment_source: 'simulated', 'stored' or 'decayed' (see
+                Backtester.run_backtest)
+            interval: Bar interval ('1m', '5m', '15m', '30m', '1h' or '1d')
+
+        Returns:
+            DataFrame with one row per combination (parameters and
+            metrics), best first
+        """
+        combos = expand_grid(param_grid)
+        workers = workers or os.cpu_count() or 1
+
+        arrays = self.backtester.load_arrays(
+            symbol, days=days, sentiment_source=sentiment_source, interval=interval
+        )
+        if arrays is None or not combos:
+            return pd.DataFrame()
+
+        timestamps, prices, sentiments = arrays
+        bars_per_year = periods_per_year(interval)
+
+        logger.info(
+            f"Sweeping {len(combos)} parameter combinations for {symbol} "
+            f"on {workers} worker(s)"
+        )
+
+        # A few chunks per worker keeps the pool balanced without paying
+        # task overhead for every single combination
+        chunk_size = max(1, -(-len(combos) // (workers * 4)))
+        chunks = [combos[i:i + chunk_size] for i in range(0, len(combos), chunk_size)]
+
+        if workers == 1:
+            with sample_loggers():
+                chunk_results = [
+                    _evaluate(
+                        self.backtester, timestamps, prices, sentiments, chunk,
+                        initial_capital, bars_per_year
+                    )
+                    for chunk in chunks
+                ]
+        else:
+            shared = {
+                'timestamps': np.asarray(timestamps.values),
+                'prices': np.ascontiguousarray(prices, dtype=float),
+                'sentiments': np.ascontiguousarray(sentiments, dtype=float)
+            }
+            chunk_results = self._run_pool(
+                shared, chunks, initial_capital, workers, bars_per_year, _timezone(timestamps)
+            )
+
+        table = pd.DataFrame([row for rows in chunk_results for row in rows])
+        if rank_by in table.columns:
+            table = table.sort_values(rank_by, ascending=False, kind='stable')
+        return table.reset_index(drop=True)
+
+    def _run_pool(
+        self,
+        arrays: Dict[str, np.ndarray],
+        chunks: List[List[Dict[str, float]]],
+        initial_capital: float,
+        workers: int,
+        bars_per_year: int = 252,
+        timezone: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """Evaluate chunks on a process pool sharing the arrays via shared memory."""
+        segments = []
+        try:
+            specs = {}
+            for key, array in arrays.items():
+                segment, spec = _share_array(array)
+                segments.append(segment)
+                specs[key] = spec
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(specs, timezone)
+            ) as pool:
+                return list(pool.map(
+                    _run_chunk,
+                    chunks,
+                    itertools.repeat(initial_capital),
+                    itertools.repeat(bars_per_year)
+                ))
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
@@ -0,0 +1,164 @@
+"""One-pass performance metrics for backtests and live trading."""
+import math
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+
+class RunningStats:
+    """Welford's online mean and sample standard deviation."""
+
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        """Add one observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (NaN with fewer than two observations)."""
+        if self.count < 2:
+            return float('nan')
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def sharpe(self, periods_per_year: int) -> float:
+        """Annualized Sharpe ratio (0% risk-free rate), 0 when undefined."""
+        std = self.std
+        return self.mean / std * math.sqrt(periods_per_year) if std > 0 else 0
+
+
+class MetricsAccumulator:
+    """
+    Streaming version of the backtest performance metrics.
+
+    Feed it one bar at a time (update) and every executed trade
+    (add_trade); metrics are available at any point in O(1) (result),
+    which lets live and progress views report them mid-run.
+
+    - Sharpe ratios: Welford mean/std of per-bar returns
+    - Max drawdown: running peak of the portfolio value
+    - Win rate: SELLs are paired with open BUY lots of the same symbol in
+      FIFO order; a SELL wins when its price beats the average cost of the
+      shares it closes
+    """
+
+    def __init__(self, initial_capital: float, periods_per_year: int = 252):
+        """
+        Initialize the accumulator.
+
+        Args:
+            initial_capital: Starting capital
+            periods_per_year: Bars per year used to annualize Sharpe ratios
+        """
+        self.initial_capital = initial_capital
+        self.periods_per_year = periods_per_year
+
+        self.bars = 0
+        self.strategy_stats = RunningStats()
+        self.buy_hold_stats = RunningStats()
+        self.last_portfolio_value = None
+        self.last_buy_hold_value = None
+        self.peak_value = None
+        self.max_drawdown = 0.0
+
+        self.total_trades = 0
+        self.winning_trades = 0
+        # symbol -> FIFO queue of open [shares, price] lots
+        self.open_lots = defaultdict(deque)
+
+    def update(self, portfolio_value: float, buy_hold_value: float):
+        """
+        Record the portfolio and Buy & Hold values of one bar.
+
+        Args:
+            portfolio_value: Strategy portfolio value at this bar
+            buy_hold_value: Buy & Hold value at this bar
+        """
+        if self.bars:
+            if self.last_portfolio_value:
+                self.strategy_stats.add(portfolio_value / self.last_portfolio_value - 1)
+            if self.last_buy_hold_value:
+                self.buy_hold_stats.add(buy_hold_value / self.last_buy_hold_value - 1)
+
+        self.bars += 1
+        self.last_portfolio_value = portfolio_value
+        self.last_buy_hold_value = buy_hold_value
+
+        if self.peak_value is None or portfolio_value > self.peak_value:
+            self.peak_value = portfolio_value
+        if self.peak_value:
+            drawdown = (portfolio_value - self.peak_value) / self.peak_value
+            if drawdown < self.max_drawdown:
+                self.max_drawdown = drawdown
+
+    def add_trade(self, trade: Optional[Dict]):
+        """
+        Record an executed trade (None is ignored).
+
+        Args:
+            trade: Trade dictionary with 'action', 'price' and 'shares'
+                (and 'symbol' for portfolio trades)
+        """
+        if trade is None:
+            return
+
+        self.total_trades += 1
+        lots = self.open_lots[trade.get('symbol')]
+
+        if trade['action'] == 'BUY':
+            lots.append([trade['shares'], trade['price']])
+            return
+
+        # SELL: close open lots first-in, first-out
+        remaining = trade['shares']
+        closed_shares = 0.0
+        cost = 0.0
+        while lots and remaining > 1e-9:
+            lot = lots[0]
+            shares = min(lot[0], remaining)
+            closed_shares += shares
+            cost += shares * lot[1]
+            remaining -= shares
+            lot[0] -= shares
+            if lot[0] <= 1e-9:
+                lots.popleft()
+
+        if closed_shares > 0 and trade['price'] > cost / closed_shares:
+            self.winning_trades += 1
+
+    def result(self) -> Dict:
+        """
+        Get the metrics accumulated so far.
+
+        Returns:
+            Dictionary of performance metrics (empty before the first bar)
+        """
+        if not self.bars:
+            return {}
+
+        final_portfolio = self.last_portfolio_value
+        final_buy_hold = self.last_buy_hold_value
+
+        strategy_return = (final_portfolio - self.initial_capital) / self.initial_capital
+        buy_hold_return = (final_buy_hold - self.initial_capital) / self.initial_capital
+
+        return {
+            'strategy_return': strategy_return,
+            'buy_hold_return': buy_hold_return,
+            'outperformance': strategy_return - buy_hold_return,
+            'strategy_sharpe': self.strategy_stats.sharpe(self.periods_per_year),
+            'buy_hold_sharpe': self.buy_hold_stats.sharpe(self.periods_per_year),
+            'max_drawdown': self.max_drawdown,
+            'total_trades': self.total_trades,
+            'win_rate': self.winning_trades / self.total_trades if self.total_trades else 0,
+            'final_portfolio_value': final_portfolio,
+            'final_buy_hold_value': final_buy_hold
+        }
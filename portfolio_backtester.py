@@ -0,0 +1,235 @@
+"""Multi-symbol portfolio backtesting with a shared cash pool."""
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+import logging
+from backtester import Backtester
+from trading_strategy import SIGNALS, PortfolioStrategy
+from synthetic_sentiment import generate_sentiment
+from performance_metrics import MetricsAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+class PortfolioBacktester:
+    """Backtests the sentiment strategy over several symbols at once."""
+
+    def __init__(self, backtester: Optional[Backtester] = None):
+        """
+        Initialize portfolio backtester.
+
+        Args:
+            backtester: Single-symbol backtester providing sentiment and metrics
+        """
+        self.backtester = backtester or Backtester()
+        self.market_data = self.backtester.market_data
+
+    def run_backtest(
+        self,
+        symbols: List[str],
+        days: int = 90,
+        initial_capital: float = 10000,
+        weights: Optional[Dict[str, float]] = None,
+        **strategy_params
+    ) -> Dict:
+        """
+        Run a portfolio backtest over several symbols.
+
+        All price histories are fetched concurrently and aligned on one
+        date index. Each day, sell signals are executed first, then the
+        day's buying budget is split between symbols with a buy signal
+        according to their allocation weights.
+
+        Args:
+            symbols: Stock ticker symbols
+            days: Number of days to backtest
+            initial_capital: Starting capital shared by all symbols
+            weights: Relative allocation weight per symbol (default: equal)
+            **strategy_params: position_size, buy_threshold, sell_threshold
+
+        Returns:
+            Dictionary with backtest results
+        """
+        logger.info(f"Starting portfolio backtest for {', '.join(symbols)} over {days} days")
+
+        price_data = self.market_data.get_price_histories(symbols, days=days)
+        missing = [symbol for symbol, df in price_data.items() if df.empty]
+        if missing:
+            logger.warning(f"No price data for {', '.join(missing)}; excluding from portfolio")
+        symbols = [symbol for symbol in symbols if symbol not in missing]
+
+        if not symbols:
+            logger.error("No price data available")
+            return self._empty_result()
+
+        prices = self._align_prices({symbol: price_data[symbol] for symbol in symbols})
+        if prices.empty:
+            logger.error("Price histories do not overlap")
+            return self._empty_result()
+
+        sentiments = self._align_sentiments(prices)
+
+        strategy = PortfolioStrategy(
+            symbols,
+            initial_capital=initial_capital,
+            weights=weights,
+            **strategy_params
+        )
+        accumulator = MetricsAccumulator(initial_capital)
+        results_df, signals_df = self._simulate(
+            strategy, prices, sentiments, initial_capital, accumulator
+        )
+
+        metrics = self.backtester._calculate_metrics(
+            results_df, strategy, initial_capital, accumulator
+        )
+
+        logger.info(f"Portfolio backtest complete. Strategy return: {metrics['strategy_return']:.2%}, "
+                   f"Buy & Hold return: {metrics['buy_hold_return']:.2%}")
+
+        return {
+            'symbols': symbols,
+            'results': results_df,
+            'prices': prices,
+            'sentiments': sentiments,
+            'signals': signals_df,
+            'metrics': metrics,
+            'trades': strategy.trades,
+            'initial_capital': initial_capital
+        }
+
+    def _align_prices(self, price_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Align closing prices of all symbols on a single date index.
+
+        Uses the first bar of each date, keeps the range every symbol has
+        traded in and forward-fills days a market was closed (e.g.
+        weekends for stocks held next to crypto), including the first day
+        of that range.
+
+        Args:
+            price_data: Dictionary mapping symbol to OHLCV DataFrame
+
+        Returns:
+            DataFrame of close prices (dates x symbols)
+        """
+        closes = {}
+        for symbol, df in price_data.items():
+            _, timestamps, close = self.backtester._prepare_arrays(df.copy())
+            closes[symbol] = pd.Series(close, index=timestamps)
+
+        prices = pd.concat(closes, axis=1, sort=True)
+        start = max(series.index[0] for series in closes.values())
+        end = min(series.index[-1] for series in closes.values())
+        return prices.ffill().loc[start:end]
+
+    def _align_sentiments(self, prices: pd.DataFrame) -> pd.DataFrame:
+        """Build the sentiment series of every symbol on the aligned index."""
+        dates = [timestamp.date() for timestamp in prices.index]
+
+        return pd.DataFrame({
+            symbol: generate_sentiment(symbol, dates)
+            for symbol in prices.columns
+        }, index=prices.index)
+
+    def _simulate(
+        self,
+        strategy: PortfolioStrategy,
+        prices: pd.DataFrame,
+        sentiments: pd.DataFrame,
+        initial_capital: float,
+        accumulator: Optional[MetricsAccumulator] = None
+    ):
+        """
+        Run the shared-cash state machine over the aligned frames.
+
+        Args:
+            strategy: Portfolio strategy holding the shared cash pool
+            prices: Aligned close prices (dates x symbols)
+            sentiments: Aligned sentiment scores (dates x symbols)
+            initial_capital: Starting capital (for Buy & Hold)
+            accumulator: Optional metrics accumulator updated at every bar
+
+        Returns:
+            Tuple of (portfolio results DataFrame, signals DataFrame)
+        """
+        symbols = list(prices.columns)
+        price_matrix = prices.to_numpy(dtype=float)
+        sentiment_matrix = sentiments.to_numpy(dtype=float)
+        timestamps = prices.index
+
+        # Buy & Hold: split capital by allocation weight on the first day
+        total_weight = sum(strategy.weights.values())
+        buy_hold_shares = np.array([
+            initial_capital * strategy.weights[symbol] / total_weight / price_matrix[0, j]
+            for j, symbol in enumerate(symbols)
+        ])
+        buy_hold_values = (price_matrix @ buy_hold_shares).tolist()
+
+        n = len(timestamps)
+        portfolio_values = [0.0] * n
+        cash_values = [0.0] * n
+        positions_values = [0.0] * n
+        signals = []
+
+        for i in range(n):
+            timestamp = timestamps[i]
+            trades_before = len(strategy.trades)
+            day_prices = dict(zip(symbols, price_matrix[i].tolist()))
+            day_sentiments = dict(zip(symbols, sentiment_matrix[i].tolist()))
+
+            day_signals = {
+                symbol: strategy.generate_signal(symbol, day_sentiments[symbol])
+                for symbol in symbols
+            }
+
+            # Sells first so their proceeds can fund today's buys
+            for symbol in symbols:
+                if day_signals[symbol] == 'SELL':
+                    strategy.execute_trade(
+                        symbol, 'SELL', day_prices[symbol], day_sentiments[symbol], timestamp
+                    )
+
+            buy_symbols = [symbol for symbol in symbols if day_signals[symbol] == 'BUY']
+            for symbol, amount in strategy.allocate(buy_symbols).items():
+                strategy.execute_trade(
+                    symbol, 'BUY', day_prices[symbol], day_sentiments[symbol], timestamp,
+                    amount=amount
+                )
+
+            state = strategy.get_portfolio_state(day_prices)
+            portfolio_values[i] = state['portfolio_value']
+            cash_values[i] = state['cash']
+            positions_values[i] = state['positions_value']
+            signals.append(day_signals)
+
+            if accumulator is not None:
+                for trade in strategy.trades[trades_before:]:
+                    accumulator.add_trade(trade)
+                accumulator.update(state['portfolio_value'], buy_hold_values[i])
+
+        results_df = pd.DataFrame({
+            'date': timestamps,
+            'portfolio_value': portfolio_values,
+            'buy_hold_value': buy_hold_values,
+            'cash': cash_values,
+            'positions_value': positions_values
+        })
+        signals_df = pd.DataFrame(signals, index=timestamps, columns=symbols).astype(
+            pd.CategoricalDtype(SIGNALS)
+        )
+
+        return results_df, signals_df
+
+    def _empty_result(self) -> Dict:
+        """Return empty result structure."""
+        return {
+            'symbols': [],
+            'results': pd.DataFrame(),
+            'prices': pd.DataFrame(),
+            'sentiments': pd.DataFrame(),
+            'signals': pd.DataFrame(),
+            'metrics': {},
+            'trades': [],
+            'initial_capital': 0
+        }
@@ -0,0 +1,129 @@
+"""On-disk columnar cache for OHLCV price history."""
+import os
+import re
+import json
+import time
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class PriceCache:
+    """
+    Stores one Parquet file per (symbol, interval) holding the widest range fetched.
+
+    Each Parquet file has a small JSON sidecar recording the earliest start
+    date requested so far (so market holidays at the head of the range are
+    not mistaken for missing data) and when the data source was last checked.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the price cache.
+
+        Args:
+            cache_dir: Directory holding the Parquet files
+
+        Raises:
+            ImportError: If no Parquet engine (pyarrow) is installed
+        """
+        pd.io.parquet.get_engine('auto')
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, symbol: str, interval: str) -> str:
+        """Get the cache file path for a symbol and interval."""
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.cache_dir, f"{safe_symbol}_{interval}.parquet")
+
+    def load(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        Load cached bars.
+
+        Args:
+            symbol: Stock ticker symbol
+            interval: Data interval
+
+        Returns:
+            Cached DataFrame, or None if nothing is cached
+        """
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable price cache {path}: {e}")
+            return None
+
+    def load_meta(self, symbol: str, interval: str) -> Dict:
+        """
+        Load the cache metadata.
+
+        Returns:
+            Dictionary with 'start' (datetime) and 'fetched_at' (epoch
+            seconds), or an empty dictionary if nothing is cached
+        """
+        try:
+            with open(self._meta_path(symbol, interval)) as f:
+                meta = json.load(f)
+            return {
+                'start': datetime.fromisoformat(meta['start']),
+                'fetched_at': float(meta['fetched_at'])
+            }
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def store(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame,
+        start: datetime,
+        fetched_at: Optional[float] = None
+    ):
+        """
+        Replace the cached bars for a symbol and interval.
+
+        Files are written next to their target and renamed into place so
+        concurrent readers never see a partial file.
+
+        Args:
+            symbol: Stock ticker symbol
+            interval: Data interval
+            df: Bars to store
+            start: Earliest date the bars were requested from
+            fetched_at: When the latest bars were fetched (default: now)
+        """
+        path = self.path(symbol, interval)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        self.update_meta(symbol, interval, start, fetched_at)
+
+    def update_meta(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        fetched_at: Optional[float] = None
+    ):
+        """Update the metadata without rewriting the bars."""
+        self._write_meta(symbol, interval, start, time.time() if fetched_at is None else fetched_at)
+
+    def _meta_path(self, symbol: str, interval: str) -> str:
+        """Get the metadata sidecar path for a symbol and interval."""
+        return self.path(symbol, interval)[:-len('.parquet')] + '.json'
+
+    def _write_meta(self, symbol: str, interval: str, start: datetime, fetched_at: float):
+        """Atomically write the metadata sidecar."""
+        path = self._meta_path(symbol, interval)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'start': start.isoformat(), 'fetched_at': fetched_at}, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,380 @@
+"""Replay of recorded price bars and news articles.
+
+Recordings live in a directory:
+
+    <root>/prices/<SYMBOL>_<interval>.parquet (or .csv)  bars, time column first
+    <root>/news/<SYMBOL>.jsonl                            NewsAPI-style articles
+
+ReplaySource merges them into one time-ordered event stream and also
+implements the PriceSource and NewsSource interfaces, answering every
+query as of its replay clock, so MarketData, NewsAnalyzer, the backtester
+and the live loop run against recorded data unchanged.
+"""
+import asyncio
+import heapq
+import json
+import os
+import time
+import logging
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+import numpy as np
+import pandas as pd
+from data_sources import NewsSource, PriceSource
+
+logger = logging.getLogger(__name__)
+
+BAR = 'bar'
+ARTICLE = 'article'
+
+
+class ReplayEvent(NamedTuple):
+    """One recorded bar or article."""
+
+    time: int  # Nanoseconds since the epoch (UTC)
+    kind: str  # BAR or ARTICLE
+    symbol: str
+    data: Any  # Bar row (namedtuple with lowercase OHLCV fields) or article dict
+
+    @property
+    def timestamp(self) -> pd.Timestamp:
+        """Event time as a UTC timestamp."""
+        return pd.Timestamp(self.time, tz='UTC')
+
+
+def _to_ns(value) -> int:
+    """Convert a datetime-like value to UTC epoch nanoseconds (naive = UTC)."""
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize('UTC')
+    return stamp.value
+
+
+def _times_ns(values) -> np.ndarray:
+    """Convert a column of datetime-like values to UTC epoch nanoseconds."""
+    times = pd.to_datetime(pd.Series(values), utc=True, format='mixed')
+    return times.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+
+def record_bars(root: str, symbol: str, df: pd.DataFrame, interval: str = '1d') -> str:
+    """
+    Save bars (e.g. from MarketData.get_price_history) for replay.
+
+    Args:
+        root: Recording directory
+        symbol: Stock ticker symbol
+        df: Bars with the bar time as first column
+        interval: Bar interval
+
+    Returns:
+        Path of the written file
+    """
+    directory = os.path.join(root, 'prices')
+    os.makedirs(directory, exist_ok=True)
+    try:
+        path = os.path.join(directory, f"{symbol}_{interval}.parquet")
+        df.to_parquet(path, index=False)
+    except ImportError:
+        path = os.path.join(directory, f"{symbol}_{interval}.csv")
+        df.to_csv(path, index=False)
+    return path
+
+
+def record_articles(root: str, symbol: str, articles: Iterable[Dict]) -> str:
+    """
+    Append articles (NewsAPI format, optionally with 'sentiment') for replay.
+
+    Args:
+        root: Recording directory
+        symbol: Stock ticker symbol
+        articles: Articles with at least 'publishedAt'
+
+    Returns:
+        Path of the written file
+    """
+    directory = os.path.join(root, 'news')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{symbol}.jsonl")
+    with open(path, 'a', encoding='utf-8') as f:
+        for article in articles:
+            f.write(json.dumps(article, default=str) + '\n')
+    return path
+
+
+class ReplaySource(PriceSource, NewsSource):
+    """
+    Recorded bars and articles served as of a replay clock.
+
+    The clock starts at the end of the recording (so backtests see all of
+    it) and follows the events while play() or aplay() runs.
+    """
+
+    def __init__(self, root: str, interval: str = '1d'):
+        """
+        Initialize the source; files are loaded on first use.
+
+        Args:
+            root: Recording directory
+            interval: Bar interval to replay
+        """
+        self.root = root
+        self.interval = interval
+        self.clock_ns = None  # None: end of the recording
+        self._bars = {}  # symbol -> (times_ns, DataFrame)
+        self._articles = {}  # symbol -> (times_ns, list of articles)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols with recorded bars or articles."""
+        symbols = set()
+        suffix = f"_{self.interval}"
+        prices_dir = os.path.join(self.root, 'prices')
+        if os.path.isdir(prices_dir):
+            for name in os.listdir(prices_dir):
+                stem = os.path.splitext(name)[0]
+                if stem.endswith(suffix):
+                    symbols.add(stem[:-len(suffix)])
+        news_dir = os.path.join(self.root, 'news')
+        if os.path.isdir(news_dir):
+            symbols.update(
+                os.path.splitext(name)[0] for name in os.listdir(news_dir)
+                if name.endswith('.jsonl')
+            )
+        return sorted(symbols)
+
+    def _load_bars(self, symbol: str):
+        """Load (and memoize) the recorded bars of a symbol, sorted by time."""
+        if symbol not in self._bars:
+            base = os.path.join(self.root, 'prices', f"{symbol}_{self.interval}")
+            if os.path.exists(base + '.parquet'):
+                df = pd.read_parquet(base + '.parquet')
+            elif os.path.exists(base + '.csv'):
+                df = pd.read_csv(base + '.csv')
+                df[df.columns[0]] = pd.to_datetime(df[df.columns[0]], utc=True)
+            else:
+                df = pd.DataFrame()
+
+            if df.empty:
+                self._bars[symbol] = (np.array([], dtype=np.int64), df)
+            else:
+                df.columns = [str(col).lower() for col in df.columns]
+                times = _times_ns(df[df.columns[0]])
+                order = np.argsort(times, kind='stable')
+                self._bars[symbol] = (times[order], df.iloc[order].reset_index(drop=True))
+        return self._bars[symbol]
+
+    def _load_articles(self, symbol: str):
+        """Load (and memoize) the recorded articles of a symbol, sorted by time."""
+        if symbol not in self._articles:
+            path = os.path.join(self.root, 'news', f"{symbol}.jsonl")
+            articles = []
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    articles = [json.loads(line) for line in f if line.strip()]
+            articles = [article for article in articles if article.get('publishedAt')]
+
+            times = _times_ns([article['publishedAt'] for article in articles])
+            order = np.argsort(times, kind='stable')
+            self._articles[symbol] = (times[order], [articles[i] for i in order])
+        return self._articles[symbol]
+
+    def _end_ns(self, end) -> int:
+        """Upper time bound of a query: end, but never past the clock."""
+        end_ns = _to_ns(end)
+        if self.clock_ns is not None:
+            end_ns = min(end_ns, self.clock_ns + 1)
+        return end_ns
+
+    # PriceSource / NewsSource
+
+    def now(self) -> datetime:
+        """Replay clock time (naive UTC); the last recorded event before play()."""
+        clock_ns = self.clock_ns
+        if clock_ns is None:
+            ends = [self._load_bars(symbol)[0][-1:] for symbol in self.symbols]
+            ends += [self._load_articles(symbol)[0][-1:] for symbol in self.symbols]
+            ends = np.concatenate(ends) if ends else np.array([], dtype=np.int64)
+            clock_ns = int(ends.max()) if len(ends) else time.time_ns()
+        # Just past the clock (datetime has microsecond resolution) so that
+        # [start, now) windows include the current event
+        return pd.Timestamp(clock_ns + 1000).to_pydatetime(warn=False)
+
+    def get_history(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = '1d'
+    ) -> pd.DataFrame:
+        """Get recorded bars in [start, end) that the clock has reached."""
+        if interval != self.interval:
+            logger.warning(f"Replay has {self.interval} bars, not {interval}")
+            return pd.DataFrame()
+
+        times, df = self._load_bars(symbol)
+        first = np.searchsorted(times, _to_ns(start), side='left')
+        last = np.searchsorted(times, self._end_ns(end), side='left')
+        return df.iloc[first:last].reset_index(drop=True)
+
+    def get_latest_price(self, symbol: str) -> Optional[float]:
+        """Get the close of the last bar the clock has reached."""
+        times, df = self._load_bars(symbol)
+        position = len(times) if self.clock_ns is None else np.searchsorted(
+            times, self.clock_ns, side='right'
+        )
+        if position == 0:
+            return None
+        return float(df['close'].iloc[position - 1])
+
+    def get_articles(
+        self,
+        symbol: str,
+        query: str,
+        start: datetime,
+        end: datetime
+    ) -> List[Dict]:
+        """Get recorded articles published in [start, end) that the clock has reached."""
+        times, articles = self._load_articles(symbol)
+        first = np.searchsorted(times, _to_ns(start), side='left')
+        last = np.searchsorted(times, self._end_ns(end), side='left')
+        return articles[first:last]
+
+    # Event stream
+
+    def _symbol_events(self, symbol: str, start_ns: int, end_ns: int) -> List[Iterator[ReplayEvent]]:
+        """Time-ordered bar and article iterators of one symbol."""
+        streams = []
+
+        times, df = self._load_bars(symbol)
+        first, last = np.searchsorted(times, [start_ns, end_ns], side='left')
+        if last > first:
+            rows = df.iloc[first:last].itertuples(index=False, name='Bar')
+            streams.append(
+                ReplayEvent(t, BAR, symbol, row)
+                for t, row in zip(times[first:last].tolist(), rows)
+            )
+
+        times, articles = self._load_articles(symbol)
+        first, last = np.searchsorted(times, [start_ns, end_ns], side='left')
+        if last > first:
+            streams.append(
+                ReplayEvent(t, ARTICLE, symbol, article)
+                for t, article in zip(times[first:last].tolist(), articles[first:last])
+            )
+
+        return streams
+
+    def events(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        start=None,
+        end=None
+    ) -> Iterator[ReplayEvent]:
+        """
+        Merge recorded bars and articles into one time-ordered stream.
+
+        A k-way heap merge of the per-symbol streams, so memory stays
+        proportional to the number of streams, not events. Ties keep bars
+        before articles and symbols in the given order.
+
+        Args:
+            symbols: Symbols to replay (default: all recorded)
+            start: First event time (inclusive, default: beginning)
+            end: Last event time (exclusive, default: end)
+
+        Returns:
+            Iterator of ReplayEvent
+        """
+        start_ns = _to_ns(start) if start is not None else np.iinfo(np.int64).min
+        end_ns = _to_ns(end) if end is not None else np.iinfo(np.int64).max
+        streams = []
+        for symbol in (symbols if symbols is not None else self.symbols):
+            streams.extend(self._symbol_events(symbol, start_ns, end_ns))
+        return heapq.merge(*streams, key=attrgetter('time'))
+
+    def play(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        speed: Optional[float] = None,
+        start=None,
+        end=None
+    ) -> Iterator[ReplayEvent]:
+        """
+        Replay events, moving the clock to each one as it is emitted.
+
+        Args:
+            symbols: Symbols to replay (default: all recorded)
+            speed: 1.0 for real time, N for N times faster, None for as
+                fast as possible
+            start: First event time
+            end: Last event time
+
+        Returns:
+            Iterator of ReplayEvent
+        """
+        origin = None
+        for event in self.events(symbols, start, end):
+            if speed:
+                if origin is None:
+                    origin = (event.time, time.monotonic())
+                delay = origin[1] + (event.time - origin[0]) / 1e9 / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            self.clock_ns = event.time
+            yield event
+
+    async def aplay(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        speed: Optional[float] = None,
+        start=None,
+        end=None,
+        yield_every: int = 1000
+    ):
+        """
+        Asynchronous play() for the live loop.
+
+        As-fast-as-possible replays yield to the event loop every
+        yield_every events so other tasks (pollers, reports) keep running.
+
+        Returns:
+            Async iterator of ReplayEvent
+        """
+        loop = asyncio.get_running_loop()
+        origin = None
+        for count, event in enumerate(self.events(symbols, start, end)):
+            if speed:
+                if origin is None:
+                    origin = (event.time, loop.time())
+                delay = origin[1] + (event.time - origin[0]) / 1e9 / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif count % yield_every == 0:
+                await asyncio.sleep(0)
+            self.clock_ns = event.time
+            yield event
+
+    async def run_clock(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        speed: Optional[float] = 1.0,
+        start=None,
+        end=None
+    ) -> int:
+        """
+        Advance the clock through the recording without consuming events.
+
+        Lets polling consumers (LiveTrader.run) see the recording unfold.
+
+        Returns:
+            Number of events replayed
+        """
+        count = 0
+        async for _ in self.aplay(symbols, speed, start, end):
+            count += 1
+        return count
+
+    def reset(self):
+        """Move the clock back to the end of the recording."""
+        self.clock_ns = None
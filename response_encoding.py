@@ -0,0 +1,176 @@
+"""Fast columnar JSON encoding and compression for API responses."""
+import gzip
+import hashlib
+import json
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from instrumentation import stage
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available
+    brotli = None
+
+
+def encode_column(series: pd.Series, date_format: str = 'iso') -> List:
+    """
+    Convert a column to a JSON-ready list in bulk.
+
+    Floats have NaN/Inf replaced by None, datetimes become ISO 8601 strings
+    (UTC with a 'Z' suffix when timezone-aware) or epoch milliseconds.
+
+    Args:
+        series: Column to convert
+        date_format: 'iso' or 'epoch' for datetime columns
+
+    Returns:
+        List of JSON-serializable values
+    """
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+        suffix = 'Z'
+    elif pd.api.types.is_datetime64_dtype(series.dtype):
+        values = series.to_numpy()
+        suffix = ''
+    else:
+        values = None
+
+    if values is not None:
+        missing = np.isnat(values)
+        if date_format == 'epoch':
+            encoded = values.astype('datetime64[ms]').astype(np.int64).astype(object)
+        else:
+            encoded = np.char.add(np.datetime_as_string(values, unit='s'), suffix).astype(object)
+        if missing.any():
+            encoded[missing] = None
+        return encoded.tolist()
+
+    if pd.api.types.is_float_dtype(series.dtype):
+        array = series.to_numpy(dtype=float)
+        finite = np.isfinite(array)
+        if finite.all():
+            return array.tolist()
+        encoded = array.astype(object)
+        encoded[~finite] = None
+        return encoded.tolist()
+
+    return series.tolist()
+
+
+def to_columns(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    date_format: str = 'iso'
+) -> Dict[str, List]:
+    """
+    Convert a DataFrame to one JSON-ready array per column.
+
+    Every requested column is present, so clients can rely on the shape:
+    columns the frame lacks (e.g. every column of an empty result) are
+    filled with nulls, and an empty frame gives empty arrays.
+
+    Args:
+        df: DataFrame to convert
+        columns: Columns to include (default: all)
+        date_format: 'iso' or 'epoch' for datetime columns
+
+    Returns:
+        Dictionary mapping column name to list of values
+    """
+    return {
+        column: encode_column(df[column], date_format) if column in df.columns else [None] * len(df)
+        for column in (columns if columns is not None else df.columns)
+    }
+
+
+def clean_metrics(metrics: Dict) -> Dict:
+    """Replace NaN/Inf metrics with 0.0 and NumPy scalars with Python numbers."""
+    clean = {}
+    for key, value in metrics.items():
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+            value = 0.0
+        clean[key] = value
+    return clean
+
+
+def _default(value):
+    """Encode values the standard library encoder does not know."""
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """
+    Encode an object to JSON bytes, using orjson when installed.
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+class EncodedBody:
+    """A JSON response body with its ETag and lazily compressed variants."""
+
+    def __init__(self, raw: bytes):
+        """
+        Initialize the body.
+
+        Args:
+            raw: Uncompressed JSON bytes
+        """
+        self.raw = raw
+        self.etag = hashlib.sha1(raw).hexdigest()
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def negotiate(self, accept_encodings) -> Tuple[bytes, Optional[str]]:
+        """
+        Pick the best encoding the client accepts and return the body in it.
+
+        Compressed variants are computed once and reused by later requests.
+
+        Args:
+            accept_encodings: werkzeug Accept object (request.accept_encodings)
+
+        Returns:
+            Tuple of (body bytes, content encoding or None)
+        """
+        if brotli is not None and accept_encodings['br']:
+            encoding = 'br'
+        elif accept_encodings['gzip']:
+            encoding = 'gzip'
+        else:
+            return self.raw, None
+
+        with self._lock:
+            if encoding not in self._variants:
+                with stage('compress'):
+                    if encoding == 'br':
+                        self._variants[encoding] = brotli.compress(self.raw, quality=5)
+                    else:
+                        self._variants[encoding] = gzip.compress(self.raw, compresslevel=6)
+            return self._variants[encoding], encoding
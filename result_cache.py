@@ -0,0 +1,111 @@
+"""Bounded LRU + TTL cache with request coalescing (single-flight)."""
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """A computation in progress that concurrent callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """
+    Caches computed results by key.
+
+    Entries expire after a TTL and the least recently used entry is evicted
+    once the cache is full. Concurrent requests for a key that is being
+    computed wait for that single computation instead of starting their own.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 300):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            ttl: Seconds a result stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cache_if: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Get a cached result, computing it at most once per key at a time.
+
+        Args:
+            key: Cache key (must capture every input of the computation)
+            compute: Function producing the value on a miss; exceptions are
+                propagated to every waiting caller and never cached
+            cache_if: Whether to keep a computed value (default: always);
+                callers waiting on the computation get the value either way
+
+        Returns:
+            Tuple of (value, whether it was served without computing)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], True
+                del self._entries[key]
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._in_flight[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            if cache_if is not None and not cache_if(flight.value):
+                return flight.value, False
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl, flight.value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return flight.value, False
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
@@ -16,6 +16,10 @@ print("  Lancement du backtest sur AAPL (30 jours)...")
 print("=" * 70)
 print()
 
+# Journalisation (texte ou JSON, LOG_FORMAT) écrite par un thread d'arrière-plan
+from log_pipeline import configure_logging
+configure_logging()
+
 # Lancer le backtest
 from backtester import Backtester
 from market_data import MarketData
@@ -30,5 +30,8 @@ def open_browser():
 Timer(0.5, open_browser).start()
 
 # Start Flask server
+from log_pipeline import configure_logging
+configure_logging()
+
 from api_server import app
 app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
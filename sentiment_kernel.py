@@ -0,0 +1,181 @@
+"""Exponentially time-decayed, article-count-aware sentiment signal.
+
+Each article contributes its sentiment with weight exp(-lambda * age), where
+lambda = ln 2 / half_life, so breaking news dominates and old news fades
+away. The signal at time t is
+
+    sum(w_i * s_i) / (sum(w_i) + prior_weight)
+
+The prior weight acts as a neutral pseudo-article: a single article moves
+the signal less than a burst of articles agreeing with each other.
+"""
+import math
+from typing import Optional, Tuple
+import numpy as np
+
+NS_PER_SECOND = 1e9
+
+# Largest exponent used inside one block of the vectorized pass; keeps the
+# rescaled weights (at most e^500 times the article count) far from overflow
+_MAX_EXPONENT = 500.0
+
+
+def decay_rate(half_life: float) -> float:
+    """Decay rate per second for a half-life in seconds."""
+    if half_life <= 0:
+        raise ValueError("half_life must be positive")
+    return math.log(2) / half_life
+
+
+def decayed_sentiment(
+    article_times: np.ndarray,
+    sentiments: np.ndarray,
+    bar_times: np.ndarray,
+    half_life: float,
+    prior_weight: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate the decayed sentiment at every bar in one vectorized pass.
+
+    Articles at or before a bar's time count toward it. Instead of summing
+    over all articles per bar, the decayed sums are prefix sums of
+    s_i * exp(lambda * t_i); times are rescaled per block of
+    _MAX_EXPONENT / lambda seconds so the exponentials never overflow, and
+    only the carries between blocks are computed sequentially.
+
+    Args:
+        article_times: Article times, epoch nanoseconds, ascending
+        sentiments: Sentiment per article
+        bar_times: Bar (evaluation) times, epoch nanoseconds, ascending
+        half_life: Half-life of an article's weight, in seconds
+        prior_weight: Weight of the neutral pseudo-article
+
+    Returns:
+        Tuple of (signal, effective article count) arrays, one value per bar
+    """
+    rate = decay_rate(half_life)
+    n_bars = len(bar_times)
+    signal = np.zeros(n_bars)
+    weight = np.zeros(n_bars)
+    if len(article_times) == 0 or n_bars == 0:
+        return signal, weight
+
+    article_times = np.asarray(article_times, dtype=np.int64)
+    sentiments = np.asarray(sentiments, dtype=float)
+    bar_times = np.asarray(bar_times, dtype=np.int64)
+
+    # Seconds since the first article (float64 keeps sub-millisecond precision for decades)
+    origin = article_times[0]
+    t_articles = (article_times - origin) / NS_PER_SECOND
+    t_bars = (bar_times - origin) / NS_PER_SECOND
+
+    block_span = _MAX_EXPONENT / rate
+    blocks = np.floor(t_articles / block_span).astype(np.int64)
+    block_start = blocks * block_span
+
+    # Weights relative to the start of each article's block: 1 .. e^500
+    local = np.exp(rate * (t_articles - block_start))
+    weighted = local * sentiments
+
+    # Prefix sums within each block, plus the carry of all earlier blocks
+    # valued at the block's start (blocks are few: one per ~720 half-lives)
+    starts = np.flatnonzero(np.r_[True, blocks[1:] != blocks[:-1]])
+    ends = np.r_[starts[1:], len(blocks)]
+    cum_weight = np.empty(len(blocks))
+    cum_sum = np.empty(len(blocks))
+    carry_weight = np.zeros(len(starts))
+    carry_sum = np.zeros(len(starts))
+    for k, (first, stop) in enumerate(zip(starts, ends)):
+        if k:
+            previous_end = starts[k] - 1
+            decay = math.exp(-rate * (block_start[first] - block_start[starts[k - 1]]))
+            carry_weight[k] = decay * (carry_weight[k - 1] + cum_weight[previous_end])
+            carry_sum[k] = decay * (carry_sum[k - 1] + cum_sum[previous_end])
+        np.cumsum(local[first:stop], out=cum_weight[first:stop])
+        np.cumsum(weighted[first:stop], out=cum_sum[first:stop])
+
+    block_of_article = np.repeat(np.arange(len(starts)), ends - starts)
+
+    # Last article at or before each bar
+    last = np.searchsorted(article_times, bar_times, side='right') - 1
+    has_news = last >= 0
+    last = last[has_news]
+    block = block_of_article[last]
+
+    decay = np.exp(-rate * (t_bars[has_news] - block_start[last]))
+    weight[has_news] = (carry_weight[block] + cum_weight[last]) * decay
+    sums = (carry_sum[block] + cum_sum[last]) * decay
+
+    denominator = weight[has_news] + prior_weight
+    signal[has_news] = np.divide(sums, denominator, out=np.zeros_like(sums), where=denominator > 0)
+    return signal, weight
+
+
+class DecayedSentiment:
+    """
+    Incremental version of decayed_sentiment for streaming use.
+
+    Adding an article or reading the signal is O(1): the state is the
+    decayed weight and weighted sum as of the latest time seen.
+    """
+
+    __slots__ = ('rate', 'prior_weight', 'time', 'weight', 'total')
+
+    def __init__(self, half_life: float, prior_weight: float = 0.0):
+        """
+        Initialize an empty signal.
+
+        Args:
+            half_life: Half-life of an article's weight, in seconds
+            prior_weight: Weight of the neutral pseudo-article
+        """
+        self.rate = decay_rate(half_life)
+        self.prior_weight = prior_weight
+        self.time = None  # Epoch seconds of the state
+        self.weight = 0.0
+        self.total = 0.0
+
+    def _advance(self, time: float):
+        """Decay the state forward to time (never backwards)."""
+        if self.time is None:
+            self.time = time
+        elif time > self.time:
+            decay = math.exp(-self.rate * (time - self.time))
+            self.weight *= decay
+            self.total *= decay
+            self.time = time
+
+    def add(self, time: float, sentiment: float):
+        """
+        Add an article.
+
+        Args:
+            time: Publication time, epoch seconds (late articles are
+                decayed to the current state time)
+            sentiment: Sentiment score
+        """
+        self._advance(time)
+        weight = math.exp(-self.rate * (self.time - time))
+        self.weight += weight
+        self.total += weight * sentiment
+
+    def value(self, time: Optional[float] = None) -> float:
+        """
+        Get the signal at a time (default: the latest time seen).
+
+        Args:
+            time: Evaluation time, epoch seconds
+        """
+        weight, total = self.weight, self.total
+        if time is not None and self.time is not None and time > self.time:
+            decay = math.exp(-self.rate * (time - self.time))
+            weight *= decay
+            total *= decay
+        denominator = weight + self.prior_weight
+        return total / denominator if denominator > 0 else 0.0
+
+    def effective_count(self, time: Optional[float] = None) -> float:
+        """Decayed number of articles at a time (default: the latest time seen)."""
+        if time is None or self.time is None or time <= self.time:
+            return self.weight
+        return self.weight * math.exp(-self.rate * (time - self.time))
@@ -0,0 +1,195 @@
+"""Local stand-in for NewsAPI's /v2/everything endpoint.
+
+Serves deterministic paginated articles with configurable latency and
+failure rates, so the news fetcher can be exercised offline:
+
+    python stub_news_server.py --port 8765 --latency 0.2 --error-rate 0.1
+    NEWS_API_URL=http://127.0.0.1:8765/v2 python main.py --live ...
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from log_pipeline import configure_logging
+from synthetic_sentiment import stable_seed
+
+logger = logging.getLogger(__name__)
+
+HEADLINES = (
+    ('beats earnings expectations', 'Strong quarter lifts the outlook.'),
+    ('shares slide after downgrade', 'Analysts cut their price target.'),
+    ('announces new product line', 'The launch is expected next quarter.'),
+    ('faces regulatory probe', 'Investors worry about possible fines.'),
+    ('raises full-year guidance', 'Demand remains robust across regions.'),
+)
+
+
+class StubNewsServer:
+    """NewsAPI-compatible HTTP server running on a background thread."""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        total_results: int = 250,
+        seed: int = 0
+    ):
+        """
+        Initialize the server (port 0 picks a free port).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind
+            latency: Seconds every request takes
+            error_rate: Fraction of requests answered with HTTP 503
+            rate_limit_rate: Fraction of requests answered with HTTP 429
+            total_results: Articles matching every query
+            seed: Seed of the random failures
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.total_results = total_results
+        self.requests = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass as the fetcher's base_url."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def start(self) -> 'StubNewsServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def respond(self, path: str, params: Dict[str, str]):
+        """
+        Build the response to a request.
+
+        Returns:
+            Tuple of (HTTP status, JSON body)
+        """
+        if path != '/v2/everything':
+            return 404, {'status': 'error', 'code': 'notFound', 'message': 'Unknown endpoint'}
+
+        with self._lock:
+            draw = self._rng.random()
+        if draw < self.rate_limit_rate:
+            return 429, {'status': 'error', 'code': 'rateLimited', 'message': 'Too many requests'}
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 503, {'status': 'error', 'code': 'unexpectedError', 'message': 'Try again later'}
+
+        query = params.get('q', '')
+        page = int(params.get('page', 1))
+        page_size = min(int(params.get('pageSize', 100)), 100)
+        first = (page - 1) * page_size
+        count = max(0, min(page_size, self.total_results - first))
+        end = datetime.fromisoformat(params['to']) if 'to' in params else datetime(2024, 1, 1)
+
+        rng = np.random.default_rng(stable_seed('stub-news', query, page))
+        articles = []
+        for i in range(first, first + count):
+            headline, description = HEADLINES[rng.integers(len(HEADLINES))]
+            published = end - timedelta(minutes=int(rng.integers(0, 24 * 60)))
+            articles.append({
+                'source': {'id': None, 'name': 'Stub News'},
+                'title': f"{query.split(' OR ')[0]} {headline}",
+                'description': description,
+                'url': f"https://stub.news/{query.split(' OR ')[0]}/{i}",
+                'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            })
+        return 200, {'status': 'ok', 'totalResults': self.total_results, 'articles': articles}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    server._active += 1
+                    server.max_concurrent = max(server.max_concurrent, server._active)
+                try:
+                    if server.latency:
+                        time.sleep(server.latency)
+                    url = urlparse(self.path)
+                    params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                    status, body = server.respond(url.path, params)
+                finally:
+                    with server._lock:
+                        server._active -= 1
+
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if status == 429:
+                    self.send_header('Retry-After', '0')
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+
+def main(argv: Optional[list] = None):
+    """Run the stub server in the foreground."""
+    parser = argparse.ArgumentParser(description='Local NewsAPI stub server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of HTTP 503 answers')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of HTTP 429 answers')
+    parser.add_argument('--total-results', type=int, default=250, help='Articles per query')
+    args = parser.parse_args(argv)
+
+    server = StubNewsServer(
+        args.host, args.port, args.latency, args.error_rate,
+        args.rate_limit_rate, args.total_results
+    )
+    logger.info(f"Stub NewsAPI listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    configure_logging()
+    main()
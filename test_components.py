@@ -1,5 +1,8 @@
 """Quick test script to verify components work without API key."""
 import sys
+from log_pipeline import configure_logging
+
+configure_logging()
 
 print("Testing News Trading Bot Components...")
 print("=" * 60)
@@ -0,0 +1,56 @@
+"""Shared fixtures: offline price data, and caches kept out of the working tree."""
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Config reads the environment at import: point every store at a scratch directory
+_SCRATCH = tempfile.mkdtemp(prefix='trading-bot-tests-')
+os.environ.setdefault('PRICE_CACHE_ENABLED', 'false')
+os.environ.setdefault('NEWS_STORE_PATH', os.path.join(_SCRATCH, 'news.db'))
+os.environ.setdefault('DEDUP_INDEX_PATH', os.path.join(_SCRATCH, 'near_duplicates.db'))
+os.environ.setdefault('API_JOB_STORE_PATH', os.path.join(_SCRATCH, 'jobs.db'))
+os.environ.setdefault('DASHBOARD_CACHE_DIR', os.path.join(_SCRATCH, 'dashboard'))
+
+from data_sources import PriceSource  # noqa: E402
+
+
+class RandomWalkSource(PriceSource):
+    """Daily bars of a seeded random walk, ending at a fixed 'now'."""
+
+    def __init__(self, days: int = 400, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        dates = pd.bdate_range(end='2024-06-28', periods=days)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+        self.frame = pd.DataFrame({
+            'date': dates,
+            'open': close,
+            'high': close,
+            'low': close,
+            'close': close,
+            'volume': np.full(days, 1000)
+        })
+
+    def now(self) -> datetime:
+        return datetime(2024, 6, 29)
+
+    def get_history(self, symbol, start, end, interval='1d') -> pd.DataFrame:
+        dates = self.frame['date']
+        return self.frame[(dates >= start) & (dates < end)].reset_index(drop=True)
+
+    def get_latest_price(self, symbol):
+        return float(self.frame['close'].iloc[-1])
+
+
+@pytest.fixture
+def market_data():
+    """MarketData over a deterministic offline random walk."""
+    from market_data import MarketData
+    return MarketData(price_source=RandomWalkSource())
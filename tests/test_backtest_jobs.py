@@ -0,0 +1,164 @@
+"""Background backtest jobs: the job manager and the /api/jobs endpoints."""
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from backtest_jobs import CANCELLED, DONE, FAILED, JobManager, JobQueueFull
+from backtester import Backtester
+
+
+def wait_until_finished(job, timeout=10):
+    deadline = time.monotonic() + timeout
+    version = -1
+    while not job.finished and time.monotonic() < deadline:
+        version = job.wait_for_change(version, timeout=0.5)
+    assert job.finished, f"job still {job.status}"
+
+
+def blocking_runner(release, started=None):
+    """Runner that reports progress until released (so it can be cancelled)."""
+    def run(params, progress):
+        if started is not None:
+            started.set()
+        while not release.wait(0.01):
+            progress(0.5, {'bars': 1})
+        return {'symbol': params['symbol']}
+    return run
+
+
+@pytest.fixture(params=['memory', 'store'])
+def store_path(request, tmp_path):
+    return str(tmp_path / 'jobs.db') if request.param == 'store' else None
+
+
+def test_job_reports_progress_and_result(store_path):
+    def run(params, progress):
+        progress(0.5, {'trades': 1})
+        return {'symbol': params['symbol'], 'value': 42}
+
+    job = JobManager(run, store_path=store_path).submit({'symbol': 'AAPL'})
+    wait_until_finished(job)
+
+    assert job.status == DONE
+    assert job.progress == 1.0
+    assert job.metrics == {'trades': 1}
+    assert job.to_dict()['result'] == {'symbol': 'AAPL', 'value': 42}
+
+
+def test_failed_runs_report_their_error(store_path):
+    def run(params, progress):
+        raise RuntimeError('no price data')
+
+    job = JobManager(run, store_path=store_path).submit({'symbol': 'AAPL'})
+    wait_until_finished(job)
+
+    assert job.status == FAILED
+    assert job.error == 'no price data'
+
+
+def test_running_job_can_be_cancelled(store_path):
+    started = threading.Event()
+    release = threading.Event()
+    manager = JobManager(blocking_runner(release, started), store_path=store_path)
+    job = manager.submit({'symbol': 'AAPL'})
+    try:
+        assert started.wait(5)
+        manager.cancel(job.job_id)
+        wait_until_finished(job)
+        assert job.status == CANCELLED
+    finally:
+        release.set()
+
+
+def test_queue_is_bounded(store_path):
+    release = threading.Event()
+    manager = JobManager(blocking_runner(release), max_workers=1, max_pending=2, store_path=store_path)
+    try:
+        manager.submit({'symbol': 'A'})
+        queued = manager.submit({'symbol': 'B'})
+        with pytest.raises(JobQueueFull):
+            manager.submit({'symbol': 'C'})
+
+        # A queued job is cancelled before it starts, freeing its slot
+        manager.cancel(queued.job_id)
+        assert queued.status == CANCELLED
+        manager.submit({'symbol': 'C'})
+    finally:
+        release.set()
+
+
+def test_other_processes_see_and_cancel_jobs(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    started = threading.Event()
+    release = threading.Event()
+    runner = JobManager(blocking_runner(release, started), store_path=path)
+    other = JobManager(blocking_runner(release), store_path=path)
+    try:
+        job = runner.submit({'symbol': 'AAPL'})
+        assert started.wait(5)
+
+        view = other.get(job.job_id)
+        assert view.remote and view.params == {'symbol': 'AAPL'}
+        other.cancel(job.job_id)
+        wait_until_finished(job)
+        wait_until_finished(view)
+
+        assert job.status == view.status == CANCELLED
+        assert other.get('unknown') is None
+    finally:
+        release.set()
+
+
+@pytest.fixture
+def client(monkeypatch, market_data):
+    import api_server
+    monkeypatch.setattr(api_server, 'backtester', Backtester(market_data=market_data))
+    return api_server.app.test_client()
+
+
+def test_api_runs_a_job_to_completion(client):
+    response = client.post('/api/backtest/AAPL/jobs?days=60&capital=5000')
+    assert response.status_code == 202
+    status_url = response.get_json()['status_url']
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        job = client.get(status_url).get_json()['job']
+        if job['status'] in (DONE, FAILED, CANCELLED):
+            break
+        time.sleep(0.05)
+
+    assert job['status'] == DONE, job
+    assert job['params']['capital'] == 5000
+    assert job['result']['metrics']['total_trades'] >= 0
+
+    events = client.get(status_url + '/events').get_data(as_text=True)
+    assert events.startswith('event: done')
+
+
+def test_api_rejects_bad_input_and_unknown_jobs(client):
+    assert client.post('/api/backtest/AAPL/jobs?interval=2d').status_code == 400
+    assert client.get('/api/jobs/unknown').status_code == 404
+    assert client.delete('/api/jobs/unknown').status_code == 404
+
+
+def test_importing_the_api_creates_no_job_store(tmp_path):
+    path = tmp_path / 'jobs.db'
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, API_JOB_STORE_PATH=str(path))
+
+    subprocess.run(
+        [sys.executable, '-c', 'import api_server; assert api_server.jobs is None'],
+        cwd=root, env=env, check=True, capture_output=True
+    )
+    assert not path.exists()
+
+    subprocess.run(
+        [sys.executable, '-c', 'import api_server; api_server.get_jobs()'],
+        cwd=root, env=env, check=True, capture_output=True
+    )
+    assert path.exists()
@@ -0,0 +1,28 @@
+"""The array engine reproduces the reference per-date loop."""
+import pandas as pd
+import pytest
+
+from backtester import Backtester
+from trading_strategy import trades_to_dicts
+
+
+@pytest.mark.parametrize('days', [30, 365])
+def test_array_engine_matches_loop_engine(market_data, days):
+    backtester = Backtester(market_data=market_data)
+
+    array = backtester.run_backtest('AAPL', days=days, engine='array')
+    loop = backtester.run_backtest('AAPL', days=days, engine='loop')
+
+    assert array['metrics']['total_trades'] > 0
+    # Bar times are equal; only their resolution depends on how pandas built them
+    pd.testing.assert_frame_equal(
+        array['results'].astype({'date': 'datetime64[ns]'}),
+        loop['results'].astype({'date': 'datetime64[ns]'})
+    )
+    assert array['metrics'] == loop['metrics']
+    assert trades_to_dicts(array['trades']) == trades_to_dicts(loop['trades'])
+
+
+def test_unknown_engine_is_rejected(market_data):
+    with pytest.raises(ValueError):
+        Backtester(market_data=market_data).run_backtest('AAPL', engine='vectorized')
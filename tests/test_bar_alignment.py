@@ -0,0 +1,63 @@
+"""Event-time alignment of news to price bars."""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bar_alignment import asof_bar_positions, mean_per_bar, periods_per_year, session_close_times, to_utc_ns
+from replay import ReplaySource, record_articles, record_bars
+
+
+def test_naive_times_are_utc():
+    naive = to_utc_ns(['2024-03-05 14:30'])
+    aware = to_utc_ns(pd.DatetimeIndex(['2024-03-05 09:30']).tz_localize('America/New_York'))
+
+    assert naive.tolist() == aware.tolist() == [pd.Timestamp('2024-03-05 14:30', tz='UTC').value]
+
+
+def test_session_closes_follow_daylight_saving():
+    closes = session_close_times(['2024-03-08', '2024-03-11'])
+
+    assert list(closes.strftime('%H:%M')) == ['21:00', '20:00']
+    assert str(closes.tz) == 'UTC'
+
+
+def test_each_event_goes_to_the_first_bar_at_or_after_it():
+    bars = to_utc_ns(pd.date_range('2024-03-05 14:30', periods=3, freq='h'))
+    events = to_utc_ns(['2024-03-05 14:00', '2024-03-05 14:30', '2024-03-05 14:31', '2024-03-05 18:00'])
+
+    positions = asof_bar_positions(bars, events)
+
+    assert positions.tolist() == [0, 0, 1, 3]
+    means = mean_per_bar(3, positions, [0.2, 0.4, -1.0, 1.0])
+    np.testing.assert_allclose(means, [0.3, -1.0, 0.0])
+    assert np.isnan(mean_per_bar(3, positions[:0], [], fill=np.nan)).all()
+
+
+def test_sharpe_annualization_counts_session_bars():
+    assert periods_per_year('1d') == 252
+    assert periods_per_year('1h') == 252 * 7
+
+
+def test_intraday_stored_sentiment_never_sees_later_news(tmp_path):
+    from backtester import Backtester
+    from market_data import MarketData
+
+    root = str(tmp_path)
+    times = pd.date_range('2024-06-03 13:30', periods=35, freq='h', tz='UTC')
+    close = np.linspace(100, 110, len(times))
+    record_bars(root, 'AAA', pd.DataFrame({'Datetime': times, 'Close': close}), interval='1h')
+    record_articles(root, 'AAA', [
+        {'title': 'early', 'url': 'a', 'publishedAt': '2024-06-03T13:10:00Z', 'sentiment': 0.9},
+        {'title': 'mid', 'url': 'b', 'publishedAt': '2024-06-03T15:05:00Z', 'sentiment': -0.5},
+        {'title': 'also mid', 'url': 'c', 'publishedAt': '2024-06-03T15:30:00Z', 'sentiment': 0.1}
+    ])
+    replay = ReplaySource(root, interval='1h')
+    backtester = Backtester(market_data=MarketData(price_source=replay), news_source=replay)
+
+    price_data = replay.get_history('AAA', datetime(2024, 6, 1), datetime(2024, 6, 10), '1h')
+    timestamps, prices, sentiments = backtester._build_arrays('AAA', price_data, 'stored', '1h')
+
+    assert len(timestamps) == len(times)
+    np.testing.assert_allclose(sentiments[:4], [0.9, 0.0, -0.2, 0.0])
+    assert not sentiments[4:].any()
@@ -0,0 +1,54 @@
+"""Batched and multi-process sentiment scoring."""
+import pytest
+
+from data_sources import NewsSource
+from news_analyzer import NewsAnalyzer
+
+pytest.importorskip('vaderSentiment')
+
+TEXTS = [
+    'Shares soar after a stellar quarter and raised guidance',
+    'Regulators open a probe; the stock plunges on fraud fears',
+    '',
+    'Company announces quarterly dividend',
+    'Shares soar after a stellar quarter and raised guidance'
+] + [f'Analysts upgrade the stock, citing strong demand (note {i})' for i in range(12)]
+
+
+class NoNews(NewsSource):
+    def get_articles(self, symbol, query, start, end):
+        return []
+
+
+@pytest.fixture
+def analyzer():
+    return NewsAnalyzer(news_source=NoNews())
+
+
+def test_batch_matches_one_by_one_scoring(analyzer):
+    reference = NewsAnalyzer(news_source=NoNews())
+    expected = [reference.analyze_sentiment(text) for text in TEXTS]
+
+    assert analyzer.analyze_sentiment_batch(TEXTS, workers=1) == expected
+    assert expected[0] > 0 > expected[1] and expected[2] == 0.0
+
+
+def test_process_pool_matches_in_process_scoring(analyzer):
+    in_process = NewsAnalyzer(news_source=NoNews()).analyze_sentiment_batch(TEXTS, workers=1)
+
+    assert analyzer.analyze_sentiment_batch(TEXTS, workers=2, chunk_size=4) == in_process
+
+
+def test_scores_are_cached_and_duplicates_scored_once(analyzer, monkeypatch):
+    analyzer.analyze_sentiment_batch(TEXTS[:2], workers=1)
+    scored = []
+    real_score = analyzer.sentiment_analyzer.polarity_scores
+    monkeypatch.setattr(
+        analyzer.sentiment_analyzer, 'polarity_scores',
+        lambda text: scored.append(text) or real_score(text)
+    )
+
+    scores = analyzer.analyze_sentiment_batch(TEXTS, workers=1)
+
+    assert scores[0] == scores[4] == analyzer.cache[TEXTS[0]]
+    assert len(scored) == len(set(TEXTS)) - 3  # Not the cached two, nor ''
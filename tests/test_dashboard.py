@@ -0,0 +1,46 @@
+"""Dash dashboard: callbacks, figures and the background result cache."""
+import pytest
+
+pytest.importorskip('dash')
+pytest.importorskip('diskcache')
+pytest.importorskip('dash_bootstrap_components')
+
+import dash  # noqa: E402
+import diskcache  # noqa: E402
+
+import dashboard  # noqa: E402
+
+
+def test_callbacks_are_registered():
+    outputs = ' '.join(dashboard.app.callback_map)
+
+    for component in ('metrics-cards', 'performance-chart', 'sentiment-chart', 'news-section', 'last-run'):
+        assert component in outputs
+    assert 'symbol-dropdown' in outputs
+    assert isinstance(dashboard.background_callback_manager, dashboard.SuccessCacheManager)
+
+
+def test_figures_render_a_backtest(market_data):
+    from backtester import Backtester
+
+    results = Backtester(market_data=market_data).run_backtest('AAPL', days=120, initial_capital=10000)
+
+    assert dashboard.create_metrics_cards(results['metrics']) is not None
+    assert len(dashboard.create_performance_chart(results['results']).data) > 0
+    assert len(dashboard.create_sentiment_chart(results['results']).data) > 0
+
+
+def test_failed_runs_are_served_once_then_dropped(tmp_path):
+    manager = dashboard.SuccessCacheManager(
+        diskcache.Cache(str(tmp_path)), cache_by=[dashboard.strategy_settings], expire=60
+    )
+    success = ['cards', {}, {}, 'news', {'symbol': 'AAPL'}]
+    failure = ['error', {}, {}, 'news', dash.no_update]
+
+    for key, result in (('ok', success), ('failed', failure), ('raised', {'long_callback_error': {'msg': 'x'}})):
+        manager.handle.set(key, result)
+        assert dashboard.is_failed_run(manager.get_result(key, None)) == (key != 'ok')
+
+    assert manager.result_ready('ok')
+    assert not manager.result_ready('failed')
+    assert not manager.result_ready('raised')
@@ -0,0 +1,72 @@
+"""LTTB downsampling of chart series."""
+import numpy as np
+import pandas as pd
+
+from downsampling import downsample_frame, downsample_indices, lttb_indices, signal_indices, target_points
+
+
+def test_point_budget_follows_the_chart_width():
+    assert target_points(None, 2000) == 2000
+    assert target_points(800, 2000) == 800
+    assert target_points(20, 2000) == 100
+    assert target_points(5000, 2000) == 2000
+    assert target_points(800, 0) == 0
+
+
+def test_lttb_keeps_the_endpoints_and_a_lone_spike():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[437] = 50.0
+
+    indices = lttb_indices(x, y, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert 437 in indices
+    assert (np.diff(indices) > 0).all()
+    assert len(lttb_indices(x, y, 2000)) == 1000
+
+
+def test_signals_are_bounded_to_one_buy_and_one_sell_per_bucket():
+    x = np.arange(100, dtype=float)
+    signals = pd.Series(['BUY', 'SELL'] * 50)
+
+    assert len(signal_indices(x, signals, 100)) == 100
+    kept = signal_indices(x, signals, 10)
+    assert len(kept) == 20
+    assert set(signals.iloc[kept]) == {'BUY', 'SELL'}
+
+
+def test_frame_keeps_extremes_and_signals_within_budget():
+    n = 5000
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=n, freq='h'),
+        'price': 100 + rng.standard_normal(n).cumsum(),
+        'signal': 'HOLD'
+    })
+    df.loc[[10, 2500, 4990], 'signal'] = ['BUY', 'SELL', 'BUY']
+
+    indices = downsample_indices(df, ['price'], 200)
+    small = downsample_frame(df, ['price'], 200)
+
+    assert len(indices) <= 200 + 2 + 2 * 200
+    for position in (df['price'].idxmin(), df['price'].idxmax(), 10, 2500, 4990):
+        assert position in indices
+    assert small['date'].is_monotonic_increasing
+    assert downsample_frame(df, ['price'], 0) is df
+
+
+def test_api_sends_every_trade_when_bars_are_downsampled(monkeypatch, market_data):
+    import api_server
+    from backtester import Backtester
+    from result_cache import ResultCache
+
+    monkeypatch.setattr(api_server, 'backtest_cache', ResultCache())
+    monkeypatch.setattr(api_server, 'backtester', Backtester(market_data=market_data))
+
+    body = api_server.app.test_client().get('/api/backtest/AAPL?days=365&width=100').get_json()
+
+    assert len(body['data']['date']) < body['total_bars']
+    assert body['metrics']['total_trades'] > 0
+    assert len(body['trades']['action']) == body['metrics']['total_trades']
@@ -0,0 +1,44 @@
+"""Live paper trading on the offline stub sources."""
+import asyncio
+
+import pytest
+
+from live_trader import LiveTrader, StubNewsSource, StubPriceSource
+
+
+def test_capital_is_split_across_the_watchlist():
+    trader = LiveTrader(['AAA', 'BBB', 'CCC', 'DDD'], StubNewsSource(), StubPriceSource(), initial_capital=10000)
+
+    assert {state.strategy.initial_capital for state in trader.states.values()} == {2500}
+    assert trader.snapshot()['total_value'] == pytest.approx(10000)
+    with pytest.raises(ValueError):
+        LiveTrader([], StubNewsSource(), StubPriceSource())
+
+
+def test_a_slow_symbol_does_not_hold_up_the_others():
+    slow = {'SLOW': 1.0}
+    trader = LiveTrader(
+        ['AAA', 'BBB', 'SLOW'],
+        StubNewsSource(slow_symbols=slow),
+        StubPriceSource(slow_symbols=slow),
+        news_interval=0.02,
+        price_interval=0.01,
+        fetch_timeout=0.1,
+        initial_capital=9000
+    )
+
+    asyncio.run(trader.run(duration=0.5))
+
+    cycles = {symbol: [c for c in trader.cycles if c['symbol'] == symbol] for symbol in trader.states}
+    for symbol in ('AAA', 'BBB'):
+        assert len(cycles[symbol]) > 10
+        assert all(cycle['ok'] for cycle in cycles[symbol])
+        assert trader.states[symbol].price is not None
+    assert len(cycles['SLOW']) < len(cycles['AAA'])
+    assert not any(cycle['ok'] for cycle in cycles['SLOW'])
+    assert all(cycle['latency'] < 0.3 for cycle in cycles['SLOW'])
+
+    snapshot = trader.snapshot()
+    assert snapshot['positions']['SLOW']['price'] is None
+    assert snapshot['positions']['AAA']['total_trades'] > 0
+    assert snapshot['latency']['price']['failures'] == len([c for c in cycles['SLOW'] if c['kind'] == 'price'])
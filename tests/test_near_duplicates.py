@@ -0,0 +1,64 @@
+"""Near-duplicate article clusters."""
+from near_duplicates import NearDuplicateIndex
+
+STORY = "Apple shares jump after record iPhone sales beat analyst expectations in the holiday quarter"
+EDIT = "Apple shares jump after record iPhone sales beat analyst expectations in holiday quarter, Reuters"
+OTHER = "Federal Reserve holds interest rates steady and signals two cuts later this year"
+
+
+def test_edits_of_a_story_share_a_cluster():
+    index = NearDuplicateIndex()
+    story, edit, other = index.assign([STORY, EDIT, OTHER], ['u1', 'u2', 'u3'])
+
+    assert story['new'] and not edit['new'] and other['new']
+    assert edit['cluster'] == story['cluster'] != other['cluster']
+    assert index.cluster_size(story['cluster']) == 2
+
+
+def test_refetched_urls_keep_their_cluster():
+    index = NearDuplicateIndex()
+    first = index.assign([STORY], ['u1'])[0]
+    again = index.assign([STORY], ['u1'])[0]
+
+    assert again == {'cluster': first['cluster'], 'new': False, 'sentiment': None}
+    assert index.cluster_size(first['cluster']) == 1
+
+
+def test_duplicates_reuse_the_representative_score():
+    index = NearDuplicateIndex()
+    cluster = index.assign([STORY], ['u1'])[0]['cluster']
+    index.set_sentiment({cluster: 0.6})
+
+    assert index.assign([EDIT], ['u2'])[0]['sentiment'] == 0.6
+
+
+def test_claims_are_per_symbol():
+    index = NearDuplicateIndex()
+    cluster = index.assign([STORY], ['u1'])[0]['cluster']
+
+    assert index.claim('AAPL', [cluster]) == [True]
+    assert index.claim('AAPL', [cluster]) == [False]
+    assert index.claim('MSFT', [cluster]) == [True]
+
+
+def test_clusters_persist(tmp_path):
+    path = str(tmp_path / 'clusters.db')
+    index = NearDuplicateIndex(path)
+    cluster = index.assign([STORY], ['u1'])[0]['cluster']
+    index.set_sentiment({cluster: -0.2})
+    index.claim('AAPL', [cluster])
+
+    reopened = NearDuplicateIndex(path)
+    edit = reopened.assign([EDIT], ['u2'])[0]
+    assert edit == {'cluster': cluster, 'new': False, 'sentiment': -0.2}
+    assert reopened.claim('AAPL', [cluster]) == [False]
+    assert reopened.assign([OTHER], ['u3'])[0]['cluster'] != cluster
+
+
+def test_oldest_clusters_are_evicted():
+    index = NearDuplicateIndex(max_clusters=1)
+    first = index.assign([STORY], ['u1'])[0]['cluster']
+    index.assign([OTHER], ['u3'])
+
+    assert len(index) == 1
+    assert index.cluster_size(first) == 0
@@ -0,0 +1,60 @@
+"""NewsAnalyzer's lazily opened article store and near-duplicate index."""
+import os
+
+import pytest
+
+from config import Config
+from data_sources import NewsSource
+from news_analyzer import NewsAnalyzer
+
+pytest.importorskip('vaderSentiment')
+
+ARTICLES = [
+    {'title': 'Shares soar after a stellar quarter', 'description': 'Guidance raised.',
+     'url': 'https://a/1', 'publishedAt': '2024-01-02T15:00:00Z'},
+    {'title': 'Shares soar after a stellar quarter', 'description': 'Guidance raised.',
+     'url': 'https://b/1', 'publishedAt': '2024-01-02T15:05:00Z'}
+]
+
+
+class NoNews(NewsSource):
+    def get_articles(self, symbol, query, start, end):
+        return []
+
+
+@pytest.fixture
+def paths(monkeypatch, tmp_path):
+    store, index = tmp_path / 'news.db', tmp_path / 'dedup.db'
+    monkeypatch.setattr(Config, 'NEWS_STORE_PATH', str(store))
+    monkeypatch.setattr(Config, 'DEDUP_INDEX_PATH', str(index))
+    monkeypatch.setattr(Config, 'NEWS_STORE_ENABLED', True)
+    monkeypatch.setattr(Config, 'DEDUP_ENABLED', True)
+    return store, index
+
+
+def test_construction_opens_nothing(paths):
+    analyzer = NewsAnalyzer(news_source=NoNews())
+
+    assert not any(os.path.exists(path) for path in paths)
+    assert analyzer._news_store is None and analyzer._dedup_index is None
+
+
+def test_scoring_opens_the_store_and_index_once(paths):
+    analyzer = NewsAnalyzer(news_source=NoNews())
+
+    scored = analyzer.score_articles('AAPL', ARTICLES)
+
+    assert len(scored) == 1 and scored[0]['cluster_size'] == 2
+    assert all(os.path.exists(path) for path in paths)
+    assert analyzer.news_store is analyzer.news_store
+    assert analyzer.dedup_index is analyzer.dedup_index
+
+
+def test_disabled_components_stay_none(monkeypatch, paths):
+    monkeypatch.setattr(Config, 'NEWS_STORE_ENABLED', False)
+    monkeypatch.setattr(Config, 'DEDUP_ENABLED', False)
+    analyzer = NewsAnalyzer(news_source=NoNews())
+
+    assert len(analyzer.score_articles('AAPL', ARTICLES)) == 2
+    assert analyzer.news_store is None and analyzer.dedup_index is None
+    assert not any(os.path.exists(path) for path in paths)
@@ -0,0 +1,103 @@
+"""Paginated NewsAPI fetching against the local stub server."""
+from datetime import datetime
+
+import pytest
+
+from news_fetcher import NewsFetcher, NewsFetchError, TokenBucket
+from stub_news_server import StubNewsServer
+
+START, END = datetime(2024, 1, 1), datetime(2024, 1, 2)
+
+
+class ScriptedServer(StubNewsServer):
+    """Stub server answering its first requests with fixed statuses."""
+
+    def __init__(self, statuses, **kwargs):
+        super().__init__(**kwargs)
+        self.statuses = list(statuses)
+
+    def respond(self, path, params):
+        with self._lock:
+            status = self.statuses.pop(0) if self.statuses else None
+        if status is not None:
+            return status, {'status': 'error', 'code': 'scripted', 'message': f"Scripted {status}"}
+        return super().respond(path, params)
+
+
+def fetcher_for(server, **kwargs):
+    kwargs.setdefault('rate', 0)
+    return NewsFetcher(api_key='test', base_url=server.url, max_workers=4, backoff=0.01, **kwargs)
+
+
+def test_every_page_is_fetched_in_order():
+    with StubNewsServer(total_results=250) as server:
+        fetcher = fetcher_for(server, max_pages=5)
+        try:
+            results = fetcher.fetch_all({'AAA': 'AAA', 'BBB': 'BBB'}, START, END)
+        finally:
+            fetcher.close()
+
+    assert server.requests == 6
+    for symbol, articles in results.items():
+        assert [article['url'] for article in articles] == [
+            f"https://stub.news/{symbol}/{i}" for i in range(250)
+        ]
+
+
+def test_pages_stop_at_max_pages():
+    with StubNewsServer(total_results=1000) as server:
+        fetcher = fetcher_for(server, max_pages=2)
+        try:
+            articles = fetcher.fetch('AAA', 'AAA', START, END)
+        finally:
+            fetcher.close()
+
+    assert len(articles) == 200
+    assert server.requests == 2
+
+
+def test_rate_limits_are_retried():
+    with ScriptedServer([429, 503], total_results=50) as server:
+        fetcher = fetcher_for(server, max_retries=3)
+        try:
+            articles = fetcher.fetch('AAA', 'AAA', START, END)
+        finally:
+            fetcher.close()
+
+    assert len(articles) == 50
+    assert server.requests == 3
+
+
+def test_client_errors_are_not_retried():
+    with ScriptedServer([401], total_results=50) as server:
+        fetcher = fetcher_for(server, max_retries=3)
+        try:
+            with pytest.raises(NewsFetchError, match='HTTP 401: Scripted 401'):
+                fetcher.fetch_page('AAA', START, END)
+            # fetch_all logs the failure and returns no articles for the symbol
+            server.statuses = [404]
+            assert fetcher.fetch('AAA', 'AAA', START, END) == []
+        finally:
+            fetcher.close()
+
+    assert server.requests == 2
+
+
+def test_retries_give_up_after_max_retries():
+    with ScriptedServer([503] * 5) as server:
+        fetcher = fetcher_for(server, max_retries=2)
+        try:
+            with pytest.raises(NewsFetchError, match='after 3 attempts'):
+                fetcher.fetch_page('AAA', START, END)
+        finally:
+            fetcher.close()
+
+    assert server.requests == 3
+
+
+def test_token_bucket_throttles_after_the_burst():
+    bucket = TokenBucket(rate=100, capacity=2)
+
+    assert bucket.acquire() == 0 and bucket.acquire() == 0
+    assert bucket.acquire() > 0
+    assert TokenBucket(rate=0).acquire() == 0
@@ -0,0 +1,69 @@
+"""Scored article store and the sentiment stored backtests trade on."""
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester import Backtester
+from config import Config
+from news_store import NewsStore, normalize_timestamp
+
+
+def article(url, published_at, sentiment):
+    return {'url': url, 'published_at': published_at, 'title': url, 'sentiment': sentiment}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(str(tmp_path / 'news.db'))
+
+
+def test_timestamps_are_normalized_to_utc():
+    assert normalize_timestamp('2024-03-05T10:00:00-05:00') == '2024-03-05T15:00:00Z'
+    assert normalize_timestamp(dt.date(2024, 3, 5)) == '2024-03-05T00:00:00Z'
+
+
+def test_saving_an_article_again_updates_it(store):
+    store.save_articles('AAPL', [article('u1', '2024-03-05T15:00:00Z', 0.2)])
+    store.save_articles('AAPL', [article('u1', '2024-03-05T15:00:00Z', 0.6)])
+    store.save_articles('MSFT', [article('u1', '2024-03-05T15:00:00Z', -0.4)])
+
+    articles = store.get_articles('AAPL', dt.date(2024, 3, 5), dt.date(2024, 3, 5))
+    assert articles['sentiment'].tolist() == [0.6]
+
+
+def test_days_collect_the_news_since_the_previous_close(store):
+    store.save_articles('AAPL', [
+        article('before-first', '2024-03-01T20:30:00Z', 0.9),   # Fri 15:30 ET: before the range
+        article('friday-late', '2024-03-01T22:00:00Z', 0.5),    # Fri 17:00 ET: Monday
+        article('weekend', '2024-03-02T15:00:00Z', -0.1),       # Saturday: Monday
+        article('tuesday', '2024-03-05T14:00:00Z', 0.4),        # Tue 09:00 ET: Tuesday
+        article('after-close', '2024-03-05T21:30:00Z', -0.8)    # Tue 16:30 ET, same UTC day: Wednesday
+    ])
+
+    daily = store.get_daily_sentiment('AAPL', [
+        dt.date(2024, 3, 4), dt.date(2024, 3, 5), dt.date(2024, 3, 6)
+    ])
+
+    assert daily.index.tolist() == [dt.date(2024, 3, 4), dt.date(2024, 3, 5), dt.date(2024, 3, 6)]
+    assert daily['sentiment'].tolist() == pytest.approx([0.2, 0.4, -0.8])
+    assert daily['article_count'].tolist() == [2, 1, 1]
+
+
+def test_stored_backtest_trades_after_close_news_the_next_day(market_data, monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, 'NEWS_STORE_PATH', str(tmp_path / 'news.db'))
+    backtester = Backtester(market_data=market_data)
+    price_data = market_data.get_price_history('AAPL', days=10)
+    dates = pd.to_datetime(price_data['date']).dt.date.tolist()
+    # Published at 17:00 New York on the third bar's date
+    after_close = pd.Timestamp(dates[2]).tz_localize('America/New_York') + pd.Timedelta(hours=17)
+    NewsStore(Config.NEWS_STORE_PATH).save_articles('AAPL', [
+        article('late', after_close.isoformat(), 0.9)
+    ])
+
+    _, _, sentiments = backtester._build_arrays('AAPL', price_data, 'stored', '1d')
+
+    expected = np.zeros(len(dates))
+    expected[3] = 0.9
+    np.testing.assert_allclose(sentiments, expected)
@@ -0,0 +1,59 @@
+"""Parameter sweeps: grid expansion, and the same results on any worker count."""
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+import parameter_sweep
+from backtester import Backtester
+from parameter_sweep import ParameterSweep, _init_worker, _share_array, expand_grid
+
+GRID = {'buy_threshold': [0.1, 0.3], 'sell_threshold': [-0.3, 0.0]}
+
+
+def test_expand_grid_is_the_cartesian_product():
+    assert expand_grid(GRID) == [
+        {'buy_threshold': 0.1, 'sell_threshold': -0.3},
+        {'buy_threshold': 0.1, 'sell_threshold': 0.0},
+        {'buy_threshold': 0.3, 'sell_threshold': -0.3},
+        {'buy_threshold': 0.3, 'sell_threshold': 0.0}
+    ]
+
+
+def test_unknown_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        expand_grid({'stop_loss': [0.1]})
+
+
+def test_pool_matches_single_process(market_data):
+    sweep = ParameterSweep(Backtester(market_data=market_data))
+
+    single = sweep.run('AAPL', GRID, days=365, workers=1)
+    pooled = sweep.run('AAPL', GRID, days=365, workers=2)
+
+    assert len(single) == 4
+    assert single['strategy_sharpe'].is_monotonic_decreasing
+    pdt.assert_frame_equal(single, pooled)
+
+
+def test_workers_restore_the_bar_time_zone():
+    timestamps = pd.date_range('2024-03-08 09:30', periods=5, freq='1min', tz='America/New_York')
+    segments = []
+    specs = {}
+    for key, array in {
+        'timestamps': np.asarray(timestamps.values),
+        'prices': np.ones(5),
+        'sentiments': np.zeros(5)
+    }.items():
+        segment, specs[key] = _share_array(array)
+        segments.append(segment)
+    try:
+        _init_worker(specs, parameter_sweep._timezone(timestamps))
+        assert parameter_sweep._worker_timestamps.equals(timestamps)
+        assert str(parameter_sweep._worker_timestamps.tz) == 'America/New_York'
+    finally:
+        for segment in segments + parameter_sweep._worker_segments:
+            segment.close()
+        for segment in segments:
+            segment.unlink()
+        parameter_sweep._worker_segments.clear()
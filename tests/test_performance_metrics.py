@@ -0,0 +1,64 @@
+"""FIFO win rate and streaming metrics."""
+import pytest
+
+from performance_metrics import MetricsAccumulator
+
+
+def trade(action, shares, price, symbol=None):
+    return {'action': action, 'shares': shares, 'price': price, 'symbol': symbol}
+
+
+def test_sells_close_the_oldest_lots_first():
+    accumulator = MetricsAccumulator(10000)
+    accumulator.update(10000, 10000)
+    accumulator.add_trade(trade('BUY', 10, 100))
+    accumulator.add_trade(trade('BUY', 10, 200))
+    # Closes the 100 lot: a win, although below the 150 average of all lots
+    accumulator.add_trade(trade('SELL', 10, 120))
+    # Closes the 200 lot: a loss
+    accumulator.add_trade(trade('SELL', 10, 180))
+
+    result = accumulator.result()
+    assert result['total_trades'] == 4
+    assert result['win_rate'] == pytest.approx(1 / 4)
+    assert not accumulator.open_lots[None]
+
+
+def test_sell_spanning_lots_is_judged_on_their_average_cost():
+    accumulator = MetricsAccumulator(10000)
+    accumulator.update(10000, 10000)
+    accumulator.add_trade(trade('BUY', 5, 100))
+    accumulator.add_trade(trade('BUY', 5, 140))
+    accumulator.add_trade(trade('SELL', 8, 119))  # Cost (5 * 100 + 3 * 140) / 8 = 115
+
+    assert accumulator.winning_trades == 1
+    assert accumulator.open_lots[None][0] == [2, 140]
+
+
+def test_lots_are_kept_per_symbol():
+    accumulator = MetricsAccumulator(10000)
+    accumulator.update(10000, 10000)
+    accumulator.add_trade(trade('BUY', 1, 50, 'AAPL'))
+    accumulator.add_trade(trade('BUY', 1, 500, 'MSFT'))
+    accumulator.add_trade(trade('SELL', 1, 400, 'MSFT'))
+
+    assert accumulator.winning_trades == 0
+    assert len(accumulator.open_lots['AAPL']) == 1
+
+
+def test_drawdown_and_returns():
+    accumulator = MetricsAccumulator(100)
+    for value in (100, 120, 90, 110):
+        accumulator.update(value, 100)
+    accumulator.add_trade(None)
+
+    result = accumulator.result()
+    assert result['max_drawdown'] == pytest.approx(-0.25)
+    assert result['strategy_return'] == pytest.approx(0.10)
+    assert result['buy_hold_return'] == 0
+    assert result['total_trades'] == 0
+    assert result['win_rate'] == 0
+
+
+def test_no_bars_no_metrics():
+    assert MetricsAccumulator(10000).result() == {}
@@ -0,0 +1,86 @@
+"""Shared-cash portfolio backtests over symbols with different calendars."""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester import Backtester
+from data_sources import PriceSource
+from market_data import MarketData
+from portfolio_backtester import PortfolioBacktester
+from trading_strategy import PortfolioStrategy
+
+
+class CalendarSource(PriceSource):
+    """A weekday-only stock and a 7-day crypto with a weekend first bar."""
+
+    def __init__(self):
+        self.frames = {}
+        for symbol, dates, start in (
+            ('STOCK', pd.bdate_range('2024-01-01', '2024-03-29'), 50.0),
+            ('COIN', pd.date_range('2023-12-30', '2024-03-31'), 200.0)
+        ):
+            close = start + np.arange(len(dates), dtype=float)
+            self.frames[symbol] = pd.DataFrame({
+                'date': dates, 'open': close, 'high': close, 'low': close,
+                'close': close, 'volume': 1000
+            })
+
+    def now(self) -> datetime:
+        return datetime(2024, 4, 1)
+
+    def get_history(self, symbol, start, end, interval='1d') -> pd.DataFrame:
+        frame = self.frames[symbol]
+        return frame[(frame['date'] >= start) & (frame['date'] < end)].reset_index(drop=True)
+
+    def get_latest_price(self, symbol):
+        return float(self.frames[symbol]['close'].iloc[-1])
+
+
+@pytest.fixture
+def portfolio():
+    market_data = MarketData(price_source=CalendarSource())
+    return PortfolioBacktester(Backtester(market_data=market_data))
+
+
+def test_two_symbols_share_one_cash_pool(portfolio):
+    result = portfolio.run_backtest(['STOCK', 'COIN'], days=120, initial_capital=10000)
+
+    assert result['symbols'] == ['STOCK', 'COIN']
+    assert not result['prices'].isna().any().any()
+    assert not result['results'][['portfolio_value', 'buy_hold_value']].isna().any().any()
+    assert result['results']['buy_hold_value'].iloc[0] == pytest.approx(10000)
+    assert result['metrics']['total_trades'] == len(result['trades']) > 0
+    assert {trade['symbol'] for trade in result['trades']} == {'STOCK', 'COIN'}
+    # One pool: cash plus positions is the portfolio value, never below zero cash
+    results = result['results']
+    assert (results['cash'] >= -1e-9).all()
+    np.testing.assert_allclose(results['cash'] + results['positions_value'], results['portfolio_value'])
+
+
+def test_weekends_carry_the_last_close_forward(portfolio):
+    prices = portfolio.run_backtest(['STOCK', 'COIN'], days=120)['prices']
+
+    # Starts at the later first bar (the stock's; the coin's start on 2023-12-30)
+    assert prices.index[0] == pd.Timestamp('2024-01-01')
+    saturday = pd.Timestamp('2024-01-06')
+    assert prices.loc[saturday, 'STOCK'] == prices.loc[pd.Timestamp('2024-01-05'), 'STOCK']
+
+
+def test_first_day_is_filled_when_a_symbol_has_no_bar_on_it(portfolio):
+    stock = portfolio.market_data.price_source.frames['STOCK']
+    aligned = portfolio._align_prices({
+        # Crypto starts on a Saturday the stock has no bar for
+        'STOCK': stock,
+        'COIN': portfolio.market_data.price_source.frames['COIN'].iloc[7:]
+    })
+
+    assert aligned.index[0] == pd.Timestamp('2024-01-06')
+    assert aligned.iloc[0].notna().all()
+    assert aligned.iloc[0]['STOCK'] == stock.set_index('date').loc['2024-01-05', 'close']
+
+
+def test_non_positive_capital_is_rejected():
+    with pytest.raises(ValueError):
+        PortfolioStrategy(['STOCK'], initial_capital=0)
@@ -0,0 +1,108 @@
+"""Incremental on-disk price cache behind MarketData.get_price_history."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import Config
+from data_sources import PriceSource
+from market_data import MarketData
+
+pytest.importorskip('pyarrow')
+
+
+class CountingSource(PriceSource):
+    """Cacheable daily bars that record every download window."""
+
+    cacheable = True
+
+    def __init__(self):
+        dates = pd.date_range('2023-01-01', '2024-12-31')
+        self.frame = pd.DataFrame({
+            'date': dates,
+            'open': 1.0, 'high': 1.0, 'low': 1.0,
+            'close': np.arange(len(dates), dtype=float),
+            'volume': 100
+        })
+        self.clock = datetime(2024, 6, 1)
+        self.calls = []
+        self.fail = False
+
+    def now(self) -> datetime:
+        return self.clock
+
+    def get_history(self, symbol, start, end, interval='1d') -> pd.DataFrame:
+        if self.fail:
+            raise ConnectionError('provider down')
+        self.calls.append((start, end))
+        frame = self.frame
+        return frame[(frame['date'] >= start) & (frame['date'] < end)].reset_index(drop=True)
+
+    def get_latest_price(self, symbol):
+        return None
+
+
+@pytest.fixture
+def source():
+    return CountingSource()
+
+
+@pytest.fixture
+def cached(monkeypatch, tmp_path, source):
+    monkeypatch.setattr(Config, 'PRICE_CACHE_ENABLED', True)
+    return lambda max_age=3600: MarketData(
+        cache_dir=str(tmp_path), cache_max_age=max_age, price_source=source
+    )
+
+
+def test_repeat_requests_are_served_from_the_cache(cached, source):
+    market_data = cached()
+    first = market_data.get_price_history('AAPL', days=30)
+    second = market_data.get_price_history('AAPL', days=30)
+
+    assert len(source.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_other_processes_read_the_files(cached, source):
+    cached().get_price_history('AAPL', days=30)
+    again = cached().get_price_history('AAPL', days=30)
+
+    assert len(source.calls) == 1
+    assert len(again) == 30
+
+
+def test_wider_window_downloads_only_the_missing_head(cached, source):
+    market_data = cached()
+    market_data.get_price_history('AAPL', days=30)
+    wider = market_data.get_price_history('AAPL', days=60)
+
+    start, end = source.calls[1]
+    assert start == source.clock - timedelta(days=60)
+    assert end == pd.Timestamp('2024-05-02')
+    assert wider['date'].is_unique and wider['date'].is_monotonic_increasing
+    assert len(wider) == 60
+    # A narrower request is a slice of the cached range
+    assert len(market_data.get_price_history('AAPL', days=10)) == 10
+    assert len(source.calls) == 2
+
+
+def test_stale_cache_fetches_only_new_bars(cached, source):
+    market_data = cached(max_age=0)
+    market_data.get_price_history('AAPL', days=30)
+    source.clock += timedelta(days=5)
+    later = market_data.get_price_history('AAPL', days=30)
+
+    start, _ = source.calls[1]
+    assert start == pd.Timestamp('2024-05-31')  # The last cached bar, refreshed
+    assert later['date'].iloc[-1] == pd.Timestamp('2024-06-05')
+    assert later['date'].is_unique
+
+
+def test_failed_refresh_serves_cached_bars(cached, source):
+    market_data = cached(max_age=0)
+    before = market_data.get_price_history('AAPL', days=30)
+    source.fail = True
+
+    pd.testing.assert_frame_equal(market_data.get_price_history('AAPL', days=30), before)
@@ -0,0 +1,93 @@
+"""Replay of recorded bars and articles."""
+import asyncio
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from replay import ARTICLE, BAR, ReplaySource, record_articles, record_bars
+
+
+def bars(start, periods, first_close):
+    dates = pd.bdate_range(start, periods=periods, tz='UTC')
+    close = first_close + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        'Date': dates, 'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1000
+    })
+
+
+@pytest.fixture
+def recording(tmp_path):
+    root = str(tmp_path)
+    record_bars(root, 'AAA', bars('2024-01-01', 120, 100.0))
+    record_bars(root, 'BBB', bars('2024-01-01', 120, 50.0))
+    record_articles(root, 'AAA', [
+        {'title': 'AAA beats', 'url': 'u1', 'publishedAt': '2024-01-03T15:00:00Z', 'sentiment': 0.8},
+        {'title': 'AAA at open', 'url': 'u2', 'publishedAt': '2024-01-02T00:00:00Z', 'sentiment': -0.6},
+        {'title': 'no time', 'url': 'u3'}
+    ])
+    return root
+
+
+def test_events_are_merged_in_time_order(recording):
+    source = ReplaySource(recording)
+
+    events = list(source.events())
+
+    assert source.symbols == ['AAA', 'BBB']
+    assert len(events) == 2 * 120 + 2
+    times = [event.time for event in events]
+    assert times == sorted(times)
+    # Ties keep a symbol's bar before its articles, and symbols in order
+    assert [(e.kind, e.symbol) for e in events[2:5]] == [(BAR, 'AAA'), (ARTICLE, 'AAA'), (BAR, 'BBB')]
+    assert events[0].data.close == 100.0
+    assert len(list(source.events(['BBB'], start='2024-02-01', end='2024-03-01'))) == 21
+
+
+def test_queries_never_see_past_the_replay_clock(recording):
+    source = ReplaySource(recording)
+    start, end = datetime(2023, 1, 1), datetime(2025, 1, 1)
+
+    assert len(source.get_history('AAA', start, end)) == 120
+    assert source.get_latest_price('AAA') == 219.0
+
+    for event in source.play(['AAA']):
+        if event.kind == ARTICLE and event.data['title'] == 'AAA beats':
+            break
+
+    assert source.now() > event.timestamp.tz_localize(None).to_pydatetime()
+    assert len(source.get_history('AAA', start, end)) == 3
+    assert source.get_latest_price('AAA') == 102.0
+    assert [a['title'] for a in source.get_articles('AAA', 'AAA', start, end)] == ['AAA at open', 'AAA beats']
+    assert source.get_history('AAA', start, end, interval='1h').empty
+
+    source.reset()
+    assert len(source.get_history('AAA', start, end)) == 120
+
+
+def test_live_trader_trades_the_recorded_articles(recording):
+    from live_trader import LiveTrader
+
+    trader = LiveTrader(['AAA'], None, None, initial_capital=1000)
+
+    count = asyncio.run(trader.replay(ReplaySource(recording)))
+
+    assert count == 122
+    state = trader.states['AAA']
+    assert state.price == 219.0
+    assert state.sentiment == 0.8
+    assert state.strategy.trades
+
+
+def test_backtester_runs_on_a_recording(recording):
+    from backtester import Backtester
+    from market_data import MarketData
+
+    replay = ReplaySource(recording)
+    backtester = Backtester(market_data=MarketData(price_source=replay), news_source=replay)
+
+    results = backtester.run_backtest('AAA', days=60, initial_capital=1000)
+
+    assert not results['results'].empty
+    assert results['results']['price'].iloc[-1] == 219.0
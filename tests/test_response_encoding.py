@@ -0,0 +1,69 @@
+"""Columnar JSON encoding of backtest responses."""
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+
+from response_encoding import EncodedBody, clean_metrics, dumps, encode_column, to_columns
+
+
+def test_floats_replace_nan_and_inf_with_null():
+    assert encode_column(pd.Series([1.5, np.nan, np.inf])) == [1.5, None, None]
+
+
+def test_datetimes_encode_as_iso_or_epoch_milliseconds():
+    aware = pd.Series(pd.to_datetime(['2024-03-05 09:30'])).dt.tz_localize('America/New_York')
+    naive = pd.Series(pd.to_datetime(['2024-03-05', None]))
+
+    assert encode_column(aware) == ['2024-03-05T14:30:00Z']
+    assert encode_column(naive) == ['2024-03-05T00:00:00', None]
+    assert encode_column(aware, 'epoch') == [1709649000000]
+
+
+def test_columns_keep_the_requested_order_and_shape():
+    frame = pd.DataFrame({'price': [1.0, 2.0], 'date': pd.to_datetime(['2024-01-01', '2024-01-02'])})
+
+    columns = to_columns(frame, ['date', 'price', 'holdings'])
+
+    assert list(columns) == ['date', 'price', 'holdings']
+    assert columns['price'] == [1.0, 2.0]
+    assert columns['holdings'] == [None, None]
+    assert to_columns(frame) == {'price': [1.0, 2.0], 'date': ['2024-01-01T00:00:00', '2024-01-02T00:00:00']}
+
+
+def test_empty_frames_give_an_empty_array_per_column():
+    assert to_columns(pd.DataFrame(), ['date', 'price']) == {'date': [], 'price': []}
+
+
+def test_metrics_and_bodies_are_plain_json():
+    metrics = clean_metrics({'sharpe': np.float64('nan'), 'trades': np.int64(3)})
+    body = EncodedBody(dumps({'metrics': metrics, 'when': pd.Timestamp('2024-01-01')}))
+
+    assert json.loads(body.raw) == {'metrics': {'sharpe': 0.0, 'trades': 3}, 'when': '2024-01-01T00:00:00'}
+    compressed, encoding = body.negotiate({'gzip': 1, 'br': 0})
+    assert encoding == 'gzip' and gzip.decompress(compressed) == body.raw
+    assert body.negotiate({'gzip': 0, 'br': 0}) == (body.raw, None)
+
+
+def test_api_keeps_the_columnar_shape_without_bars(monkeypatch):
+    import api_server
+    from backtester import Backtester
+    from data_sources import PriceSource
+    from market_data import MarketData
+    from result_cache import ResultCache
+
+    class NoBars(PriceSource):
+        def get_history(self, symbol, start, end, interval='1d'):
+            return pd.DataFrame()
+
+        def get_latest_price(self, symbol):
+            return None
+
+    monkeypatch.setattr(api_server, 'backtest_cache', ResultCache())
+    monkeypatch.setattr(api_server, 'backtester', Backtester(market_data=MarketData(price_source=NoBars())))
+
+    body = api_server.app.test_client().get('/api/backtest/AAPL').get_json()
+
+    assert body['data'] == {column: [] for column in api_server.RESULT_COLUMNS}
+    assert body['trades']['timestamp'] == []
@@ -0,0 +1,148 @@
+"""API result cache keys and the LRU + TTL cache."""
+import threading
+import time
+
+import pytest
+
+from config import Config
+from result_cache import ResultCache
+
+REQUEST = dict(
+    symbol='AAPL', days=90, capital=10000, interval='1d',
+    layout='columns', date_format='iso', points=500
+)
+
+
+@pytest.fixture
+def cache_key():
+    from api_server import backtest_cache_key
+    return lambda **changes: backtest_cache_key(**{**REQUEST, **changes})
+
+
+def test_key_is_stable_for_the_same_request(cache_key):
+    assert cache_key() == cache_key()
+    assert hash(cache_key()) == hash(cache_key())
+
+
+@pytest.mark.parametrize('change', [
+    {'symbol': 'MSFT'},
+    {'days': 30},
+    {'capital': 5000},
+    {'interval': '1h'},
+    {'layout': 'records'},
+    {'date_format': 'epoch'},
+    {'points': 1000}
+])
+def test_key_covers_every_request_input(cache_key, change):
+    assert cache_key(**change) != cache_key()
+
+
+@pytest.mark.parametrize('setting', [
+    'SENTIMENT_BUY_THRESHOLD', 'SENTIMENT_SELL_THRESHOLD', 'POSITION_SIZE'
+])
+def test_key_covers_strategy_settings(cache_key, monkeypatch, setting):
+    before = cache_key()
+    monkeypatch.setattr(Config, setting, getattr(Config, setting) + 0.05)
+    assert cache_key() != before
+
+
+def test_hits_after_the_first_computation():
+    cache = ResultCache()
+    calls = []
+    compute = lambda: calls.append(1) or 'result'
+
+    assert cache.get_or_compute('key', compute) == ('result', False)
+    assert cache.get_or_compute('key', compute) == ('result', True)
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_after_the_ttl():
+    cache = ResultCache(ttl=0.05)
+    cache.get_or_compute('key', lambda: 1)
+    time.sleep(0.1)
+    assert cache.get_or_compute('key', lambda: 2) == (2, False)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.get_or_compute('a', lambda: 'a')
+    cache.get_or_compute('b', lambda: 'b')
+    cache.get_or_compute('a', lambda: 'a')
+    cache.get_or_compute('c', lambda: 'c')
+
+    assert cache.get_or_compute('a', lambda: 'new a') == ('a', True)
+    assert cache.get_or_compute('b', lambda: 'new b') == ('new b', False)
+
+
+def test_errors_are_not_cached():
+    cache = ResultCache()
+
+    def fail():
+        raise RuntimeError('outage')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('key', fail)
+    assert cache.get_or_compute('key', lambda: 'ok') == ('ok', False)
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = ResultCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+    follower.start()
+    while not cache.coalesced:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [('result', False), ('result', True)]
+
+
+def test_rejected_values_are_returned_but_not_kept():
+    cache = ResultCache()
+
+    assert cache.get_or_compute('key', lambda: 'empty', cache_if=lambda value: False) == ('empty', False)
+    assert cache.get_or_compute('key', lambda: 'full', cache_if=lambda value: True) == ('full', False)
+    assert cache.get_or_compute('key', lambda: 'other') == ('full', True)
+
+
+def test_api_does_not_cache_backtests_without_prices(monkeypatch, market_data):
+    import api_server
+    from backtester import Backtester
+    from data_sources import PriceSource
+    from market_data import MarketData
+
+    class Outage(PriceSource):
+        def get_history(self, symbol, start, end, interval='1d'):
+            raise ConnectionError('provider down')
+
+        def get_latest_price(self, symbol):
+            return None
+
+    monkeypatch.setattr(api_server, 'backtest_cache', ResultCache())
+    monkeypatch.setattr(api_server, 'backtester', Backtester(market_data=MarketData(price_source=Outage())))
+    client = api_server.app.test_client()
+
+    assert client.get('/api/backtest/AAPL?days=30').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/backtest/AAPL?days=30').headers['X-Cache'] == 'MISS'
+
+    # Once prices are back, the result is cached
+    monkeypatch.setattr(api_server, 'backtester', Backtester(market_data=market_data))
+    assert client.get('/api/backtest/AAPL?days=30').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/backtest/AAPL?days=30').headers['X-Cache'] == 'HIT'
@@ -0,0 +1,69 @@
+"""The vectorized decayed signal against a direct sum over articles."""
+import numpy as np
+import pytest
+
+from sentiment_kernel import NS_PER_SECOND, DecayedSentiment, decay_rate, decayed_sentiment
+
+
+def brute_force(article_times, sentiments, bar_times, half_life, prior_weight=0.0):
+    """Sum every article's decayed weight at every bar."""
+    rate = decay_rate(half_life)
+    signal = np.zeros(len(bar_times))
+    weight = np.zeros(len(bar_times))
+    for i, bar in enumerate(bar_times):
+        seen = article_times <= bar
+        if not seen.any():
+            continue
+        weights = np.exp(-rate * (bar - article_times[seen]) / NS_PER_SECOND)
+        weight[i] = weights.sum()
+        signal[i] = (weights * sentiments[seen]).sum() / (weight[i] + prior_weight)
+    return signal, weight
+
+
+def random_articles(seed, count, span_seconds):
+    rng = np.random.default_rng(seed)
+    times = np.sort(rng.integers(0, int(span_seconds * NS_PER_SECOND), count))
+    return times, rng.uniform(-1, 1, count)
+
+
+@pytest.mark.parametrize('half_life, prior_weight', [
+    (6 * 3600, 0.0),
+    (6 * 3600, 2.0),
+    # Spans thousands of half-lives: exercises the carries between blocks
+    (60, 0.0)
+])
+def test_matches_brute_force(half_life, prior_weight):
+    span = 30 * 86400
+    article_times, sentiments = random_articles(1, 500, span)
+    bar_times = (np.arange(-3600, span + 3600, 1800) * NS_PER_SECOND).astype(np.int64)
+
+    signal, weight = decayed_sentiment(article_times, sentiments, bar_times, half_life, prior_weight)
+    expected_signal, expected_weight = brute_force(
+        article_times, sentiments, bar_times, half_life, prior_weight
+    )
+
+    np.testing.assert_allclose(weight, expected_weight, rtol=1e-9, atol=1e-300)
+    np.testing.assert_allclose(signal, expected_signal, rtol=1e-9, atol=1e-12)
+
+
+def test_bars_before_the_first_article_are_neutral():
+    signal, weight = decayed_sentiment(
+        np.array([100_000_000_000]), np.array([0.8]),
+        np.array([0, 100_000_000_000]), half_life=60
+    )
+    assert signal.tolist() == [0.0, 0.8]
+    assert weight.tolist() == [0.0, 1.0]
+
+
+def test_streaming_state_matches_vectorized():
+    article_times, sentiments = random_articles(2, 50, 86400)
+    bar_times = article_times[-1:] + int(600 * NS_PER_SECOND)
+    signal, weight = decayed_sentiment(article_times, sentiments, bar_times, 3600, 1.0)
+
+    state = DecayedSentiment(3600, prior_weight=1.0)
+    for time, sentiment in zip(article_times / NS_PER_SECOND, sentiments):
+        state.add(time, sentiment)
+    at = bar_times[0] / NS_PER_SECOND
+
+    assert state.value(at) == pytest.approx(signal[0], rel=1e-9)
+    assert state.effective_count(at) == pytest.approx(weight[0], rel=1e-9)
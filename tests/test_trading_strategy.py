@@ -0,0 +1,58 @@
+"""TradingStrategy settings and signals, and Trade records."""
+from datetime import datetime
+
+import pytest
+
+from trading_strategy import (
+    TRADE_FIELDS, Trade, TradingStrategy, signal_column, trades_frame, trades_to_dicts
+)
+
+
+@pytest.mark.parametrize('capital', [0, -100])
+def test_non_positive_capital_is_rejected(capital):
+    with pytest.raises(ValueError):
+        TradingStrategy(initial_capital=capital)
+
+
+def test_zero_thresholds_are_kept():
+    strategy = TradingStrategy(initial_capital=1000, buy_threshold=0, sell_threshold=0)
+
+    assert (strategy.buy_threshold, strategy.sell_threshold) == (0, 0)
+    assert strategy.generate_signal(0.01, 10) == 'BUY'
+
+
+def test_trades_behave_like_the_dicts_they_replaced():
+    strategy = TradingStrategy(initial_capital=1000, position_size=0.5)
+    trade = strategy.execute_trade('BUY', 10.0, 0.4, datetime(2024, 1, 2))
+
+    assert trade['shares'] == trade.shares == 50.0
+    assert trade['cash_after'] == 500.0
+    assert trade.get('symbol') is None and trade.get('missing', 'x') == 'x'
+    with pytest.raises(KeyError):
+        trade['symbol']
+    assert list(trade.to_dict()) == list(TRADE_FIELDS)
+    assert strategy.execute_trade('HOLD', 10.0, 0.0, datetime(2024, 1, 3)) is None
+
+
+def test_portfolio_trades_carry_their_symbol():
+    trades = [
+        Trade(datetime(2024, 1, 2), 'BUY', 10.0, 5.0, 50.0, 0.4, 950.0, 5.0),
+        Trade(datetime(2024, 1, 3), 'SELL', 12.0, 5.0, 60.0, -0.4, 1010.0, 0.0, symbol='AAA')
+    ]
+
+    assert trades[1]['symbol'] == 'AAA'
+    assert trades_to_dicts(trades)[1]['symbol'] == 'AAA'
+    assert 'symbol' not in trades_to_dicts(trades)[0]
+    frame = trades_frame(trades)
+    assert list(frame.columns) == list(TRADE_FIELDS) + ['symbol']
+    assert frame['amount'].tolist() == [50.0, 60.0]
+    assert list(trades_frame(trades[:1]).columns) == list(TRADE_FIELDS)
+    assert list(trades_frame([]).columns) == list(TRADE_FIELDS)
+
+
+def test_signal_column_compares_like_strings():
+    signals = signal_column([0, 1, 2, 1])
+
+    assert list(signals == 'BUY') == [False, True, False, True]
+    assert list(signals) == ['HOLD', 'BUY', 'SELL', 'BUY']
+    assert signals.codes.dtype.itemsize == 1
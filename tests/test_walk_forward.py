@@ -0,0 +1,46 @@
+"""Walk-forward fold boundaries."""
+import pytest
+
+from walk_forward import fold_bounds
+
+
+def test_rolling_folds_tile_the_test_windows():
+    assert fold_bounds(10, train_bars=4, test_bars=2) == [
+        (0, 4, 4, 6),
+        (2, 6, 6, 8),
+        (4, 8, 8, 10)
+    ]
+
+
+def test_anchored_folds_train_from_the_first_bar():
+    assert fold_bounds(10, train_bars=4, test_bars=3, mode='anchored') == [
+        (0, 4, 4, 7),
+        (0, 7, 7, 10)
+    ]
+
+
+def test_last_test_window_may_be_shorter():
+    assert fold_bounds(9, train_bars=4, test_bars=3)[-1] == (3, 7, 7, 9)
+
+
+def test_longer_step_leaves_gaps_between_test_windows():
+    assert fold_bounds(12, train_bars=2, test_bars=2, step=5) == [
+        (0, 2, 2, 4),
+        (5, 7, 7, 9)
+    ]
+
+
+def test_no_fold_without_bars_after_training():
+    assert fold_bounds(4, train_bars=4, test_bars=2) == []
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'step': 1},
+    {'mode': 'expanding'},
+    {'train_bars': 1},
+    {'test_bars': 0}
+])
+def test_invalid_arguments_are_rejected(kwargs):
+    arguments = {'n_bars': 20, 'train_bars': 4, 'test_bars': 2, **kwargs}
+    with pytest.raises(ValueError):
+        fold_bounds(**arguments)
@@ -1,11 +1,113 @@
 """Trading strategy based on news sentiment."""
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 import logging
+import numpy as np
+import pandas as pd
 from config import Config
+from log_pipeline import hot_path_logger
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Once-per-trade lines (sampled in sweeps and replays)
+trade_logger = hot_path_logger(__name__)
+
+# Signals stored as int8 codes of a categorical column (1 byte per bar)
+SIGNALS = ('HOLD', 'BUY', 'SELL')
+SIGNAL_CODES = {signal: code for code, signal in enumerate(SIGNALS)}
+
+TRADE_FIELDS = (
+    'timestamp', 'action', 'price', 'shares', 'amount',
+    'sentiment', 'cash_after', 'holdings_after'
+)
+
+
+class Trade:
+    """
+    One executed trade.
+
+    A __slots__ record instead of a dict: about a third of the memory, and
+    attribute access in hot loops. Item access (trade['price'],
+    trade.get('symbol')) keeps working for code written against dicts;
+    to_dict() gives the JSON view.
+    """
+
+    __slots__ = TRADE_FIELDS + ('symbol',)
+
+    def __init__(
+        self,
+        timestamp,
+        action: str,
+        price: float,
+        shares: float,
+        amount: float,
+        sentiment: float,
+        cash_after: float,
+        holdings_after: float,
+        symbol: Optional[str] = None
+    ):
+        """Initialize a trade record (symbol is set for portfolio trades only)."""
+        self.timestamp = timestamp
+        self.action = action
+        self.price = price
+        self.shares = shares
+        self.amount = amount
+        self.sentiment = sentiment
+        self.cash_after = cash_after
+        self.holdings_after = holdings_after
+        self.symbol = symbol
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__ or (key == 'symbol' and self.symbol is None):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        """Dict-style lookup with a default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict:
+        """Get the trade as a dictionary (with 'symbol' only for portfolio trades)."""
+        trade = {field: getattr(self, field) for field in TRADE_FIELDS}
+        if self.symbol is not None:
+            trade['symbol'] = self.symbol
+        return trade
+
+    def __repr__(self) -> str:
+        return f"Trade({self.to_dict()!r})"
+
+
+def trades_to_dicts(trades: Iterable[Trade]) -> List[Dict]:
+    """Get dictionary views of trades (e.g. for JSON responses)."""
+    return [trade.to_dict() for trade in trades]
+
+
+def trades_frame(trades: List[Trade]) -> pd.DataFrame:
+    """
+    Get trades as a DataFrame with one column per field.
+
+    Args:
+        trades: Executed trades
+
+    Returns:
+        DataFrame (with a 'symbol' column for portfolio trades)
+    """
+    fields = TRADE_FIELDS
+    if any(trade.symbol is not None for trade in trades):
+        fields = fields + ('symbol',)
+    return pd.DataFrame({field: [getattr(trade, field) for trade in trades] for field in fields})
+
+
+def signal_column(codes) -> pd.Categorical:
+    """
+    Build a categorical signal column from int8 codes (see SIGNAL_CODES).
+
+    Compares equal to 'BUY'/'SELL'/'HOLD' strings like the original
+    string column, at one byte per bar.
+    """
+    return pd.Categorical.from_codes(np.asarray(codes, dtype=np.int8), categories=SIGNALS)
 
 
 class TradingStrategy:
@@ -22,15 +124,17 @@ class TradingStrategy:
         Initialize trading strategy.
         
         Args:
-            initial_capital: Starting capital
+            initial_capital: Starting capital (positive)
             position_size: Fraction of portfolio to use per trade (0-1)
             buy_threshold: Sentiment threshold for buy signal
             sell_threshold: Sentiment threshold for sell signal
         """
-        self.initial_capital = initial_capital or Config.INITIAL_CAPITAL
-        self.position_size = position_size or Config.POSITION_SIZE
-        self.buy_threshold = buy_threshold or Config.SENTIMENT_BUY_THRESHOLD
-        self.sell_threshold = sell_threshold or Config.SENTIMENT_SELL_THRESHOLD
+        self.initial_capital = initial_capital if initial_capital is not None else Config.INITIAL_CAPITAL
+        self.position_size = position_size if position_size is not None else Config.POSITION_SIZE
+        self.buy_threshold = buy_threshold if buy_threshold is not None else Config.SENTIMENT_BUY_THRESHOLD
+        self.sell_threshold = sell_threshold if sell_threshold is not None else Config.SENTIMENT_SELL_THRESHOLD
+        if self.initial_capital <= 0:
+            raise ValueError(f"Initial capital must be positive, got {self.initial_capital}")
         
         # Portfolio state
         self.cash = self.initial_capital
@@ -73,7 +177,7 @@ class TradingStrategy:
         price: float,
         sentiment: float,
         timestamp: datetime
-    ) -> Optional[Dict]:
+    ) -> Optional[Trade]:
         """
         Execute a trade based on signal.
         
@@ -84,7 +188,7 @@ class TradingStrategy:
             timestamp: Trade timestamp
             
         Returns:
-            Trade details or None if no trade executed
+            Trade record or None if no trade executed
         """
         if signal == 'BUY' and self.cash > 0:
             # Calculate number of shares to buy
@@ -95,19 +199,17 @@ class TradingStrategy:
             self.holdings += shares
             self.cash -= trade_amount
             
-            trade = {
-                'timestamp': timestamp,
-                'action': 'BUY',
-                'price': price,
-                'shares': shares,
-                'amount': trade_amount,
-                'sentiment': sentiment,
-                'cash_after': self.cash,
-                'holdings_after': self.holdings
-            }
+            trade = Trade(
+                timestamp, 'BUY', price, shares, trade_amount,
+                sentiment, self.cash, self.holdings
+            )
             
             self.trades.append(trade)
-            logger.info(f"BUY: {shares:.4f} shares @ ${price:.2f} (sentiment: {sentiment:.3f})")
+            # %-style arguments: the message is built by the log writer thread
+            trade_logger.info(
+                "BUY: %.4f shares @ $%.2f (sentiment: %.3f)", shares, price, sentiment,
+                extra={'signal': 'BUY', 'shares': shares, 'price': price, 'sentiment': sentiment}
+            )
             return trade
             
         elif signal == 'SELL' and self.holdings > 0:
@@ -119,19 +221,16 @@ class TradingStrategy:
             self.cash += trade_amount
             self.holdings = 0
             
-            trade = {
-                'timestamp': timestamp,
-                'action': 'SELL',
-                'price': price,
-                'shares': shares,
-                'amount': trade_amount,
-                'sentiment': sentiment,
-                'cash_after': self.cash,
-                'holdings_after': self.holdings
-            }
+            trade = Trade(
+                timestamp, 'SELL', price, shares, trade_amount,
+                sentiment, self.cash, self.holdings
+            )
             
             self.trades.append(trade)
-            logger.info(f"SELL: {shares:.4f} shares @ ${price:.2f} (sentiment: {sentiment:.3f})")
+            trade_logger.info(
+                "SELL: %.4f shares @ $%.2f (sentiment: %.3f)", shares, price, sentiment,
+                extra={'signal': 'SELL', 'shares': shares, 'price': price, 'sentiment': sentiment}
+            )
             return trade
         
         return None
@@ -172,3 +271,179 @@ class TradingStrategy:
         self.portfolio_value = self.initial_capital
         self.trades = []
         logger.info("Strategy reset to initial state")
+
+
+class PortfolioStrategy:
+    """Sentiment-based strategy trading several symbols from one cash pool."""
+    
+    def __init__(
+        self,
+        symbols: List[str],
+        initial_capital: float = None,
+        position_size: float = None,
+        buy_threshold: float = None,
+        sell_threshold: float = None,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize portfolio strategy.
+        
+        Args:
+            symbols: Symbols traded by the strategy
+            initial_capital: Starting capital shared by all symbols (positive)
+            position_size: Fraction of cash committed on each trading day (0-1)
+            buy_threshold: Sentiment threshold for buy signal
+            sell_threshold: Sentiment threshold for sell signal
+            weights: Relative allocation weight per symbol (default: equal)
+        """
+        self.symbols = list(symbols)
+        self.initial_capital = initial_capital if initial_capital is not None else Config.INITIAL_CAPITAL
+        self.position_size = position_size if position_size is not None else Config.POSITION_SIZE
+        self.buy_threshold = buy_threshold if buy_threshold is not None else Config.SENTIMENT_BUY_THRESHOLD
+        self.sell_threshold = sell_threshold if sell_threshold is not None else Config.SENTIMENT_SELL_THRESHOLD
+        
+        if self.initial_capital <= 0:
+            raise ValueError(f"Initial capital must be positive, got {self.initial_capital}")
+        
+        weights = weights or {symbol: 1.0 for symbol in self.symbols}
+        missing = [symbol for symbol in self.symbols if symbol not in weights]
+        if missing:
+            raise ValueError(f"Missing allocation weights for: {', '.join(missing)}")
+        self.weights = {symbol: float(weights[symbol]) for symbol in self.symbols}
+        
+        # Portfolio state
+        self.cash = self.initial_capital
+        self.holdings = {symbol: 0 for symbol in self.symbols}
+        self.portfolio_value = self.initial_capital
+        
+        # Trade history
+        self.trades = []
+        
+        logger.info(
+            f"Portfolio strategy initialized: {len(self.symbols)} symbols, "
+            f"Capital=${self.initial_capital:,.2f}, "
+            f"Buy>{self.buy_threshold}, Sell<{self.sell_threshold}"
+        )
+    
+    def generate_signal(self, symbol: str, sentiment: float) -> str:
+        """
+        Generate trading signal for one symbol based on sentiment.
+        
+        Args:
+            symbol: Symbol the sentiment refers to
+            sentiment: Sentiment score (-1 to 1)
+            
+        Returns:
+            'BUY', 'SELL', or 'HOLD'
+        """
+        if sentiment > self.buy_threshold:
+            if self.cash > 0:
+                return 'BUY'
+        elif sentiment < self.sell_threshold:
+            if self.holdings[symbol] > 0:
+                return 'SELL'
+        
+        return 'HOLD'
+    
+    def allocate(self, buy_symbols: List[str]) -> Dict[str, float]:
+        """
+        Split today's buying budget between symbols with a BUY signal.
+        
+        The budget is position_size of the shared cash, divided in
+        proportion to the symbols' allocation weights. With a single
+        symbol this is the same rule as TradingStrategy.
+        
+        Args:
+            buy_symbols: Symbols with a BUY signal
+            
+        Returns:
+            Dictionary mapping symbol to cash amount to invest
+        """
+        total_weight = sum(self.weights[symbol] for symbol in buy_symbols)
+        if self.cash <= 0 or total_weight <= 0:
+            return {}
+        
+        budget = self.cash * self.position_size
+        return {
+            symbol: budget * self.weights[symbol] / total_weight
+            for symbol in buy_symbols
+        }
+    
+    def execute_trade(
+        self,
+        symbol: str,
+        signal: str,
+        price: float,
+        sentiment: float,
+        timestamp: datetime,
+        amount: float = 0.0
+    ) -> Optional[Trade]:
+        """
+        Execute a trade for one symbol.
+        
+        Args:
+            symbol: Symbol to trade
+            signal: Trading signal ('BUY', 'SELL', 'HOLD')
+            price: Current price
+            sentiment: Sentiment score
+            timestamp: Trade timestamp
+            amount: Cash to invest on a BUY (see allocate)
+            
+        Returns:
+            Trade record or None if no trade executed
+        """
+        if signal == 'BUY' and amount > 0:
+            trade_amount = min(amount, self.cash)
+            shares = trade_amount / price
+            
+            self.holdings[symbol] += shares
+            self.cash -= trade_amount
+            
+        elif signal == 'SELL' and self.holdings[symbol] > 0:
+            shares = self.holdings[symbol]
+            trade_amount = shares * price
+            
+            self.cash += trade_amount
+            self.holdings[symbol] = 0
+            
+        else:
+            return None
+        
+        trade = Trade(
+            timestamp, signal, price, shares, trade_amount,
+            sentiment, self.cash, self.holdings[symbol], symbol
+        )
+        
+        self.trades.append(trade)
+        trade_logger.info(
+            "%s %s: %.4f shares @ $%.2f (sentiment: %.3f)", signal, symbol, shares, price, sentiment,
+            extra={
+                'signal': signal, 'symbol': symbol, 'shares': shares,
+                'price': price, 'sentiment': sentiment
+            }
+        )
+        return trade
+    
+    def get_portfolio_state(self, prices: Dict[str, float]) -> Dict:
+        """
+        Get current portfolio state.
+        
+        Args:
+            prices: Current price per symbol
+            
+        Returns:
+            Dictionary with portfolio details
+        """
+        positions_value = sum(
+            shares * prices[symbol] for symbol, shares in self.holdings.items() if shares
+        )
+        self.portfolio_value = self.cash + positions_value
+        
+        return {
+            'cash': self.cash,
+            'holdings': dict(self.holdings),
+            'positions_value': positions_value,
+            'portfolio_value': self.portfolio_value,
+            'total_return': (self.portfolio_value - self.initial_capital) / self.initial_capital,
+            'total_trades': len(self.trades)
+        }
@@ -0,0 +1,368 @@
+"""Walk-forward optimization of TradingStrategy parameters.
+
+Every fold picks the best parameter combination on its training window and
+trades it, unchanged, on the test window that follows, so the reported
+metrics are all out of sample.
+"""
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import parameter_sweep
+from bar_alignment import periods_per_year
+from log_pipeline import sample_loggers
+from backtester import Backtester
+from options import WINDOW_MODES
+from parameter_sweep import _evaluate, _init_worker, _share_array, _timezone, expand_grid
+from performance_metrics import MetricsAccumulator
+from trading_strategy import TradingStrategy
+
+logger = logging.getLogger(__name__)
+
+
+def fold_bounds(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    step: Optional[int] = None,
+    mode: str = 'rolling'
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Split bar positions into walk-forward folds.
+
+    The first test window starts right after the first training window;
+    the next ones start step bars later each (default: test_bars, so test
+    windows tile the data). Test windows never overlap, so the stitched
+    equity curve has every bar at most once: step must be at least
+    test_bars. The last test window may be shorter.
+
+    Args:
+        n_bars: Number of bars
+        train_bars: Bars per training window (the first one, when anchored)
+        test_bars: Bars per test window
+        step: Bars between the starts of consecutive test windows (at
+            least test_bars; more leaves untested gaps between them)
+        mode: 'rolling' (train on the train_bars bars before the test
+            window) or 'anchored' (train on every bar before it)
+
+    Returns:
+        List of (train_start, train_end, test_start, test_end) positions,
+        ends exclusive
+    """
+    if mode not in WINDOW_MODES:
+        raise ValueError(f"Unknown walk-forward mode: {mode}")
+    if train_bars < 2 or test_bars < 1:
+        raise ValueError("Walk-forward needs at least 2 training bars and 1 test bar")
+
+    step = step or test_bars
+    if step < test_bars:
+        raise ValueError(
+            f"Walk-forward step ({step}) must be at least the test window ({test_bars} bars): "
+            "overlapping test windows would trade the same bars twice"
+        )
+    folds = []
+    for test_start in range(train_bars, n_bars, step):
+        train_start = 0 if mode == 'anchored' else test_start - train_bars
+        folds.append((train_start, test_start, test_start, min(test_start + test_bars, n_bars)))
+    return folds
+
+
+def _run_fold(
+    backtester: Backtester,
+    timestamps,
+    prices: np.ndarray,
+    sentiments: np.ndarray,
+    bounds: Tuple[int, int, int, int],
+    combos: List[Dict[str, float]],
+    initial_capital: float,
+    bars_per_year: int = 252,
+    rank_by: str = 'strategy_sharpe'
+) -> Dict:
+    """Optimize on a fold's training window and trade the winner on its test window."""
+    train_start, train_end, test_start, test_end = bounds
+
+    started = time.perf_counter()
+    in_sample = _evaluate(
+        backtester,
+        timestamps[train_start:train_end],
+        prices[train_start:train_end],
+        sentiments[train_start:train_end],
+        combos,
+        initial_capital,
+        bars_per_year
+    )
+    # Highest score wins; ties keep grid order, like the sweep's stable sort
+    best = max(in_sample, key=lambda row: row.get(rank_by, float('-inf')))
+    params = {name: best[name] for name in combos[0]}
+    trained = time.perf_counter()
+
+    strategy = TradingStrategy(initial_capital=initial_capital, **params)
+    accumulator = MetricsAccumulator(initial_capital, bars_per_year)
+    results_df = backtester._simulate(
+        strategy,
+        timestamps[test_start:test_end],
+        prices[test_start:test_end],
+        sentiments[test_start:test_end],
+        initial_capital,
+        accumulator
+    )
+    tested = time.perf_counter()
+
+    return {
+        'params': params,
+        'in_sample_score': best.get(rank_by),
+        'metrics': accumulator.result(),
+        'winning_trades': accumulator.winning_trades,
+        'portfolio_value': results_df['portfolio_value'].to_numpy(),
+        'buy_hold_value': results_df['buy_hold_value'].to_numpy(),
+        'train_seconds': trained - started,
+        'test_seconds': tested - trained
+    }
+
+
+def _run_fold_shared(
+    bounds: Tuple[int, int, int, int],
+    combos: List[Dict[str, float]],
+    initial_capital: float,
+    bars_per_year: int = 252,
+    rank_by: str = 'strategy_sharpe'
+) -> Dict:
+    """Run one fold on views of the worker's shared arrays."""
+    arrays = parameter_sweep._worker_arrays
+    return _run_fold(
+        parameter_sweep._worker_backtester,
+        parameter_sweep._worker_timestamps,
+        arrays['prices'],
+        arrays['sentiments'],
+        bounds,
+        combos,
+        initial_capital,
+        bars_per_year,
+        rank_by
+    )
+
+
+class WalkForward:
+    """Walk-forward optimization across a process pool, one fold per task."""
+
+    def __init__(self, backtester: Optional[Backtester] = None):
+        """
+        Initialize the walk-forward run.
+
+        Args:
+            backtester: Backtester used to load price and sentiment data
+        """
+        self.backtester = backtester or Backtester()
+
+    def run(
+        self,
+        symbol: str,
+        param_grid: Dict[str, List[float]],
+        train_bars: int,
+        test_bars: int,
+        step: Optional[int] = None,
+        mode: str = 'rolling',
+        days: int = 365,
+        initial_capital: float = 10000,
+        workers: Optional[int] = None,
+        rank_by: str = 'strategy_sharpe',
+        sentiment_source: str = 'simulated',
+        interval: str = '1d'
+    ) -> Dict:
+        """
+        Run a walk-forward optimization.
+
+        Price and sentiment arrays are loaded once for the whole period and
+        placed in shared memory; every fold works on slices (views) of
+        them, so the sentiment signal keeps its full history at each fold's
+        start. Each test window starts flat with initial_capital; the
+        stitched equity curve compounds the test windows' returns.
+
+        Args:
+            symbol: Stock ticker symbol
+            param_grid: Mapping of strategy parameter name to candidate values
+            train_bars: Bars per training window (the first one, when anchored)
+            test_bars: Bars per test window
+            step: Bars between test windows (default: test_bars; at least
+                test_bars)
+            mode: 'rolling' or 'anchored' training windows
+            days: Number of days to load
+            initial_capital: Starting capital
+            workers: Number of worker processes (default: all cores, at
+                most one per fold)
+            rank_by: Metric maximized on each training window
+            sentiment_source: 'simulated', 'stored' or 'decayed' (see
+                Backtester.run_backtest)
+            interval: Bar interval ('1m', '5m', '15m', '30m', '1h' or '1d')
+
+        Returns:
+            Dictionary with 'folds' (one row per fold: windows, chosen
+            parameters, out-of-sample metrics and timings), 'equity' (the
+            stitched out-of-sample curve), 'metrics' (of that curve) and
+            'timing'
+        """
+        combos = expand_grid(param_grid)
+        if not combos:
+            raise ValueError("Empty parameter grid")
+
+        started = time.perf_counter()
+        arrays = self.backtester.load_arrays(
+            symbol, days=days, sentiment_source=sentiment_source, interval=interval
+        )
+        load_seconds = time.perf_counter() - started
+        if arrays is None:
+            return self._empty_result(symbol)
+
+        timestamps, prices, sentiments = arrays
+        folds = fold_bounds(len(prices), train_bars, test_bars, step, mode)
+        if not folds:
+            logger.error(f"Not enough bars for walk-forward: {len(prices)} <= {train_bars} training bars")
+            return self._empty_result(symbol)
+
+        bars_per_year = periods_per_year(interval)
+        workers = min(workers or os.cpu_count() or 1, len(folds))
+
+        logger.info(
+            f"Walk-forward for {symbol}: {len(folds)} {mode} folds x {len(combos)} "
+            f"combinations on {workers} worker(s)"
+        )
+
+        if workers == 1:
+            with sample_loggers():
+                fold_results = [
+                    _run_fold(
+                        self.backtester, timestamps, prices, sentiments, bounds,
+                        combos, initial_capital, bars_per_year, rank_by
+                    )
+                    for bounds in folds
+                ]
+        else:
+            shared = {
+                'timestamps': np.asarray(timestamps.values),
+                'prices': np.ascontiguousarray(prices, dtype=float),
+                'sentiments': np.ascontiguousarray(sentiments, dtype=float)
+            }
+            fold_results = self._run_pool(
+                shared, folds, combos, initial_capital, workers, bars_per_year, rank_by,
+                _timezone(timestamps)
+            )
+
+        result = self._stitch(symbol, timestamps, folds, fold_results, initial_capital, bars_per_year)
+        result['timing'] = {
+            'load_seconds': load_seconds,
+            'total_seconds': time.perf_counter() - started,
+            'workers': workers
+        }
+        return result
+
+    def _run_pool(
+        self,
+        arrays: Dict[str, np.ndarray],
+        folds: List[Tuple[int, int, int, int]],
+        combos: List[Dict[str, float]],
+        initial_capital: float,
+        workers: int,
+        bars_per_year: int = 252,
+        rank_by: str = 'strategy_sharpe',
+        timezone: Optional[str] = None
+    ) -> List[Dict]:
+        """Run folds on a process pool sharing the arrays via shared memory."""
+        segments = []
+        try:
+            specs = {}
+            for key, array in arrays.items():
+                segment, spec = _share_array(array)
+                segments.append(segment)
+                specs[key] = spec
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(specs, timezone)
+            ) as pool:
+                return list(pool.map(
+                    _run_fold_shared,
+                    folds,
+                    itertools.repeat(combos),
+                    itertools.repeat(initial_capital),
+                    itertools.repeat(bars_per_year),
+                    itertools.repeat(rank_by)
+                ))
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    def _stitch(
+        self,
+        symbol: str,
+        timestamps,
+        folds: List[Tuple[int, int, int, int]],
+        fold_results: List[Dict],
+        initial_capital: float,
+        bars_per_year: int = 252
+    ) -> Dict:
+        """Combine fold results into the fold table and the stitched equity curve."""
+        rows = []
+        curves = []
+        strategy_scale = buy_hold_scale = 1.0
+        for number, (bounds, fold) in enumerate(zip(folds, fold_results)):
+            train_start, train_end, test_start, test_end = bounds
+            rows.append({
+                'fold': number,
+                'train_start': timestamps[train_start],
+                'train_end': timestamps[train_end - 1],
+                'test_start': timestamps[test_start],
+                'test_end': timestamps[test_end - 1],
+                **fold['params'],
+                'in_sample_score': fold['in_sample_score'],
+                **fold['metrics'],
+                'train_seconds': fold['train_seconds'],
+                'test_seconds': fold['test_seconds']
+            })
+
+            # Each test window starts from initial_capital: rescale it to
+            # the value the previous windows ended with
+            curves.append(pd.DataFrame({
+                'date': timestamps[test_start:test_end],
+                'fold': number,
+                'portfolio_value': fold['portfolio_value'] * strategy_scale,
+                'buy_hold_value': fold['buy_hold_value'] * buy_hold_scale
+            }))
+            strategy_scale *= fold['portfolio_value'][-1] / initial_capital
+            buy_hold_scale *= fold['buy_hold_value'][-1] / initial_capital
+
+        equity = pd.concat(curves, ignore_index=True)
+
+        accumulator = MetricsAccumulator(initial_capital, bars_per_year)
+        for portfolio_value, buy_hold_value in zip(
+            equity['portfolio_value'].tolist(), equity['buy_hold_value'].tolist()
+        ):
+            accumulator.update(portfolio_value, buy_hold_value)
+        accumulator.total_trades = sum(fold['metrics']['total_trades'] for fold in fold_results)
+        accumulator.winning_trades = sum(fold['winning_trades'] for fold in fold_results)
+
+        return {
+            'symbol': symbol,
+            'folds': pd.DataFrame(rows),
+            'equity': equity,
+            'metrics': accumulator.result(),
+            'initial_capital': initial_capital
+        }
+
+    def _empty_result(self, symbol: str) -> Dict:
+        """Return empty result structure."""
+        return {
+            'symbol': symbol,
+            'folds': pd.DataFrame(),
+            'equity': pd.DataFrame(),
+            'metrics': {},
+            'initial_capital': 0,
+            'timing': {}
+        }
@@ -0,0 +1,10 @@
+"""WSGI entry point for the API server (`gunicorn wsgi:app`).
+
+Sets up the background log writer before serving; importing api_server
+itself leaves the importing process's logging alone.
+"""
+from log_pipeline import configure_logging
+
+configure_logging()
+
+from api_server import app  # noqa: E402